@@ -0,0 +1,373 @@
+"""
+Throughput benchmark for the two PMC chunking strategies.
+
+- BIOMEDICAL: chunk_paper_sections (PubMedBERT token-aware chunker)
+- CHARACTER: PmcProcessController.process_article (RecursiveCharacterTextSplitter)
+
+Every article in `pmc_articles/` is chunked once per scale. Scale N runs a
+synthetic corpus of N copies of each article; copy k rotates the sentences of
+every section by k, so copies have the same size and token count but different
+text (no chunk cache or tokenizer cache hits across copies).
+
+Reported per (strategy, scale): papers/s, chunks/s, tokens/s (input section
+tokens), tokenizer call and text counts, p50/p99 per-paper latency and peak
+RSS. Each case runs in a fresh process so peak RSS is per case.
+
+Usage:
+    python -m src.benchmarks.chunker_benchmark --scales 1 10 100 --output bench.json
+    python -m src.benchmarks.chunker_benchmark --baseline bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+from src.services import biomedical_chunker
+from src.services.biomedical_chunker import (
+    CHUNKER_VERSION,
+    MAX_CHUNK_TOKENS,
+    OVERLAP_TOKENS,
+    WORD_OVERLAP,
+    _token_counts,
+    chunk_paper_sections,
+)
+from src.services.parallel_chunker import article_sections
+from src.services.sentence_segmenter import get_sentence_segmenter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STRATEGIES = ("BIOMEDICAL", "CHARACTER")
+DEFAULT_INPUT_FOLDER = SRC_ROOT.parent / "pmc_articles"
+
+# Metrics compared against a baseline run; higher is better for all of them
+_THROUGHPUT_METRICS = ("papers_per_s", "chunks_per_s", "tokens_per_s")
+
+
+class _CountingTokenizer:
+    """Wraps the chunker tokenizer and counts encode calls and encoded texts."""
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+        self.calls = 0
+        self.texts = 0
+
+    def encode(self, text, *args, **kwargs):
+        self.calls += 1
+        self.texts += 1
+        return self._tokenizer.encode(text, *args, **kwargs)
+
+    def encode_batch(self, texts, *args, **kwargs):
+        self.calls += 1
+        self.texts += len(texts)
+        return self._tokenizer.encode_batch(texts, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._tokenizer, name)
+
+
+def load_articles(folder: str | Path) -> list[dict]:
+    """Load every PMC article JSON in folder, sorted by file name."""
+    articles = []
+    for path in sorted(Path(folder).glob("*.json")):
+        with path.open("r", encoding="utf-8") as f:
+            articles.append(json.load(f))
+    return articles
+
+
+def _rotate_sentences(text: str, k: int) -> str:
+    segmenter = get_sentence_segmenter()
+    sentences = segmenter.split(text)
+    if len(sentences) < 2:
+        return " ".join(sentences)
+    k %= len(sentences)
+    return " ".join(sentences[k:] + sentences[:k])
+
+
+def synthetic_corpus(articles: list[dict], scale: int) -> Iterator[dict]:
+    """
+    Yield scale copies of every article; copy 0 is the original.
+
+    Copies are generated lazily so a 100x corpus is never held in memory.
+    """
+    for k in range(scale):
+        for article in articles:
+            if k == 0:
+                yield article
+                continue
+            yield {
+                **article,
+                "doc_id": f"{article.get('doc_id', '')}-x{k}",
+                "sections": [
+                    {**s, "text": _rotate_sentences(s.get("text", "") or "", k)}
+                    for s in article.get("sections", [])
+                ],
+            }
+
+
+def corpus_tokens(articles: list[dict]) -> int:
+    """Return the PubMedBERT token count of all section texts (one copy of the corpus)."""
+    texts = [s.get("text", "") or "" for a in articles for s in a.get("sections", [])]
+    return sum(_token_counts([t for t in texts if t.strip()])) if texts else 0
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile of an ascending list, q in [0, 100]."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _make_character_chunker():
+    from src.controllers import PmcProcessController
+
+    class _InMemoryPmcProcessController(PmcProcessController):
+        """Serves articles from memory so synthetic copies need no files on disk."""
+
+        def __init__(self):
+            super().__init__()
+            self.articles: dict[str, dict] = {}
+
+        def _load_article(self, doc_id: str) -> dict:
+            return self.articles.pop(doc_id)
+
+    controller = _InMemoryPmcProcessController()
+
+    def chunk(article: dict) -> list:
+        controller.articles[article.get("doc_id", "")] = article
+        return controller.process_article(doc_id=article.get("doc_id", ""))
+
+    return chunk
+
+
+def _make_biomedical_chunker(max_tokens: int, overlap_tokens: int, word_overlap: int):
+    def chunk(article: dict) -> list:
+        return chunk_paper_sections(
+            sections=article_sections(article),
+            doc_id=article.get("doc_id", ""),
+            doc_title=article.get("doc_title", ""),
+            source_url=article.get("source_url", ""),
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            word_overlap=word_overlap,
+        )
+
+    return chunk
+
+
+def run_case(
+    strategy: str,
+    scale: int,
+    input_folder: str,
+    input_tokens: int,
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+) -> dict[str, Any]:
+    """
+    Chunk the corpus at one scale with one strategy and return its metrics.
+
+    Only the chunking call is timed: JSON loading and synthetic copy
+    generation are excluded. The tokenizer is loaded before timing starts.
+    input_tokens is the token count of one copy of the corpus.
+    """
+    articles = load_articles(input_folder)
+    if strategy == "BIOMEDICAL":
+        chunk = _make_biomedical_chunker(max_tokens, overlap_tokens, word_overlap)
+    elif strategy == "CHARACTER":
+        chunk = _make_character_chunker()
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    # CHARACTER never tokenizes; skip loading the tokenizer so RSS reflects that
+    original_tokenizer = biomedical_chunker._TOKENIZER
+    counter = None
+    if strategy == "BIOMEDICAL":
+        counter = _CountingTokenizer(biomedical_chunker._get_tokenizer())
+        biomedical_chunker._TOKENIZER = counter
+    latencies = []
+    chunks = 0
+    try:
+        for article in synthetic_corpus(articles, scale):
+            started = time.perf_counter()
+            chunks += len(chunk(article))
+            latencies.append(time.perf_counter() - started)
+    finally:
+        biomedical_chunker._TOKENIZER = original_tokenizer
+
+    elapsed = sum(latencies)
+    latencies.sort()
+    tokens = input_tokens * scale
+    return {
+        "strategy": strategy,
+        "scale": scale,
+        "papers": len(latencies),
+        "chunks": chunks,
+        "input_tokens": tokens,
+        "elapsed_s": round(elapsed, 4),
+        "papers_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "chunks_per_s": round(chunks / elapsed, 2) if elapsed else 0.0,
+        "tokens_per_s": round(tokens / elapsed, 1) if elapsed else 0.0,
+        "tokenizer_calls": counter.calls if counter else 0,
+        "tokenizer_texts": counter.texts if counter else 0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 3),
+            "p99": round(_percentile(latencies, 99) * 1000, 3),
+            "mean": round(elapsed / len(latencies) * 1000, 3) if latencies else 0.0,
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_benchmark(
+    input_folder: str | Path = DEFAULT_INPUT_FOLDER,
+    strategies: tuple[str, ...] = STRATEGIES,
+    scales: tuple[int, ...] = (1, 10, 100),
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """
+    Run every (strategy, scale) case and return the JSON-serializable report.
+
+    With isolate=True each case runs in its own spawned process.
+    """
+    input_folder = str(input_folder)
+    articles = load_articles(input_folder)
+    if not articles:
+        raise FileNotFoundError(f"No PMC article JSON files in {input_folder}")
+    input_tokens = corpus_tokens(articles)
+
+    results = []
+    for strategy in strategies:
+        for scale in scales:
+            args = (strategy, scale, input_folder, input_tokens, max_tokens, overlap_tokens, word_overlap)
+            if isolate:
+                ctx = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    results.append(pool.submit(run_case, *args).result())
+            else:
+                results.append(run_case(*args))
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "chunker_version": CHUNKER_VERSION,
+            "input_folder": input_folder,
+            "corpus_papers": len(articles),
+            "corpus_tokens": input_tokens,
+            "max_tokens": max_tokens,
+            "overlap_tokens": overlap_tokens,
+            "word_overlap": word_overlap,
+            "isolated": isolate,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    """
+    Return one message per throughput metric that dropped more than
+    max_regression (a fraction) below the matching baseline case.
+    """
+    baseline_cases = {(r["strategy"], r["scale"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        base = baseline_cases.get((result["strategy"], result["scale"]))
+        if base is None:
+            continue
+        for metric in _THROUGHPUT_METRICS:
+            if base.get(metric) and result[metric] < base[metric] * (1 - max_regression):
+                regressions.append(
+                    f"{result['strategy']} x{result['scale']} {metric}: "
+                    f"{result[metric]} vs baseline {base[metric]} "
+                    f"({result[metric] / base[metric] - 1:+.1%})"
+                )
+    return regressions
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Benchmark the BIOMEDICAL and CHARACTER PMC chunkers.")
+    parser.add_argument("--input-folder", default=str(DEFAULT_INPUT_FOLDER))
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=STRATEGIES)
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--max-tokens", type=int, default=MAX_CHUNK_TOKENS)
+    parser.add_argument("--overlap-tokens", type=int, default=OVERLAP_TOKENS)
+    parser.add_argument("--word-overlap", type=int, default=WORD_OVERLAP)
+    parser.add_argument("--output", default="chunker_benchmark.json", help="JSON report path")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed throughput drop vs baseline")
+    parser.add_argument("--in-process", action="store_true", help="Run all cases in this process")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        input_folder=args.input_folder,
+        strategies=tuple(args.strategies),
+        scales=tuple(args.scales),
+        max_tokens=args.max_tokens,
+        overlap_tokens=args.overlap_tokens,
+        word_overlap=args.word_overlap,
+        isolate=not args.in_process,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    for r in report["results"]:
+        print(
+            f"{r['strategy']:<10} x{r['scale']:<4} "
+            f"{r['papers_per_s']:>9.1f} papers/s {r['chunks_per_s']:>10.1f} chunks/s "
+            f"{r['tokens_per_s']:>11.0f} tokens/s  p50 {r['latency_ms']['p50']:.1f}ms "
+            f"p99 {r['latency_ms']['p99']:.1f}ms  tokenizer calls {r['tokenizer_calls']}  "
+            f"peak RSS {r['peak_rss_mb'] or 0:.0f}MB"
+        )
+    print(f"Report: {args.output}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), args.max_regression)
+        print(f"Regressions vs {args.baseline}: {len(regressions)}")
+        for line in regressions:
+            print(f"  {line}")
+    print("=" * 60)
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
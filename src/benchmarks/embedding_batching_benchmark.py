@@ -0,0 +1,173 @@
+"""
+Naive vs length-bucketed batching for local SentenceTransformers embeddings.
+
+Every article in `pmc_articles/` is chunked with the BIOMEDICAL chunker and the
+chunk texts are embedded twice, in document order:
+
+- naive: consecutive groups of --batch-size chunks, one encode() per group,
+  so each batch is padded to its longest chunk
+- bucketed: SentenceTransformersProvider.embed_texts, which buckets texts by
+  token length under a padded-token budget
+
+Reported per mode: chunks/s, real tokens/s, padded tokens (what the model
+actually computes) and padding efficiency (real / padded tokens). The min
+cosine between the two modes' vectors checks that bucketed results come back
+in input order.
+
+Usage:
+    python -m src.benchmarks.embedding_batching_benchmark --backend torch
+    python -m src.benchmarks.embedding_batching_benchmark --backend onnx --onnx-dir onnx_models
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import numpy as np
+
+from src.benchmarks.chunker_benchmark import DEFAULT_INPUT_FOLDER, load_articles
+from src.helpers.batching import batched
+from src.services.biomedical_chunker import chunk_paper_sections
+from src.services.parallel_chunker import article_sections
+from src.stores.llm.embedding_batches import token_budget_batches
+from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS
+from src.stores.llm.llm_enums import EmbeddingBackendEnums, LLMEnums
+from src.stores.llm.onnx_embedder import embedding_parity
+from src.stores.llm.providers import SentenceTransformersProvider
+
+DEFAULT_MODEL_ID, DEFAULT_EMBEDDING_SIZE = EMBEDDING_DEFAULTS[LLMEnums.SENTENCE_TRANSFORMERS.value]
+
+
+def chunk_texts(folder: str | Path, limit: int | None = None) -> list[str]:
+    texts = []
+    for article in load_articles(folder):
+        chunks = chunk_paper_sections(
+            sections=article_sections(article),
+            doc_id=article.get("doc_id", ""),
+            doc_title=article.get("doc_title", ""),
+            source_url=article.get("source_url", ""),
+        )
+        texts.extend(chunk["text"] for chunk in chunks)
+    return texts[:limit] if limit else texts
+
+
+def _padded_tokens(lengths: list[int], batches: list[list[int]]) -> int:
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+
+
+def run_benchmark(provider: SentenceTransformersProvider, texts: list[str], batch_size: int, repeats: int) -> dict:
+    model = provider._embedding_model
+    lengths = provider._token_lengths(texts)
+    real_tokens = sum(lengths)
+
+    def naive() -> np.ndarray:
+        vectors = []
+        for batch in batched(texts, batch_size):
+            vectors.extend(model.encode(batch, batch_size=len(batch), convert_to_numpy=True))
+        return np.asarray(vectors)
+
+    def bucketed() -> np.ndarray:
+        return np.asarray(provider.embed_texts(texts))
+
+    naive_batches = list(batched(range(len(texts)), batch_size))
+    max_seq_length = getattr(model, "max_seq_length", None) or 512
+    bucketed_batches = []
+    for group in batched(range(len(texts)), provider.EMBEDDING_CALL_SIZE):
+        buckets = token_budget_batches(
+            [lengths[i] for i in group],
+            max_batch_tokens=provider.embedding_batch_size * max_seq_length,
+            max_batch_size=max(provider.embedding_batch_size, provider.EMBEDDING_MAX_BUCKET_SIZE),
+        )
+        bucketed_batches.extend([group[i] for i in bucket] for bucket in buckets)
+
+    results = {}
+    vectors = {}
+    for name, run, batches in (("naive", naive, naive_batches), ("bucketed", bucketed, bucketed_batches)):
+        run_texts = texts[:batch_size]
+        model.encode(run_texts, batch_size=len(run_texts))  # warm-up
+        best = float("inf")
+        for _ in range(repeats):
+            started = time.perf_counter()
+            vectors[name] = run()
+            best = min(best, time.perf_counter() - started)
+        padded = _padded_tokens(lengths, batches)
+        results[name] = {
+            "seconds": round(best, 3),
+            "chunks_per_s": round(len(texts) / best, 1),
+            "tokens_per_s": round(real_tokens / best, 1),
+            "forward_passes": len(batches),
+            "padded_tokens": padded,
+            "padding_efficiency": round(real_tokens / padded, 3),
+        }
+
+    return {
+        "chunks": len(texts),
+        "real_tokens": real_tokens,
+        "token_length": {"min": min(lengths), "max": max(lengths), "mean": round(real_tokens / len(texts), 1)},
+        "results": results,
+        "speedup": round(results["naive"]["seconds"] / results["bucketed"]["seconds"], 2),
+        "parity": embedding_parity(vectors["naive"], vectors["bucketed"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark naive vs length-bucketed local embedding batches.")
+    parser.add_argument("--input-folder", default=str(DEFAULT_INPUT_FOLDER))
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID)
+    parser.add_argument("--backend", default=EmbeddingBackendEnums.TORCH.value,
+                        choices=[backend.value for backend in EmbeddingBackendEnums])
+    parser.add_argument("--onnx-dir", default=str(SRC_ROOT.parent / "onnx_models"))
+    parser.add_argument("--batch-size", type=int, default=SentenceTransformersProvider.EMBEDDING_DEFAULT_BATCH_SIZE)
+    parser.add_argument("--limit", type=int, default=None, help="Embed at most this many chunks")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per mode; the best is kept")
+    parser.add_argument("--output", default="embedding_batching_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    texts = chunk_texts(args.input_folder, args.limit)
+    if not texts:
+        sys.exit(f"No article chunks found in {args.input_folder}")
+
+    provider = SentenceTransformersProvider(
+        openai_api_key="unused",
+        embedding_batch_size=args.batch_size,
+        embedding_backend=args.backend,
+        onnx_model_dir=args.onnx_dir,
+    )
+    provider.set_embedding_model(args.model, DEFAULT_EMBEDDING_SIZE)
+
+    report = {
+        "model_id": args.model,
+        "backend": args.backend,
+        "batch_size": args.batch_size,
+        **run_benchmark(provider, texts, args.batch_size, args.repeats),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    print(
+        f"{report['model_id']} ({report['backend']}): {report['chunks']} chunks, "
+        f"tokens/chunk {report['token_length']['min']}-{report['token_length']['max']} "
+        f"(mean {report['token_length']['mean']})"
+    )
+    for name, r in report["results"].items():
+        print(
+            f"{name:<9} {r['chunks_per_s']:>8.1f} chunks/s {r['tokens_per_s']:>10.0f} tokens/s  "
+            f"{r['forward_passes']} passes  padding efficiency {r['padding_efficiency']:.2f}"
+        )
+    print(f"Speedup: x{report['speedup']:.2f}  min cosine naive vs bucketed {report['parity']['min_cosine']:.4f}")
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Retrieval quality vs search latency and memory for shortened OpenAI embeddings.
+
+Every article in `pmc_articles/` is chunked with the BIOMEDICAL chunker. For
+--queries chunks, one sentence of the chunk is the query and that chunk is
+the relevant result. Chunks and queries are embedded with
+text-embedding-3-large at each of --dims:
+
+- truncate (default): embed once at the native 3072 dims and shorten locally
+  (first d dims, L2-renormalized), which is how the v3 models shorten vectors
+  for the `dimensions` parameter; one API pass covers every size
+- api: one embedding pass per size with `dimensions` set, as ingest does;
+  also reports the cosine between API and locally shortened vectors
+
+Search is exact cosine (dot product of normalized float32 vectors) over all
+chunks, so latency and memory scale with the dimension the same way a flat
+Qdrant index does. Reported per size: hit rate and MRR at --top-k for the
+source chunk, overlap of the top-k with the native-size top-k, p50/p99
+search latency per query, and vector memory (total and per point).
+
+Usage:
+    OPENAI_API_KEY=... python -m src.benchmarks.embedding_dimensions_benchmark --dims 256 512 1024 3072
+    python -m src.benchmarks.embedding_dimensions_benchmark --source api --vectors dims_vectors.npz
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import numpy as np
+
+from src.benchmarks.chunker_benchmark import DEFAULT_INPUT_FOLDER, _percentile
+from src.benchmarks.embedding_batching_benchmark import chunk_texts
+from src.services.sentence_segmenter import get_sentence_segmenter
+from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS, OPENAI_DIMENSIONS_MODELS
+from src.stores.llm.llm_enums import DocumentTypeEnum, LLMEnums
+from src.stores.llm.onnx_embedder import embedding_parity
+from src.stores.llm.providers import OpenAIProvider
+
+DEFAULT_MODEL_ID, NATIVE_SIZE = EMBEDDING_DEFAULTS[LLMEnums.OPENAI.value]
+
+
+def sample_queries(texts: list[str], count: int, seed: int = 0,
+                   min_words: int = 6, max_words: int = 40) -> list[tuple[str, int]]:
+    """(sentence, chunk index) pairs: one sentence from each of up to count chunks."""
+    segmenter = get_sentence_segmenter()
+    rng = random.Random(seed)
+    order = list(range(len(texts)))
+    rng.shuffle(order)
+    queries = []
+    for i in order:
+        sentences = [s for s in segmenter.split(texts[i]) if min_words <= len(s.split()) <= max_words]
+        if sentences:
+            queries.append((rng.choice(sentences), i))
+            if len(queries) >= count:
+                break
+    return queries
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+def shorten(vectors: np.ndarray, dims: int) -> np.ndarray:
+    """First dims of each vector, renormalized, as the v3 models shorten embeddings."""
+    return _normalize(np.ascontiguousarray(vectors[:, :dims], dtype=np.float32))
+
+
+def embed(provider: OpenAIProvider, texts: list[str], dims: int, document_type: str) -> np.ndarray:
+    provider.set_embedding_model(provider.embedding_model_id, dims)
+    vectors = provider.embed_texts(texts, document_type=document_type)
+    if vectors is None or any(vector is None for vector in vectors):
+        sys.exit(f"Embedding failed at {dims} dims")
+    return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def search(doc_vectors: np.ndarray, query_vectors: np.ndarray, top_k: int) -> tuple[np.ndarray, list[float]]:
+    """Exact top_k per query (best first) and per-query search seconds."""
+    results = np.empty((len(query_vectors), top_k), dtype=np.int64)
+    seconds = []
+    for row, query in enumerate(query_vectors):
+        started = time.perf_counter()
+        scores = doc_vectors @ query
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        results[row] = top[np.argsort(-scores[top])]
+        seconds.append(time.perf_counter() - started)
+    return results, seconds
+
+
+def evaluate(doc_vectors: np.ndarray, query_vectors: np.ndarray, relevant: list[int],
+             top_k: int, reference: np.ndarray | None = None) -> dict:
+    results, seconds = search(doc_vectors, query_vectors, top_k)
+    hits, reciprocal_ranks = 0, 0.0
+    for row, target in enumerate(relevant):
+        ranks = np.flatnonzero(results[row] == target)
+        if len(ranks):
+            hits += 1
+            reciprocal_ranks += 1.0 / (ranks[0] + 1)
+
+    overlap = None
+    if reference is not None:
+        overlap = float(np.mean([
+            len(set(results[row]) & set(reference[row])) / top_k for row in range(len(results))
+        ]))
+
+    seconds.sort()
+    dims = doc_vectors.shape[1]
+    return {
+        "dims": dims,
+        f"hit_rate_at_{top_k}": round(hits / len(relevant), 4),
+        f"mrr_at_{top_k}": round(reciprocal_ranks / len(relevant), 4),
+        f"overlap_at_{top_k}_vs_native": round(overlap, 4) if overlap is not None else None,
+        "search_ms": {
+            "p50": round(_percentile(seconds, 50) * 1000, 3),
+            "p99": round(_percentile(seconds, 99) * 1000, 3),
+        },
+        "vector_bytes_per_point": dims * 4,
+        "vector_mb": round(doc_vectors.nbytes / (1024 * 1024), 2),
+    }, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare retrieval quality, search latency and memory across OpenAI embedding sizes."
+    )
+    parser.add_argument("--input-folder", default=str(DEFAULT_INPUT_FOLDER))
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID, choices=sorted(OPENAI_DIMENSIONS_MODELS))
+    parser.add_argument("--dims", nargs="+", type=int, default=[256, 512, 1024, NATIVE_SIZE])
+    parser.add_argument("--source", default="truncate", choices=["truncate", "api"],
+                        help="Shorten native vectors locally, or embed once per size with `dimensions`")
+    parser.add_argument("--limit", type=int, default=None, help="Index at most this many chunks")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"))
+    parser.add_argument("--api-url", default=os.environ.get("OPENAI_API_URL"))
+    parser.add_argument("--vectors", default=None,
+                        help="npz file caching the embeddings; reused when it matches the corpus")
+    parser.add_argument("--output", default="embedding_dimensions_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    native_size = OPENAI_DIMENSIONS_MODELS[args.model]
+    dims_list = sorted({d for d in args.dims if 0 < d <= native_size} | {native_size})
+
+    texts = chunk_texts(args.input_folder, args.limit)
+    if not texts:
+        sys.exit(f"No article chunks found in {args.input_folder}")
+    queries = sample_queries(texts, args.queries)
+    query_texts = [query for query, _ in queries]
+    relevant = [index for _, index in queries]
+    top_k = min(args.top_k, len(texts))
+
+    sizes = [native_size] if args.source == "truncate" else dims_list
+    cached = {}
+    if args.vectors and Path(args.vectors).exists():
+        with np.load(args.vectors) as data:
+            cached = {key: data[key] for key in data.files}
+    vectors = {}
+    for dims in sizes:
+        doc_key, query_key = f"docs_{dims}", f"queries_{dims}"
+        if doc_key in cached and query_key in cached and len(cached[doc_key]) == len(texts) \
+                and len(cached[query_key]) == len(query_texts):
+            vectors[dims] = (cached[doc_key], cached[query_key])
+            continue
+        if not args.api_key:
+            sys.exit("Set OPENAI_API_KEY (or --api-key) to embed the corpus")
+        provider = OpenAIProvider(api_key=args.api_key, api_url=args.api_url)
+        provider.embedding_model_id = args.model
+        vectors[dims] = (
+            embed(provider, texts, dims, DocumentTypeEnum.DOCUMENT.value),
+            embed(provider, query_texts, dims, DocumentTypeEnum.QUERY.value),
+        )
+    if args.vectors:
+        arrays = dict(cached)
+        for dims, (doc_vectors, query_vectors) in vectors.items():
+            arrays[f"docs_{dims}"], arrays[f"queries_{dims}"] = doc_vectors, query_vectors
+        np.savez(args.vectors, **arrays)
+
+    native_docs, native_queries = vectors[native_size]
+    results = []
+    reference = None
+    for dims in sorted(dims_list, reverse=True):
+        if dims in vectors:
+            doc_vectors, query_vectors = vectors[dims]
+        else:
+            doc_vectors, query_vectors = shorten(native_docs, dims), shorten(native_queries, dims)
+        result, top = evaluate(doc_vectors, query_vectors, relevant, top_k, reference)
+        if dims == native_size:
+            reference = top
+            result[f"overlap_at_{top_k}_vs_native"] = 1.0
+        if args.source == "api" and dims != native_size:
+            result["api_vs_truncated"] = embedding_parity(shorten(native_docs, dims), doc_vectors)
+        results.append(result)
+    results.reverse()
+
+    report = {
+        "model_id": args.model,
+        "source": args.source,
+        "chunks": len(texts),
+        "queries": len(query_texts),
+        "top_k": top_k,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    print(f"{args.model} ({args.source}): {len(texts)} chunks, {len(query_texts)} queries, top {top_k}")
+    for r in results:
+        print(
+            f"{r['dims']:>5} dims  hit@{top_k} {r[f'hit_rate_at_{top_k}']:.3f}  "
+            f"MRR {r[f'mrr_at_{top_k}']:.3f}  overlap {r[f'overlap_at_{top_k}_vs_native']:.3f}  "
+            f"search p50 {r['search_ms']['p50']:.3f}ms  {r['vector_bytes_per_point']}B/point "
+            f"({r['vector_mb']:.1f}MB)"
+        )
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Filtered search latency and recall of the embedded LOCAL vector DB.
+
+--points chunks are upserted through LocalDBProvider.insert_many with
+metadata shaped like PMC ingest: --chunks-per-doc consecutive chunks per
+doc_id, five section titles in order, and one scrape date per doc spread over
+a year. Vectors are the synthetic clustered ones of local_vector_db_benchmark.
+
+Each filter below is searched three ways, with --queries queries:
+- pushdown: search_by_vector with payload_filter (SQLite payload indexes,
+  then exact search over the matches or filtered HNSW traversal)
+- postfilter: the unfiltered HNSW top --postfilter-factor x k, filtered in
+  Python afterwards; what callers had to do before payload filters
+- truth: exact search over the matching points, for recall@k
+
+Filters: a single doc (selective), one section (~20%), a 30-day date range,
+and two docs within a section range.
+
+Usage:
+    python -m src.benchmarks.filtered_search_benchmark --points 100000 --dims 384
+    python -m src.benchmarks.filtered_search_benchmark --points 1000000 --dims 128 --dir /data/tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import numpy as np
+
+from src.benchmarks.local_vector_db_benchmark import _latency, _unit, make_vectors
+from src.stores.vectordb.local_index import LocalCollection, close_local_collections
+from src.stores.vectordb.payload_filter import PayloadFilter, payload_datetime
+from src.stores.vectordb.providers import LocalDBProvider
+from src.stores.vectordb.vector_db_enums import DistanceMethodEnums
+
+COLLECTION = "benchmark"
+SECTIONS = ["Introduction", "Methods", "Results", "Discussion", "Conclusion"]
+FIRST_DAY = date(2025, 1, 1)
+
+
+def _doc_id(doc: int) -> str:
+    # Stored doc_ids are article UUIDs, not PMC ids
+    return str(uuid.UUID(int=doc))
+
+
+def make_metadata(start: int, end: int, chunks_per_doc: int) -> list[dict]:
+    metadata = []
+    for i in range(start, end):
+        doc, position = divmod(i, chunks_per_doc)
+        section = position * len(SECTIONS) // chunks_per_doc
+        metadata.append({
+            "doc_id": _doc_id(doc),
+            "section_title": SECTIONS[section],
+            "section_order": section,
+            "chunk_index": position,
+            "source_url": f"https://pmc.ncbi.nlm.nih.gov/articles/PMC{doc}/",
+            "scraped_at": payload_datetime((FIRST_DAY + timedelta(days=doc % 365)).isoformat()),
+        })
+    return metadata
+
+
+def make_filters(docs: int) -> dict[str, PayloadFilter]:
+    return {
+        "single_doc": PayloadFilter(doc_ids=(_doc_id(docs // 2),)),
+        "section": PayloadFilter(section_titles=("Results",)),
+        "date_30d": PayloadFilter(scraped_from=date(2025, 3, 1), scraped_to=date(2025, 3, 30)),
+        "two_docs_sections": PayloadFilter(
+            doc_ids=(_doc_id(docs // 3), _doc_id(docs // 4)), section_order_min=1, section_order_max=2
+        ),
+    }
+
+
+def _matches(metadata: dict, payload_filter: PayloadFilter) -> bool:
+    for path, values in payload_filter.matches().items():
+        if metadata.get(path.split(".", 1)[1]) not in values:
+            return False
+    order = metadata.get("section_order")
+    if payload_filter.section_order_min is not None and order < payload_filter.section_order_min:
+        return False
+    if payload_filter.section_order_max is not None and order > payload_filter.section_order_max:
+        return False
+    scraped_from, scraped_before = payload_filter.scraped_range()
+    scraped_at = metadata.get("scraped_at")
+    if scraped_from is not None and scraped_at < scraped_from.strftime("%Y-%m-%dT%H:%M:%SZ"):
+        return False
+    if scraped_before is not None and scraped_at >= scraped_before.strftime("%Y-%m-%dT%H:%M:%SZ"):
+        return False
+    return True
+
+
+def _timed(search, queries: np.ndarray) -> tuple[list, list[float]]:
+    results, seconds = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = search(query)
+        seconds.append(time.perf_counter() - started)
+        results.append([point_id for point_id, _, _ in hits])
+    seconds.sort()
+    return results, seconds
+
+
+def _recall(found: list, truth: list) -> float:
+    scored = [len(set(f) & set(t)) / len(t) for f, t in zip(found, truth) if t]
+    return round(float(np.mean(scored)), 4) if scored else 1.0
+
+
+def run_benchmark(root: Path, vectors: np.ndarray, queries: np.ndarray, top_k: int, ef: int,
+                  chunks_per_doc: int, postfilter_factor: int, batch_size: int) -> dict:
+    points, dims = vectors.shape
+    provider = LocalDBProvider(str(root), DistanceMethodEnums.COSINE.value, hnsw=True, hnsw_ef=ef)
+    provider.connect()
+    provider.create_collection(COLLECTION, dims)
+
+    started = time.perf_counter()
+    for start in range(0, points, batch_size):
+        end = min(start + batch_size, points)
+        ok = provider.insert_many(
+            COLLECTION,
+            texts=[f"chunk {i}" for i in range(start, end)],
+            vectors=vectors[start:end],
+            metadata=make_metadata(start, end, chunks_per_doc),
+            record_ids=[str(i) for i in range(start, end)],
+            batch_size=batch_size,
+        )
+        if not ok:
+            sys.exit("Insert failed")
+    ingest_seconds = time.perf_counter() - started
+    close_local_collections()  # saves the graph
+
+    path = root / COLLECTION
+    exact = LocalCollection(path, hnsw=False)
+    collection = LocalCollection(path, hnsw=True, hnsw_ef=ef)
+    docs = (points + chunks_per_doc - 1) // chunks_per_doc
+
+    results = []
+    for name, payload_filter in {"none": None, **make_filters(docs)}.items():
+        truth, _ = _timed(lambda q: exact.search(q, top_k, payload_filter=payload_filter), queries)
+        found, seconds = _timed(lambda q: collection.search(q, top_k, payload_filter=payload_filter), queries)
+        with collection._lock:
+            matching = collection._filtered_rows(payload_filter).size if payload_filter else points
+        result = {
+            "filter": name,
+            "matching_points": int(matching),
+            "pushdown": {**_latency(seconds), f"recall_at_{top_k}": _recall(found, truth)},
+        }
+        if payload_filter is not None:
+            def postfilter(query):
+                hits = collection.search(query, top_k * postfilter_factor)
+                return [hit for hit in hits if _matches(hit[2]["metadata"], payload_filter)][:top_k]
+
+            found, seconds = _timed(postfilter, queries)
+            result["postfilter"] = {**_latency(seconds), f"recall_at_{top_k}": _recall(found, truth)}
+        results.append(result)
+    exact.close()
+    collection.close()
+
+    return {
+        "points": points,
+        "dims": dims,
+        "queries": len(queries),
+        "top_k": top_k,
+        "ef": ef,
+        "ingest": {"seconds": round(ingest_seconds, 2), "points_per_s": round(points / ingest_seconds, 1)},
+        "filters": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark filtered search on the embedded LOCAL vector DB.")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--dims", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--ef", type=int, default=64)
+    parser.add_argument("--chunks-per-doc", type=int, default=60)
+    parser.add_argument("--postfilter-factor", type=int, default=10, help="Over-fetch factor of the postfilter baseline")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Points per insert_many call")
+    parser.add_argument("--dir", default=None, help="Index directory (default: a temporary directory)")
+    parser.add_argument("--output", default="filtered_search_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.points, args.dims)
+    rng = np.random.default_rng(1)
+    picked = vectors[rng.integers(0, len(vectors), args.queries)]
+    queries = _unit(picked + rng.standard_normal(picked.shape).astype(np.float32) * 0.05)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        report = run_benchmark(Path(tmp), vectors, queries, args.top_k, args.ef,
+                               args.chunks_per_doc, args.postfilter_factor, args.batch_size)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    print(f"{report['points']} points x {report['dims']} dims, {report['queries']} queries, "
+          f"top {report['top_k']}, ef {report['ef']}")
+    print(f"Ingest: {report['ingest']['points_per_s']:.0f} points/s")
+    recall_key = f"recall_at_{report['top_k']}"
+    for r in report["filters"]:
+        for mode in ("pushdown", "postfilter"):
+            if mode in r:
+                m = r[mode]
+                print(f"{r['filter']:<18} {mode:<10} matches {r['matching_points']:>8}  p50 {m['p50_ms']:>8.3f}ms  "
+                      f"p99 {m['p99_ms']:>8.3f}ms  recall@{report['top_k']} {m[recall_key]:.3f}")
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
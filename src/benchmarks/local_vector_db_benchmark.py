@@ -0,0 +1,178 @@
+"""
+Search latency and recall of the embedded LOCAL vector DB.
+
+--points vectors are upserted through LocalDBProvider.insert_many into a
+fresh collection under a temporary directory. By default they are synthetic
+clustered unit vectors, shaped like chunk embeddings. --vectors takes a
+float32 .npy file instead, e.g. the output of `python -m src.cli.embed_pmc`;
+rows are reused with small noise when it has fewer than --points. Queries are
+noisy copies of random points.
+
+Reported:
+- ingest: points/s for the upserts, including HNSW graph inserts
+- exact: p50/p99 latency of NumPy exact search over the memory-mapped matrix
+- hnsw: p50/p99 latency and recall@k against exact search, for each --ef
+- reopen: time to open the collection again from disk (saved graph), and
+  its size on disk
+
+Usage:
+    python -m src.benchmarks.local_vector_db_benchmark --points 100000 --dims 768
+    python -m src.benchmarks.local_vector_db_benchmark --vectors pmc_embeddings.npy --ef 32 64 128
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import numpy as np
+
+from src.benchmarks.chunker_benchmark import _percentile
+from src.stores.vectordb.local_index import LocalCollection, close_local_collections
+from src.stores.vectordb.providers import LocalDBProvider
+from src.stores.vectordb.vector_db_enums import DistanceMethodEnums
+
+COLLECTION = "benchmark"
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def make_vectors(points: int, dims: int, clusters: int = 1000, seed: int = 0,
+                 source: np.ndarray | None = None) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if source is not None:
+        rows = source[np.arange(points) % len(source)].astype(np.float32)
+        if points > len(source):
+            rows = rows + rng.standard_normal(rows.shape).astype(np.float32) * 0.01
+        return _unit(rows)
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    vectors = np.empty((points, dims), dtype=np.float32)
+    for start in range(0, points, 10_000):
+        end = min(start + 10_000, points)
+        assigned = centers[rng.integers(0, clusters, end - start)]
+        vectors[start:end] = assigned + rng.standard_normal((end - start, dims)).astype(np.float32) * 0.6
+    return _unit(vectors)
+
+
+def _timed_search(collection: LocalCollection, queries: np.ndarray, top_k: int) -> tuple[list, list[float]]:
+    results, seconds = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = collection.search(query, top_k)
+        seconds.append(time.perf_counter() - started)
+        results.append([point_id for point_id, _, _ in hits])
+    seconds.sort()
+    return results, seconds
+
+
+def _latency(seconds: list[float]) -> dict:
+    return {
+        "p50_ms": round(_percentile(seconds, 50) * 1000, 3),
+        "p99_ms": round(_percentile(seconds, 99) * 1000, 3),
+    }
+
+
+def run_benchmark(root: Path, vectors: np.ndarray, queries: np.ndarray, top_k: int,
+                  ef_values: list[int], batch_size: int) -> dict:
+    points, dims = vectors.shape
+    provider = LocalDBProvider(str(root), DistanceMethodEnums.COSINE.value, hnsw=True, hnsw_min_points=0)
+    provider.connect()
+    provider.create_collection(COLLECTION, dims)
+
+    started = time.perf_counter()
+    for start in range(0, points, batch_size):
+        end = min(start + batch_size, points)
+        ok = provider.insert_many(
+            COLLECTION,
+            texts=[f"chunk {i}" for i in range(start, end)],
+            vectors=vectors[start:end],
+            metadata=[{"row": i} for i in range(start, end)],
+            record_ids=[str(i) for i in range(start, end)],
+            batch_size=batch_size,
+        )
+        if not ok:
+            sys.exit("Insert failed")
+    ingest_seconds = time.perf_counter() - started
+    close_local_collections()  # saves the graph
+
+    path = root / COLLECTION
+    exact_collection = LocalCollection(path, hnsw=False)
+    exact, exact_seconds = _timed_search(exact_collection, queries, top_k)
+    exact_collection.close()
+
+    started = time.perf_counter()
+    collection = LocalCollection(path, hnsw=True, hnsw_min_points=0)
+    reopen_seconds = time.perf_counter() - started
+
+    hnsw_results = []
+    for ef in ef_values:
+        collection.hnsw_ef = ef
+        found, seconds = _timed_search(collection, queries, top_k)
+        recall = np.mean([len(set(f) & set(e)) / len(e) for f, e in zip(found, exact) if e])
+        hnsw_results.append({"ef": ef, **_latency(seconds), f"recall_at_{top_k}": round(float(recall), 4)})
+    collection.close()
+
+    return {
+        "points": points,
+        "dims": dims,
+        "queries": len(queries),
+        "top_k": top_k,
+        "ingest": {"seconds": round(ingest_seconds, 2), "points_per_s": round(points / ingest_seconds, 1)},
+        "exact": _latency(exact_seconds),
+        "hnsw": hnsw_results,
+        "reopen_seconds": round(reopen_seconds, 3),
+        "disk_mb": round(sum(f.stat().st_size for f in path.iterdir()) / (1024 * 1024), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the embedded LOCAL vector DB.")
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--vectors", default=None, help="float32 .npy embeddings to index instead of synthetic ones")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--ef", nargs="+", type=int, default=[32, 64, 128])
+    parser.add_argument("--batch-size", type=int, default=1000, help="Points per insert_many call")
+    parser.add_argument("--dir", default=None, help="Index directory (default: a temporary directory)")
+    parser.add_argument("--output", default="local_vector_db_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    source = np.load(args.vectors, mmap_mode="r") if args.vectors else None
+    vectors = make_vectors(args.points, source.shape[1] if source is not None else args.dims, source=source)
+    rng = np.random.default_rng(1)
+    picked = vectors[rng.integers(0, len(vectors), args.queries)]
+    queries = _unit(picked + rng.standard_normal(picked.shape).astype(np.float32) * 0.05)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        report = run_benchmark(Path(tmp), vectors, queries, args.top_k, args.ef, args.batch_size)
+    report["source"] = args.vectors or "synthetic"
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    print(f"{report['points']} points x {report['dims']} dims ({report['source']}), {report['queries']} queries")
+    print(f"Ingest: {report['ingest']['points_per_s']:.0f} points/s  disk {report['disk_mb']:.1f}MB  "
+          f"reopen {report['reopen_seconds']:.2f}s")
+    print(f"exact        p50 {report['exact']['p50_ms']:>8.3f}ms  p99 {report['exact']['p99_ms']:>8.3f}ms")
+    recall_key = f"recall_at_{report['top_k']}"
+    for r in report["hnsw"]:
+        print(f"hnsw ef={r['ef']:<4} p50 {r['p50_ms']:>8.3f}ms  p99 {r['p99_ms']:>8.3f}ms  "
+              f"recall@{report['top_k']} {r[recall_key]:.3f}")
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+PyTorch vs ONNX Runtime (int8) embedding throughput on CPU.
+
+Texts are ~chunk-sized word windows cut from the sections of every article in
+`pmc_articles/`. For each thread count, the torch SentenceTransformer (with
+torch.set_num_threads) and the ONNX export (a session with that many intra-op
+threads) embed the same texts; the report gives texts/s, the ONNX speedup and
+the min/mean cosine between the two backends' embeddings.
+
+Export the model first:
+    python -m src.cli.export_onnx --model neuml/pubmedbert-base-embeddings
+
+Usage:
+    python -m src.benchmarks.onnx_embedding_benchmark --threads 1 2 4 8 --texts 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS
+from src.stores.llm.llm_enums import LLMEnums
+from src.stores.llm.onnx_embedder import OnnxSentenceEmbedder, embedding_parity, onnx_model_dir
+
+DEFAULT_INPUT_FOLDER = SRC_ROOT.parent / "pmc_articles"
+DEFAULT_ONNX_DIR = SRC_ROOT.parent / "onnx_models"
+DEFAULT_MODEL_ID = EMBEDDING_DEFAULTS[LLMEnums.SENTENCE_TRANSFORMERS.value][0]
+PARITY_MIN_COSINE = 0.99
+
+
+def sample_texts(folder: str | Path, limit: int, words_per_text: int = 200) -> list[str]:
+    """Cut section text of the articles in folder into word windows, up to limit texts."""
+    texts: list[str] = []
+    for path in sorted(Path(folder).glob("*.json")):
+        with path.open("r", encoding="utf-8") as f:
+            article = json.load(f)
+        for section in article.get("sections", []):
+            words = (section.get("text") or "").split()
+            for start in range(0, len(words), words_per_text):
+                texts.append(" ".join(words[start:start + words_per_text]))
+                if len(texts) >= limit:
+                    return texts
+    return texts
+
+
+def _time_encode(model, texts: list[str], batch_size: int, repeats: int) -> tuple[float, object]:
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+    best = float("inf")
+    embeddings = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        best = min(best, time.perf_counter() - started)
+    return best, embeddings
+
+
+def run_benchmark(model_id: str, onnx_dir: str | Path, texts: list[str], threads: list[int],
+                  batch_size: int, repeats: int) -> dict:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    torch_model = SentenceTransformer(model_id, device="cpu")
+    export_dir = onnx_model_dir(onnx_dir, model_id)
+
+    results = []
+    onnx_model = None
+    for n in threads:
+        torch.set_num_threads(n)
+        torch_seconds, torch_embeddings = _time_encode(torch_model, texts, batch_size, repeats)
+        onnx_model = OnnxSentenceEmbedder(export_dir, num_threads=n)
+        onnx_seconds, onnx_embeddings = _time_encode(onnx_model, texts, batch_size, repeats)
+        parity = embedding_parity(torch_embeddings, onnx_embeddings)
+        results.append({
+            "threads": n,
+            "torch_texts_per_s": round(len(texts) / torch_seconds, 1),
+            "onnx_texts_per_s": round(len(texts) / onnx_seconds, 1),
+            "speedup": round(torch_seconds / onnx_seconds, 2),
+            **parity,
+        })
+
+    return {
+        "model_id": model_id,
+        "onnx_model": str(onnx_model.model_path) if onnx_model else None,
+        "texts": len(texts),
+        "batch_size": batch_size,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark torch vs ONNX int8 sentence embeddings on CPU.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID)
+    parser.add_argument("--onnx-dir", default=str(DEFAULT_ONNX_DIR))
+    parser.add_argument("--input-folder", default=str(DEFAULT_INPUT_FOLDER))
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case; the best is kept")
+    parser.add_argument("--output", default="onnx_embedding_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    texts = sample_texts(args.input_folder, args.texts)
+    if not texts:
+        sys.exit(f"No article text found in {args.input_folder}")
+
+    report = run_benchmark(args.model, args.onnx_dir, texts, args.threads, args.batch_size, args.repeats)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    print(f"{report['model_id']}: {report['texts']} texts, batch {report['batch_size']}")
+    for r in report["results"]:
+        print(
+            f"threads {r['threads']:<3} torch {r['torch_texts_per_s']:>8.1f} texts/s  "
+            f"onnx {r['onnx_texts_per_s']:>8.1f} texts/s  x{r['speedup']:.2f}  "
+            f"min cosine {r['min_cosine']:.4f}"
+        )
+    failed = [r for r in report["results"] if r["min_cosine"] < PARITY_MIN_COSINE]
+    print(f"Parity (min cosine > {PARITY_MIN_COSINE}): {'FAIL' if failed else 'OK'}")
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Upsert throughput of QdrantDBProvider.insert_many_async against a local stub.
+
+The stub serves the part of the Qdrant REST API an upsert uses
+(PUT /collections/{name}/points?wait=) and models a remote cluster:
+- every request costs a round trip (--rtt-ms) plus its body at --bandwidth-mbps
+- updates are applied one at a time per collection, --apply-ms-per-point each,
+  in arrival order; wait=false answers once the update is queued
+  ("acknowledged"), wait=true only once it is applied ("completed")
+- a fraction of requests (--error-rate) fail with 503 before being queued
+
+The provider talks to it through AsyncQdrantClient, so request building and
+serialization are real. Modes:
+- sequential: the previous behaviour, batches of 20 points, each sent with
+  wait=true and awaited before the next; no retries
+- pipelined-N: insert_many_async with N requests in flight, batches sized by
+  --batch-bytes, wait=true only on the last batch, and retries
+
+After each mode the stub's point count is checked against --points.
+
+Usage:
+    python -m src.benchmarks.qdrant_upsert_benchmark --points 2000 --dims 3072
+    python -m src.benchmarks.qdrant_upsert_benchmark --rtt-ms 80 --in-flight 1 4 8 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from qdrant_client.http.models import PointStruct
+
+from src.benchmarks.rate_limit_benchmark import _free_port, make_texts
+from src.stores.vectordb.providers import QdrantDBProvider
+from src.stores.vectordb.qdrant_clients import close_qdrant_clients
+from src.stores.vectordb.vector_db_enums import DistanceMethodEnums
+
+
+class StubCluster:
+    """Latency model and point store of the stub, shared by its handlers."""
+
+    def __init__(self, rtt_ms: float, bandwidth_mbps: float, apply_ms_per_point: float, error_rate: float):
+        self.rtt = rtt_ms / 1000.0
+        self.bytes_per_s = bandwidth_mbps * 1_000_000 / 8
+        self.apply_per_point = apply_ms_per_point / 1000.0
+        self.error_rate = error_rate
+        self.points: dict[str, dict] = {}
+        self.queues: dict[str, asyncio.Queue] = {}
+        self.operation_id = 0
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+
+    def queue(self, collection: str) -> asyncio.Queue:
+        # Created on the server's event loop, on first use
+        if collection not in self.queues:
+            self.queues[collection] = asyncio.Queue()
+            asyncio.get_running_loop().create_task(self._apply(collection, self.queues[collection]))
+        return self.queues[collection]
+
+    async def _apply(self, collection: str, queue: asyncio.Queue) -> None:
+        store = self.points.setdefault(collection, {})
+        while True:
+            points, done = await queue.get()
+            await asyncio.sleep(self.apply_per_point * len(points))
+            for point in points:
+                store[str(point["id"])] = point
+            done.set()
+
+    def count(self, collection: str) -> int:
+        return len(self.points.get(collection, {}))
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors_503": self.errors, "mb_sent": round(self.bytes / 1_000_000, 1)}
+
+
+def make_stub_app(cluster: StubCluster) -> FastAPI:
+    app = FastAPI()
+
+    def _result(result, started: float) -> JSONResponse:
+        return JSONResponse(content={"result": result, "status": "ok", "time": time.perf_counter() - started})
+
+    @app.get("/")
+    async def root():
+        return {"title": "qdrant - vector search engine", "version": "1.16.0"}
+
+    @app.put("/collections/{collection}/points")
+    async def upsert(collection: str, request: Request, wait: bool = False):
+        started = time.perf_counter()
+        body = await request.body()
+        cluster.requests += 1
+        cluster.bytes += len(body)
+        await asyncio.sleep(cluster.rtt / 2 + len(body) / cluster.bytes_per_s)
+        if random.random() < cluster.error_rate:
+            cluster.errors += 1
+            return JSONResponse(status_code=503, content={"status": {"error": "Service Unavailable"}, "time": 0})
+
+        points = json.loads(body)["points"]
+        done = asyncio.Event()
+        cluster.queue(collection).put_nowait((points, done))
+        cluster.operation_id += 1
+        operation_id = cluster.operation_id
+        if wait:
+            await done.wait()
+        await asyncio.sleep(cluster.rtt / 2)
+        status = "completed" if wait else "acknowledged"
+        return _result({"operation_id": operation_id, "status": status}, started)
+
+    return app
+
+
+@contextmanager
+def stub_server(cluster: StubCluster, port: int | None = None) -> Iterator[str]:
+    """Run the stub in a background thread; yields its URL."""
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(make_stub_app(cluster), host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+def make_points(count: int, dims: int, seed: int = 0) -> tuple[list[str], list[list[float]], list[dict]]:
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dims)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    texts = make_texts(count, seed)
+    metadata = [
+        {"doc_id": f"PMC{seed}", "section_title": "Results", "section_order": i, "chunk_index": i}
+        for i in range(count)
+    ]
+    return texts, vectors.tolist(), metadata
+
+
+async def _sequential(provider: QdrantDBProvider, collection: str, texts: list, vectors: list,
+                      metadata: list, record_ids: list, batch_size: int = 20) -> None:
+    for i in range(0, len(texts), batch_size):
+        points = [
+            PointStruct(id=record_ids[j], vector=vectors[j], payload={"text": texts[j], "metadata": metadata[j]})
+            for j in range(i, min(i + batch_size, len(texts)))
+        ]
+        await provider.async_client.upsert(collection_name=collection, points=points, wait=True)
+
+
+async def _run(url: str, mode: str, collection: str, points: tuple, args) -> None:
+    texts, vectors, metadata = points
+    in_flight = int(mode.rsplit("-", 1)[1]) if mode.startswith("pipelined") else 1
+    provider = QdrantDBProvider(
+        db_path="unused",
+        distance_method=DistanceMethodEnums.COSINE.value,
+        url=url,
+        api_key="stub",
+        upsert_batch_bytes=args.batch_bytes,
+        upsert_max_in_flight=in_flight,
+        upsert_max_retries=args.max_retries,
+    )
+    await provider.connect_async()
+    record_ids = list(range(len(texts)))
+    try:
+        if mode == "sequential":
+            await _sequential(provider, collection, texts, vectors, metadata, record_ids)
+        else:
+            await provider.insert_many_async(
+                collection, texts, vectors, metadata, record_ids, batch_size=args.batch_points
+            )
+    finally:
+        await provider.disconnect_async()
+        await close_qdrant_clients()  # bound to this mode's event loop
+
+
+def run_mode(url: str, cluster: StubCluster, mode: str, points: tuple, args) -> dict:
+    collection = f"bench_{mode.replace('-', '_')}"
+    before = cluster.stats()
+    error = None
+    started = time.perf_counter()
+    try:
+        asyncio.run(_run(url, mode, collection, points, args))
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e).splitlines()[0]:.200}"
+    elapsed = time.perf_counter() - started
+    after = cluster.stats()
+    stored = cluster.count(collection)
+    return {
+        "mode": mode,
+        "points": len(points[0]),
+        "stored": stored,
+        "error": error,
+        "elapsed_s": round(elapsed, 3),
+        "points_per_s": round(stored / elapsed, 1) if elapsed else None,
+        "stub": {key: round(after[key] - before[key], 1) for key in after},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Qdrant upserts against a local stub cluster.")
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--dims", type=int, default=3072)
+    parser.add_argument("--in-flight", nargs="+", type=int, default=[1, 4, 8], help="Pipelined modes to run")
+    parser.add_argument("--batch-bytes", type=int, default=2_000_000, help="QDRANT_UPSERT_BATCH_BYTES")
+    parser.add_argument("--batch-points", type=int, default=256, help="Max points per pipelined request")
+    parser.add_argument("--max-retries", type=int, default=3, help="QDRANT_UPSERT_MAX_RETRIES")
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="Stub round trip per request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=200.0, help="Stub upload bandwidth")
+    parser.add_argument("--apply-ms-per-point", type=float, default=0.3, help="Stub indexing time per point")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of requests failing with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="qdrant_upsert_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    random.seed(args.seed)
+    points = make_points(args.points, args.dims, args.seed)
+    cluster = StubCluster(args.rtt_ms, args.bandwidth_mbps, args.apply_ms_per_point, args.error_rate)
+    modes = ["sequential"] + [f"pipelined-{n}" for n in args.in_flight]
+    with stub_server(cluster) as url:
+        results = [run_mode(url, cluster, mode, points, args) for mode in modes]
+
+    report = {"config": vars(args), "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    print(f"{args.points} points x {args.dims} dims, rtt {args.rtt_ms:.0f}ms, "
+          f"{args.bandwidth_mbps:.0f}Mbit/s, error rate {args.error_rate:.0%}")
+    for r in results:
+        outcome = f"FAILED ({r['error']})" if r["error"] else "ok"
+        print(
+            f"{r['mode']:<12} stored {r['stored']}/{r['points']} in {r['elapsed_s']:.2f}s "
+            f"({r['points_per_s'] or 0:.0f} points/s)  requests {r['stub']['requests']:.0f}  "
+            f"503s {r['stub']['errors_503']:.0f}  {outcome}"
+        )
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
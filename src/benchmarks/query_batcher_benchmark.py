@@ -0,0 +1,165 @@
+"""
+Query embedding latency and throughput with and without micro-batching.
+
+Queries are short sentences taken from `pmc_articles/`. For each target QPS
+an open-loop load generator (Poisson arrivals) embeds them with the local
+SentenceTransformers provider for --duration seconds:
+
+- direct: llm.embed_text_async per request (one forward pass each)
+- batched: QueryEmbeddingBatcher.embed, as /nlp/search does
+
+Reported per (mode, QPS): achieved QPS, p50/p99 latency and, for batched,
+the mean batch size and mean queueing delay.
+
+Usage:
+    python -m src.benchmarks.query_batcher_benchmark --qps 5 50 200 --duration 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+from src.benchmarks.chunker_benchmark import DEFAULT_INPUT_FOLDER, _percentile, load_articles
+from src.services.sentence_segmenter import get_sentence_segmenter
+from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS
+from src.stores.llm.llm_enums import DocumentTypeEnum, EmbeddingBackendEnums, LLMEnums
+from src.stores.llm.providers import SentenceTransformersProvider
+from src.stores.llm.query_batcher import QueryEmbeddingBatcher
+
+DEFAULT_MODEL_ID, DEFAULT_EMBEDDING_SIZE = EMBEDDING_DEFAULTS[LLMEnums.SENTENCE_TRANSFORMERS.value]
+
+
+def sample_queries(folder: str | Path, limit: int = 1000, max_words: int = 30) -> list[str]:
+    """Short sentences from the articles, standing in for search queries."""
+    segmenter = get_sentence_segmenter()
+    queries = []
+    for article in load_articles(folder):
+        for section in article.get("sections", []):
+            for sentence in segmenter.split(" ".join((section.get("text") or "").split())):
+                if 3 <= len(sentence.split()) <= max_words:
+                    queries.append(sentence)
+                    if len(queries) >= limit:
+                        return queries
+    return queries
+
+
+async def run_load(embed, queries: list[str], qps: float, duration: float, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one(query: str) -> None:
+        nonlocal failures
+        started = time.perf_counter()
+        vector = await embed(query)
+        latencies.append(time.perf_counter() - started)
+        if vector is None:
+            failures += 1
+
+    tasks = []
+    started = time.perf_counter()
+    next_at = started
+    while next_at - started < duration:
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        tasks.append(asyncio.create_task(one(rng.choice(queries))))
+        next_at += rng.expovariate(qps)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "target_qps": qps,
+        "requests": len(tasks),
+        "failures": failures,
+        "achieved_qps": round(len(tasks) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+        },
+    }
+
+
+async def run_benchmark(llm, queries: list[str], qps_levels: list[float], duration: float,
+                        max_wait_ms: float, max_batch_size: int, max_in_flight: int) -> list[dict]:
+    document_type = DocumentTypeEnum.QUERY.value
+    await llm.embed_texts_async(queries[:max_batch_size], document_type=document_type)  # warm-up
+
+    results = []
+    for qps in qps_levels:
+        direct = await run_load(
+            lambda q: llm.embed_text_async(q, document_type=document_type), queries, qps, duration
+        )
+        results.append({"mode": "direct", **direct})
+
+        batcher = QueryEmbeddingBatcher(
+            max_wait_ms=max_wait_ms, max_batch_size=max_batch_size, max_in_flight=max_in_flight
+        )
+        batched = await run_load(lambda q: batcher.embed(llm, q, document_type), queries, qps, duration)
+        stats = batcher.stats()
+        results.append({
+            "mode": "batched",
+            **batched,
+            "mean_batch_size": stats["mean_batch_size"],
+            "mean_wait_ms": stats["mean_wait_ms"],
+            "batch_sizes": stats["batch_sizes"],
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark query embedding with and without micro-batching.")
+    parser.add_argument("--input-folder", default=str(DEFAULT_INPUT_FOLDER))
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID)
+    parser.add_argument("--backend", default=EmbeddingBackendEnums.TORCH.value,
+                        choices=[backend.value for backend in EmbeddingBackendEnums])
+    parser.add_argument("--onnx-dir", default=str(SRC_ROOT.parent / "onnx_models"))
+    parser.add_argument("--qps", nargs="+", type=float, default=[5, 50, 200])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per case")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-in-flight", type=int, default=2)
+    parser.add_argument("--output", default="query_batcher_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    queries = sample_queries(args.input_folder)
+    if not queries:
+        sys.exit(f"No article text found in {args.input_folder}")
+
+    llm = SentenceTransformersProvider(
+        openai_api_key="unused", embedding_backend=args.backend, onnx_model_dir=args.onnx_dir
+    )
+    llm.set_embedding_model(args.model, DEFAULT_EMBEDDING_SIZE)
+    results = asyncio.run(
+        run_benchmark(
+            llm, queries, args.qps, args.duration, args.max_wait_ms, args.max_batch_size, args.max_in_flight
+        )
+    )
+
+    report = {"model_id": args.model, "backend": args.backend, "config": vars(args), "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    for r in results:
+        batch = f"  mean batch {r['mean_batch_size']:.1f}" if r["mode"] == "batched" else ""
+        print(
+            f"{r['mode']:<8} target {r['target_qps']:>6.0f} qps  achieved {r['achieved_qps']:>7.1f} qps  "
+            f"p50 {r['latency_ms']['p50']:>8.2f}ms  p99 {r['latency_ms']['p99']:>8.2f}ms{batch}"
+        )
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
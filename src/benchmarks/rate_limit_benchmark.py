@@ -0,0 +1,246 @@
+"""
+Rate limit behaviour of async embedding against a local stub server.
+
+The stub serves an OpenAI-compatible POST /v1/embeddings that enforces request
+and token budgets per window, answering over-budget calls with 429 and
+x-ratelimit-* headers like the real API, and optionally failing a fraction of
+calls with 500. OpenAIProvider.embed_texts_async is pointed at it (api_url),
+so the real provider, rate limit scheduler and batching code are exercised.
+
+Two modes per run:
+- scheduled: the default scheduler (header sync, AIMD concurrency, retries)
+- no-retry: the same with max_retries=0, i.e. every 429 fails its texts
+
+Usage:
+    python -m src.benchmarks.rate_limit_benchmark --texts 2000 --rpm-per-window 20 --window 1
+    python -m src.benchmarks.rate_limit_benchmark --serve-only --port 8900
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.stores.llm.async_clients import close_async_clients, configure_async_clients
+from src.stores.llm.providers import OpenAIProvider
+from src.stores.llm.rate_limiter import configure_rate_limits, get_rate_limit_scheduler
+
+MODEL_ID = "stub-embedding"
+EMBEDDING_SIZE = 8
+
+
+class StubLimits:
+    """Fixed-window request/token budgets, shared by the stub's handlers."""
+
+    def __init__(self, requests_per_window: int, tokens_per_window: int, window: float, error_rate: float):
+        self.requests_per_window = requests_per_window
+        self.tokens_per_window = tokens_per_window
+        self.window = window
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.requests = 0
+        self.tokens = 0
+        self.served = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def admit(self, tokens: int) -> tuple[int, dict]:
+        """Return (status, rate limit headers) for a call costing `tokens`."""
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= self.window:
+                self.window_start, self.requests, self.tokens = now, 0, 0
+            reset_ms = max(1, int((self.window - (now - self.window_start)) * 1000))
+
+            status = 200
+            if self.requests + 1 > self.requests_per_window or self.tokens + tokens > self.tokens_per_window:
+                status = 429
+                self.throttled += 1
+            elif random.random() < self.error_rate:
+                status = 500
+                self.errors += 1
+            else:
+                self.requests += 1
+                self.tokens += tokens
+                self.served += 1
+
+            # Headers use the API's per-minute units
+            per_minute = 60.0 / self.window
+            headers = {
+                "x-ratelimit-limit-requests": str(int(self.requests_per_window * per_minute)),
+                "x-ratelimit-limit-tokens": str(int(self.tokens_per_window * per_minute)),
+                "x-ratelimit-remaining-requests": str(max(0, self.requests_per_window - self.requests)),
+                "x-ratelimit-remaining-tokens": str(max(0, self.tokens_per_window - self.tokens)),
+                "x-ratelimit-reset-requests": f"{reset_ms}ms",
+                "x-ratelimit-reset-tokens": f"{reset_ms}ms",
+            }
+            return status, headers
+
+    def stats(self) -> dict:
+        return {"served": self.served, "throttled_429": self.throttled, "errors_500": self.errors}
+
+
+def make_stub_app(limits: StubLimits) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        tokens = sum(len(text) // 4 + 1 for text in texts)
+        status, headers = limits.admit(tokens)
+        if status == 429:
+            return JSONResponse(
+                status_code=429,
+                headers=headers,
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+            )
+        if status == 500:
+            return JSONResponse(status_code=500, headers=headers, content={"error": {"message": "stub failure"}})
+        data = [
+            {"object": "embedding", "index": i, "embedding": [float(len(text) % 97)] * EMBEDDING_SIZE}
+            for i, text in enumerate(texts)
+        ]
+        return JSONResponse(
+            headers=headers,
+            content={
+                "object": "list",
+                "data": data,
+                "model": MODEL_ID,
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+            },
+        )
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def stub_server(limits: StubLimits, port: int | None = None) -> Iterator[str]:
+    """Run the stub in a background thread; yields its OpenAI base_url."""
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(make_stub_app(limits), host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+def make_texts(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    words = "protein expression cell tumour patients cohort receptor binding assay mutation".split()
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(20, 200))) for _ in range(count)]
+
+
+async def _embed(base_url: str, texts: list[str], batch_size: int) -> list:
+    provider = OpenAIProvider(api_key="stub", api_url=base_url, embedding_batch_size=batch_size)
+    provider.set_embedding_model(MODEL_ID, EMBEDDING_SIZE)
+    try:
+        return await provider.embed_texts_async(texts)
+    finally:
+        await close_async_clients()
+
+
+def run_mode(name: str, base_url: str, limits: StubLimits, texts: list[str],
+             batch_size: int, concurrency: int, max_retries: int) -> dict:
+    configure_async_clients(concurrency)
+    configure_rate_limits(max_concurrency=concurrency, max_retries=max_retries)
+    before = limits.stats()
+
+    started = time.perf_counter()
+    vectors = asyncio.run(_embed(base_url, texts, batch_size))
+    elapsed = time.perf_counter() - started
+
+    after = limits.stats()
+    embedded = sum(vector is not None for vector in vectors)
+    return {
+        "mode": name,
+        "texts": len(texts),
+        "embedded": embedded,
+        "failed": len(texts) - embedded,
+        "elapsed_s": round(elapsed, 3),
+        "texts_per_s": round(embedded / elapsed, 1) if elapsed else None,
+        "stub": {key: after[key] - before[key] for key in after},
+        "scheduler": get_rate_limit_scheduler("OPENAI", MODEL_ID).stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embed against a rate-limiting stub server.")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--window", type=float, default=1.0, help="Stub budget window in seconds")
+    parser.add_argument("--rpm-per-window", type=int, default=20, help="Stub requests per window")
+    parser.add_argument("--tpm-per-window", type=int, default=40000, help="Stub tokens per window")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of admitted calls failing with 500")
+    parser.add_argument("--max-retries", type=int, default=6)
+    parser.add_argument("--output", default="rate_limit_benchmark.json", help="JSON report path")
+    parser.add_argument("--serve-only", action="store_true", help="Only run the stub server")
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    limits = StubLimits(args.rpm_per_window, args.tpm_per_window, args.window, args.error_rate)
+
+    if args.serve_only:
+        port = args.port or 8900
+        print(f"Stub OpenAI embeddings at http://127.0.0.1:{port}/v1 (Ctrl+C to stop)")
+        uvicorn.run(make_stub_app(limits), host="127.0.0.1", port=port, log_level="warning")
+        return
+
+    texts = make_texts(args.texts)
+    with stub_server(limits, args.port) as base_url:
+        results = [
+            run_mode("scheduled", base_url, limits, texts, args.batch_size, args.concurrency, args.max_retries),
+            run_mode("no-retry", base_url, limits, texts, args.batch_size, args.concurrency, 0),
+        ]
+
+    report = {"config": vars(args), "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\nBENCHMARK SUMMARY")
+    print("=" * 60)
+    for r in results:
+        print(
+            f"{r['mode']:<10} embedded {r['embedded']}/{r['texts']} in {r['elapsed_s']:.2f}s "
+            f"({r['texts_per_s'] or 0:.0f} texts/s)  429s {r['stub']['throttled_429']}  "
+            f"500s {r['stub']['errors_500']}  retries {r['scheduler']['retries']}  "
+            f"final concurrency {r['scheduler']['concurrency_limit']}"
+        )
+    print(f"Report: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
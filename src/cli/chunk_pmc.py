@@ -0,0 +1,65 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+from src.services.biomedical_chunker import MAX_CHUNK_TOKENS, OVERLAP_TOKENS, WORD_OVERLAP
+from src.services.parallel_chunker import ParallelChunker
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(
+        description="Re-chunk every PMC article JSON in a folder with the BIOMEDICAL chunker."
+    )
+    parser.add_argument("--input-folder", default="pmc_articles")
+    parser.add_argument("--output", default="pmc_chunks.jsonl", help="One JSON chunk per line")
+    parser.add_argument("--workers", type=int, default=None, help="Default: number of CPU cores")
+    parser.add_argument("--batch-size", type=int, default=4, help="Papers per worker task")
+    parser.add_argument("--max-tokens", type=int, default=MAX_CHUNK_TOKENS)
+    parser.add_argument("--overlap-tokens", type=int, default=OVERLAP_TOKENS)
+    parser.add_argument("--word-overlap", type=int, default=WORD_OVERLAP)
+    parser.add_argument("--cache", default=None, help="Optional SQLite chunk cache file")
+    parser.add_argument("--cache-max-mb", type=int, default=512)
+    parser.add_argument("--tokenizer", default=None, help="Local PubMedBERT tokenizer.json (default: HF hub)")
+    args = parser.parse_args()
+
+    chunker = ParallelChunker(
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+        max_tokens=args.max_tokens,
+        overlap_tokens=args.overlap_tokens,
+        word_overlap=args.word_overlap,
+        cache_path=args.cache,
+        cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+        tokenizer_path=args.tokenizer,
+    )
+
+    papers = 0
+    chunks_written = 0
+    started = time.perf_counter()
+    with open(args.output, "w", encoding="utf-8") as out:
+        for _, chunks in chunker.chunk_folder(args.input_folder):
+            for chunk in chunks:
+                out.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            papers += 1
+            chunks_written += len(chunks)
+    elapsed = time.perf_counter() - started
+
+    print("\nCLI SUMMARY")
+    print("=" * 60)
+    print(f"Workers: {chunker.max_workers}")
+    print(f"Papers chunked: {papers}")
+    print(f"Chunks written: {chunks_written}")
+    print(f"Elapsed: {elapsed:.2f}s ({papers / elapsed if elapsed else 0:.1f} papers/s)")
+    print(f"Output file: {args.output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
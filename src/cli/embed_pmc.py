@@ -0,0 +1,94 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+import numpy as np
+
+from src.services.parallel_embedder import ParallelEmbedder
+from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS
+from src.stores.llm.llm_enums import EmbeddingBackendEnums, LLMEnums
+
+DEFAULT_MODEL_ID, _ = EMBEDDING_DEFAULTS[LLMEnums.SENTENCE_TRANSFORMERS.value]
+
+
+def _chunk_texts(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)["text"]
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(
+        description="Embed every chunk in a chunk JSONL file (python -m src.cli.chunk_pmc) "
+        "with a local SentenceTransformer model across worker processes."
+    )
+    parser.add_argument("--chunks", default="pmc_chunks.jsonl", help="One JSON chunk per line")
+    parser.add_argument("--output", default="pmc_embeddings.npy",
+                        help="float32 matrix, row i is line i of --chunks")
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID)
+    parser.add_argument("--backend", default=EmbeddingBackendEnums.TORCH.value,
+                        choices=[backend.value for backend in EmbeddingBackendEnums])
+    parser.add_argument("--onnx-dir", default=str(SRC_ROOT.parent / "onnx_models"))
+    parser.add_argument("--workers", type=int, default=None, help="Default: number of CPU cores")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="Default: cores / workers")
+    parser.add_argument("--pin-cpus", action="store_true", help="Pin each worker to its own cores (Linux)")
+    parser.add_argument("--batch-size", type=int, default=256, help="Chunks per worker task")
+    parser.add_argument("--encode-batch-size", type=int, default=None,
+                        help="Chunks per forward pass at max sequence length (default: provider default)")
+    args = parser.parse_args()
+
+    total = sum(1 for _ in _chunk_texts(args.chunks))
+    if not total:
+        sys.exit(f"No chunks found in {args.chunks}")
+
+    embedder = ParallelEmbedder(
+        args.model,
+        max_workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        pin_cpus=args.pin_cpus,
+        batch_size=args.batch_size,
+        encode_batch_size=args.encode_batch_size,
+        backend=args.backend,
+        onnx_dir=args.onnx_dir,
+    )
+
+    output = None
+    failed = 0
+    started = time.perf_counter()
+    for row, vector in enumerate(embedder.embed(_chunk_texts(args.chunks))):
+        if output is None:
+            output = np.lib.format.open_memmap(
+                args.output, mode="w+", dtype=np.float32, shape=(total, embedder.embedding_size)
+            )
+        if vector is None:
+            failed += 1
+        else:
+            output[row] = vector
+    output.flush()
+    elapsed = time.perf_counter() - started
+
+    print("\nCLI SUMMARY")
+    print("=" * 60)
+    print(f"Model: {args.model} ({args.backend})")
+    print(f"Workers: {embedder.max_workers} x {embedder.threads_per_worker} threads")
+    print(f"Chunks embedded: {total - failed} (failed: {failed}, left as zero rows)")
+    print(f"Elapsed: {elapsed:.2f}s ({total / elapsed if elapsed else 0:.1f} chunks/s)")
+    for worker in embedder.worker_stats():
+        print(
+            f"  {worker['worker']:<12} {worker['texts']:>7} chunks in {worker['batches']} batches, "
+            f"{worker['texts_per_s']:.1f} chunks/s while busy"
+        )
+    print(f"Output file: {args.output} ({total} x {embedder.embedding_size} float32)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
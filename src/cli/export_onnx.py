@@ -0,0 +1,163 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+from src.benchmarks.onnx_embedding_benchmark import (
+    DEFAULT_INPUT_FOLDER,
+    DEFAULT_MODEL_ID,
+    DEFAULT_ONNX_DIR,
+    PARITY_MIN_COSINE,
+    sample_texts,
+)
+from src.stores.llm.onnx_embedder import (
+    CONFIG_FILE,
+    MODEL_FILE,
+    QUANTIZED_MODEL_FILE,
+    TOKENIZER_FILE,
+    OnnxSentenceEmbedder,
+    embedding_parity,
+    onnx_model_dir,
+)
+
+
+def _is_mean_pooling(pooling) -> bool:
+    config = pooling.get_config_dict()
+    if "pooling_mode" in config:
+        return config["pooling_mode"] == "mean"
+    modes = {key for key, value in config.items() if key.startswith("pooling_mode_") and value is True}
+    return modes == {"pooling_mode_mean_tokens"}
+
+
+def _check_pipeline(model) -> bool:
+    """Return whether the model normalizes; fail unless it is transformer + mean pooling."""
+    from sentence_transformers.models import Normalize, Pooling, Transformer
+
+    modules = list(model)
+    if not modules or not isinstance(modules[0], Transformer):
+        raise SystemExit("Only SentenceTransformer models starting with a Transformer module can be exported")
+    poolings = [m for m in modules if isinstance(m, Pooling)]
+    if len(poolings) != 1 or not _is_mean_pooling(poolings[0]):
+        raise SystemExit("Only mean-pooled SentenceTransformer models can be exported")
+    extra = [m for m in modules[1:] if not isinstance(m, (Pooling, Normalize))]
+    if extra:
+        raise SystemExit(f"Unsupported modules after pooling: {[type(m).__name__ for m in extra]}")
+    return any(isinstance(m, Normalize) for m in modules)
+
+
+def export(model_id: str, output_dir: Path, opset: int, quantize: bool, keep_fp32: bool) -> dict:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_id, device="cpu")
+    normalize = _check_pipeline(model)
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.encoder(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = output_dir / MODEL_FILE
+    sample = tokenizer(["Export sample sentence.", "A second, longer export sample sentence."],
+                       padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(transformer),
+            tuple(sample[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(str(fp32_path), str(output_dir / QUANTIZED_MODEL_FILE), weight_type=QuantType.QInt8)
+        if not keep_fp32:
+            fp32_path.unlink()
+
+    tokenizer.backend_tokenizer.save(str(output_dir / TOKENIZER_FILE))
+    config = {
+        "model_id": model_id,
+        "max_seq_length": model.max_seq_length,
+        "embedding_size": model.get_sentence_embedding_dimension(),
+        "normalize": normalize,
+        "pad_token_id": tokenizer.pad_token_id,
+        "pad_token": tokenizer.pad_token,
+        "quantized": quantize,
+        "opset": opset,
+    }
+    with open(output_dir / CONFIG_FILE, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return {"model": model, "config": config}
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(
+        description="Export a SentenceTransformer model to int8 ONNX for EMBEDDING_BACKEND=onnx, "
+        "then check its embeddings against the torch model."
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID)
+    parser.add_argument(
+        "--output", default=str(DEFAULT_ONNX_DIR),
+        help="Export root (EMBEDDING_ONNX_DIR; default <project root>/onnx_models, where the app looks)",
+    )
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--no-quantize", action="store_true", help="Keep the fp32 model only")
+    parser.add_argument("--keep-fp32", action="store_true", help="Keep model.onnx next to the int8 model")
+    parser.add_argument("--input-folder", default=str(DEFAULT_INPUT_FOLDER), help="Articles for the parity check")
+    parser.add_argument("--parity-texts", type=int, default=256)
+    parser.add_argument("--min-cosine", type=float, default=PARITY_MIN_COSINE)
+    args = parser.parse_args()
+
+    output_dir = onnx_model_dir(args.output, args.model)
+    exported = export(args.model, output_dir, args.opset, not args.no_quantize, args.keep_fp32)
+
+    texts = sample_texts(args.input_folder, args.parity_texts) or [
+        "Export sample sentence.",
+        "Patients with type 2 diabetes received metformin for 12 weeks.",
+    ]
+    embedder = OnnxSentenceEmbedder(output_dir)
+    parity = embedding_parity(
+        exported["model"].encode(texts, convert_to_numpy=True),
+        embedder.encode(texts, convert_to_numpy=True),
+    )
+    passed = parity["min_cosine"] > args.min_cosine
+
+    print("\nCLI SUMMARY")
+    print("=" * 60)
+    print(f"Model: {args.model}")
+    print(f"Export: {embedder.model_path} ({embedder.model_bytes / (1024 * 1024):.1f}MB)")
+    print(f"Embedding size: {exported['config']['embedding_size']}, normalize: {exported['config']['normalize']}")
+    print(
+        f"Parity on {parity['texts']} texts: min cosine {parity['min_cosine']:.4f}, "
+        f"mean {parity['mean_cosine']:.4f} ({'OK' if passed else 'FAIL'}, need > {args.min_cosine})"
+    )
+    print(f"Set EMBEDDING_BACKEND=onnx and EMBEDDING_ONNX_DIR={args.output}")
+    print("=" * 60)
+
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
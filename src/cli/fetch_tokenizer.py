@@ -0,0 +1,43 @@
+import argparse
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parents[1]
+if str(SRC_ROOT.parent) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT.parent))
+
+from src.services.biomedical_chunker import TOKENIZER_REPO_ID
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(
+        description="Download the PubMedBERT tokenizer.json once so the chunker can load it offline "
+        "(set CHUNKER_TOKENIZER_PATH to the output file)."
+    )
+    parser.add_argument("--output", default="models/pubmedbert-tokenizer.json")
+    parser.add_argument("--repo-id", default=TOKENIZER_REPO_ID)
+    parser.add_argument("--revision", default="main", help="Hub branch, tag or commit hash to pin")
+    args = parser.parse_args()
+
+    from huggingface_hub import hf_hub_download
+
+    downloaded = hf_hub_download(repo_id=args.repo_id, filename="tokenizer.json", revision=args.revision)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(downloaded, output)
+    digest = hashlib.sha256(output.read_bytes()).hexdigest()
+
+    print("\nCLI SUMMARY")
+    print("=" * 60)
+    print(f"Repo: {args.repo_id}@{args.revision}")
+    print(f"Tokenizer file: {output}")
+    print(f"SHA-256: {digest}")
+    print(f"Set CHUNKER_TOKENIZER_PATH={output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .paper import Paper, Section
+from .chunk import ChunkSpan, PaperChunks
 
-__all__ = ["Paper", "Section"]
+__all__ = ["Paper", "Section", "ChunkSpan", "PaperChunks"]
 
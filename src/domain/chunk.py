@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List
+
+
+@dataclass(slots=True)
+class ChunkSpan:
+    """
+    Compact record for one biomedical chunk.
+
+    The chunk text is not stored: it is `section_texts[section_index][char_start:char_end]`
+    of the owning `PaperChunks`.
+    """
+
+    section_index: int
+    char_start: int
+    char_end: int
+    token_count: int
+    chunk_index: int
+
+
+@dataclass(slots=True)
+class PaperChunks:
+    """
+    All chunks of one paper as spans into its section texts.
+
+    Per-paper metadata (doc_id, doc_title, source_url) and each section's title,
+    order and whitespace-normalized text are held once, instead of being copied
+    into every chunk. Text and metadata dicts are only built by `to_dict`, in the
+    same schema `chunk_paper_sections` returns:
+    {
+        "text": "...",
+        "metadata": {"doc_id", "doc_title", "source_url", "section_title",
+                     "section_order", "chunk_index"}
+    }
+    """
+
+    doc_id: str
+    doc_title: str
+    source_url: str
+    section_titles: List[str] = field(default_factory=list)
+    section_orders: List[int] = field(default_factory=list)
+    section_texts: List[str] = field(default_factory=list)
+    spans: List[ChunkSpan] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __iter__(self) -> Iterator[ChunkSpan]:
+        return iter(self.spans)
+
+    def text(self, span: ChunkSpan) -> str:
+        return self.section_texts[span.section_index][span.char_start:span.char_end]
+
+    def to_dict(self, span: ChunkSpan) -> Dict[str, Any]:
+        return {
+            "text": self.text(span),
+            "metadata": {
+                "doc_id": self.doc_id,
+                "doc_title": self.doc_title,
+                "source_url": self.source_url,
+                "section_title": self.section_titles[span.section_index],
+                "section_order": self.section_orders[span.section_index],
+                "chunk_index": span.chunk_index,
+            },
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self.to_dict(span) for span in self.spans]
@@ -45,7 +45,7 @@ class Paper:
     doc_id: str
     doc_title: str
     source_url: str
-    created_at: str  # keep as string to match existing JSON exactly
+    created_at: str  # scrape date; keep as string to match existing JSON exactly
     sections: List[Section] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -0,0 +1,29 @@
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Yield lists of up to `size` items, consuming `items` lazily."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def packed(items: Iterable[T], costs: Iterable[int], max_items: int, max_cost: int) -> Iterator[list[T]]:
+    """
+    Yield lists of consecutive items with at most `max_items` items and at most
+    `max_cost` summed cost. An item whose cost alone exceeds `max_cost` is
+    yielded on its own.
+    """
+    batch: list[T] = []
+    batch_cost = 0
+    for item, cost in zip(items, costs):
+        if batch and (len(batch) >= max_items or batch_cost + cost > max_cost):
+            yield batch
+            batch, batch_cost = [], 0
+        batch.append(item)
+        batch_cost += cost
+    if batch:
+        yield batch
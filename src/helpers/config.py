@@ -33,15 +33,52 @@ class Settings(BaseSettings):
     # Vector DB store
     VECTOR_DB_PATH: str = "qdrant_data"
     VECTOR_DB_DISTANCE_METHOD: str = "cosine"
+    VECTOR_DB_HNSW: bool = True  # LOCAL provider: HNSW graph (hnswlib) for large collections; false keeps search exact
+    VECTOR_DB_HNSW_MIN_POINTS: int = 20000  # LOCAL provider: collections below this size are searched exactly
+    VECTOR_DB_HNSW_EF: int = 64  # LOCAL provider: HNSW query candidate list size (recall vs latency)
     QDRANT_KEY: Optional[str] = None  # API key for Qdrant Cloud
     QDRANT_CLUSTER_URL: Optional[str] = None  # Cloud cluster URL
+    QDRANT_UPSERT_BATCH_BYTES: int = 2000000  # Max estimated request body per upsert batch
+    QDRANT_UPSERT_MAX_IN_FLIGHT: int = 4  # Concurrent upsert requests per insert_many_async call
+    QDRANT_UPSERT_MAX_RETRIES: int = 3  # Retries for 408/429/5xx/connection errors, with jittered backoff
+    QDRANT_PREFER_GRPC: bool = False  # Talk to Qdrant over gRPC (QDRANT_GRPC_PORT) instead of REST
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_HTTP2: bool = False  # REST over HTTP/2 (one multiplexed connection)
+    QDRANT_TIMEOUT: int = 120  # Seconds per Qdrant request; long enough for large cloud upserts
+    QDRANT_POOL_SIZE: int = 32  # Max REST connections kept open to the cluster
+    QDRANT_KEEPALIVE_SECONDS: float = 60.0  # Idle time before a pooled connection is closed (gRPC: ping interval)
+    COLLECTION_CACHE_TTL_SECONDS: float = 300.0  # How long collection size/model lookups are reused; 0 disables the cache
+    COLLECTION_CACHE_MAX_ENTRIES: int = 1024
+
+    # Biomedical chunker
+    CHUNK_CACHE_PATH: Optional[str] = None  # SQLite chunk cache file under the project root; unset disables it
+    CHUNK_CACHE_MAX_MB: int = 512
+    CHUNKER_TOKENIZER_PATH: Optional[str] = None  # Local PubMedBERT tokenizer.json; unset loads from the HF hub
+    CHUNKER_WARM_UP: bool = True  # Load the chunker tokenizer at app startup instead of on first ingest
 
     # Ingest (LLM + Vector DB for chunk → embed → store)
     LLM_PROVIDER: str = "OPENAI"
-    VECTOR_DB_PROVIDER: str = "QDRANT"
+    VECTOR_DB_PROVIDER: str = "QDRANT"  # QDRANT (Qdrant Cloud) or LOCAL (embedded index under VECTOR_DB_PATH)
     EMBEDDING_MODEL_ID: str = "text-embedding-3-large"  # Best accuracy: 0.811 vs 0.762 for small
     EMBEDDING_SIZE: int = 3072  # text-embedding-3-large uses 3072 dimensions
+    OPENAI_EMBEDDING_DIMENSIONS: int = 0  # Shortened OpenAI v3 vectors for new collections (e.g. 256, 512, 1024); 0 keeps the native size
     GENERATION_MODEL_ID: str = "gpt-4o"  # Best accuracy: flagship model, better than gpt-4o-mini
+    INGEST_BATCH_SIZE: int = 64  # Chunks embedded and upserted per batch during ingest
+    PRELOAD_EMBEDDING_MODELS: list = []  # SentenceTransformer model ids loaded at app startup
+    EMBEDDING_BACKEND: str = "torch"  # SentenceTransformers runtime: torch or onnx (int8, CPU)
+    EMBEDDING_ONNX_DIR: str = "onnx_models"  # ONNX exports under the project root (python -m src.cli.export_onnx)
+    EMBEDDING_ONNX_THREADS: int = 0  # ONNX Runtime intra-op threads; 0 uses the runtime default
+    EMBEDDING_CACHE_PATH: Optional[str] = None  # SQLite embedding cache file under the project root; unset disables it
+    EMBEDDING_CACHE_MAX_MB: int = 1024
+    EMBEDDING_CACHE_DTYPE: str = "float32"  # float32 or float16 (half the size)
+    LLM_MAX_CONCURRENCY: int = 16  # Max async embedding/generation calls in flight across the app
+    LLM_REQUESTS_PER_MINUTE: Optional[int] = None  # Per-model request budget; unset learns it from rate-limit headers
+    LLM_TOKENS_PER_MINUTE: Optional[int] = None  # Per-model token budget; unset learns it from rate-limit headers
+    LLM_MAX_RETRIES: int = 6  # Retries for 429/5xx/connection errors, with jittered backoff
+    QUERY_BATCH_MAX_WAIT_MS: float = 5.0  # Max time a search query waits to share an embedding batch
+    QUERY_BATCH_MAX_SIZE: int = 32  # Max queries embedded in one batch; 1 disables query batching
+    QUERY_BATCH_MAX_IN_FLIGHT: int = 2  # Concurrent query batches per embedding model
+    EMBEDDING_BATCH_SIZE: Optional[int] = None  # Texts per embedding call; unset uses the provider default (OpenAI 256, Cohere 96, SentenceTransformers 32)
     MIN_SCORE_THRESHOLD: float = 0.4  # Min similarity (0-1) for RAG chunks; chunks below this are filtered out
 
     model_config = SettingsConfigDict(
@@ -0,0 +1,152 @@
+"""
+Size-bounded LRU key/value store in a single SQLite file.
+
+Shared by the on-disk caches (chunk cache, embedding cache). SQLite is stdlib
+and safe to share between the API and worker processes; WAL mode lets readers
+proceed while another process writes. The file is kept under max_bytes by
+evicting the least recently used entries.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Union
+
+# After eviction the cache is trimmed to this fraction of max_bytes, so a full
+# cache does not evict on every single insert.
+_EVICT_TARGET_RATIO = 0.9
+
+# Stay below SQLite's default bound-parameter limit in IN (...) lookups
+_MAX_KEYS_PER_QUERY = 500
+
+
+class SqliteLRUCache:
+    """
+    Bytes-valued LRU cache; subclasses pick the table and value encoding.
+
+    Lookups count hits and misses per key for stats().
+    """
+
+    TABLE = "entries"
+
+    def __init__(self, path: Union[str, Path], max_bytes: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.TABLE}_last_access ON {self.TABLE}(last_access)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._read_total_bytes()
+
+    def _read_total_bytes(self) -> int:
+        return self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.TABLE}").fetchone()[0]
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Return the stored value for key, or None on a miss."""
+        return self.get_many_bytes([key]).get(key)
+
+    def get_many_bytes(self, keys: Iterable[str]) -> dict[str, bytes]:
+        """Return {key: value} for the keys that are cached, in few queries."""
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, bytes] = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_KEYS_PER_QUERY):
+                part = keys[i:i + _MAX_KEYS_PER_QUERY]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM {self.TABLE} WHERE key IN ({placeholders})", part
+                ).fetchall()
+                found.update(rows)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    f"UPDATE {self.TABLE} SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_bytes(self, key: str, value: bytes) -> None:
+        """Store one value, evicting least recently used entries if over max_bytes."""
+        self.put_many_bytes([(key, value)])
+
+    def put_many_bytes(self, items: Iterable[tuple[str, bytes]]) -> None:
+        """Store many values in one transaction."""
+        items = list(items)
+        if not items:
+            return
+        with self._lock:
+            now = time.time()
+            for key, value in items:
+                old = self._conn.execute(f"SELECT size FROM {self.TABLE} WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.TABLE} (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, len(value), now),
+                )
+                self._total_bytes += len(value) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        # Other processes may share the file, so re-read the real size first
+        self._total_bytes = self._read_total_bytes()
+        target = self.max_bytes * _EVICT_TARGET_RATIO
+        while self._total_bytes > target:
+            rows = self._conn.execute(
+                f"SELECT key, size FROM {self.TABLE} ORDER BY last_access LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._total_bytes <= target:
+                    break
+                self._conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.TABLE}")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
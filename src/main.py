@@ -7,15 +7,90 @@ _ROOT = Path(__file__).resolve().parent.parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
+from contextlib import asynccontextmanager
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.routes import base, data, nlp
 import uvicorn
 import os
 from src.helpers.config import get_settings
+from src.controllers import BaseController
+from src.services.biomedical_chunker import warm_up_tokenizer
+from src.stores.llm.model_registry import get_model_registry
+from src.stores.llm.async_clients import configure_async_clients, close_async_clients
+from src.stores.llm.rate_limiter import configure_rate_limits
+from src.stores.llm.query_batcher import configure_query_batcher
+from src.stores.vectordb.collection_cache import configure_collection_cache
+from src.stores.vectordb.local_index import close_local_collections
+from src.stores.vectordb.qdrant_clients import (
+    check_qdrant_health,
+    close_qdrant_clients,
+    configure_qdrant_clients,
+)
+from src.stores.vectordb.vector_db_enums import VectorDBEnums
+
+logger = logging.getLogger('uvicorn.error')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    if settings.CHUNKER_WARM_UP:
+        # Load the chunker tokenizer now so the first BIOMEDICAL ingest doesn't pay for it
+        tokenizer_path = None
+        if settings.CHUNKER_TOKENIZER_PATH:
+            tokenizer_path = BaseController().get_database_path(db_name=settings.CHUNKER_TOKENIZER_PATH)
+        try:
+            elapsed = warm_up_tokenizer(tokenizer_path)
+            logger.info(f"Chunker tokenizer warmed up in {elapsed * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"Chunker tokenizer warm-up failed; it will load on first use: {e}")
+    # Load embedding models once here instead of on the first search/ingest
+    registry = get_model_registry()
+    onnx_dir = BaseController().get_database_path(db_name=settings.EMBEDDING_ONNX_DIR)
+    for model_id in settings.PRELOAD_EMBEDDING_MODELS:
+        try:
+            for stats in registry.preload(
+                [model_id], settings.EMBEDDING_BACKEND, onnx_dir, settings.EMBEDDING_ONNX_THREADS or None
+            ):
+                logger.info(f"Preloaded embedding model: {stats}")
+        except Exception as e:
+            logger.warning(f"Preloading embedding model {model_id} failed; it will load on first use: {e}")
+    configure_async_clients(settings.LLM_MAX_CONCURRENCY)
+    configure_rate_limits(
+        requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_retries=settings.LLM_MAX_RETRIES,
+    )
+    configure_query_batcher(
+        settings.QUERY_BATCH_MAX_WAIT_MS, settings.QUERY_BATCH_MAX_SIZE, settings.QUERY_BATCH_MAX_IN_FLIGHT
+    )
+    configure_qdrant_clients(
+        prefer_grpc=settings.QDRANT_PREFER_GRPC,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        http2=settings.QDRANT_HTTP2,
+        timeout=settings.QDRANT_TIMEOUT,
+        pool_size=settings.QDRANT_POOL_SIZE,
+        keepalive_seconds=settings.QDRANT_KEEPALIVE_SECONDS,
+    )
+    configure_collection_cache(settings.COLLECTION_CACHE_TTL_SECONDS, settings.COLLECTION_CACHE_MAX_ENTRIES)
+    if settings.VECTOR_DB_PROVIDER == VectorDBEnums.QDRANT.value and settings.QDRANT_CLUSTER_URL and settings.QDRANT_KEY:
+        # Open the shared client now so the first request doesn't pay for the handshake
+        health = await check_qdrant_health(settings.QDRANT_CLUSTER_URL.strip(), settings.QDRANT_KEY.strip())
+        if health["ok"]:
+            logger.info(f"Qdrant connected: {health}")
+        else:
+            logger.warning(f"Qdrant health check failed; requests will retry the connection: {health['error']}")
+    yield
+    await close_async_clients()
+    await close_qdrant_clients()
+    # Persist local HNSW graphs so the next start doesn't rebuild them
+    close_local_collections()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS: allow browser/frontend (Swagger, ReDoc, localhost). Cannot use allow_origins=["*"] with allow_credentials=True.
 app.add_middleware(
@@ -1,6 +1,12 @@
 from fastapi import APIRouter ,Depends
 import os
 from src.helpers.config import get_settings
+from src.stores.llm.model_registry import get_model_registry
+from src.stores.llm.rate_limiter import rate_limit_stats
+from src.stores.llm.query_batcher import get_query_batcher
+from src.stores.vectordb.collection_cache import get_collection_cache
+from src.stores.vectordb.qdrant_clients import check_qdrant_health
+from src.stores.vectordb.vector_db_enums import VectorDBEnums
 # Create router
 base_router = APIRouter(tags=["sanitycheck"])
 
@@ -17,3 +23,41 @@ async def welcome(app_settings=Depends(get_settings)):
         "app_version":app_version,
         "message": "This is the message from router"
     }
+
+
+@base_router.get("/models")
+async def loaded_models():
+    """Embedding models loaded in this process, with load time and memory."""
+    return {"models": get_model_registry().stats()}
+
+
+
+@base_router.get("/rate_limits")
+async def rate_limits():
+    """Per-model rate limit schedulers: current concurrency limit, budgets, retries and 429s."""
+    return {"schedulers": rate_limit_stats()}
+
+
+@base_router.get("/query_batcher")
+async def query_batcher():
+    """Query embedding micro-batching: batch size distribution and queueing delay."""
+    return get_query_batcher().stats()
+
+
+@base_router.get("/collection_cache")
+async def collection_cache():
+    """Collection metadata cache: entries, hit rate and invalidations."""
+    return get_collection_cache().stats()
+
+
+@base_router.get("/vector_db")
+async def vector_db_health(app_settings=Depends(get_settings)):
+    """Vector DB reachability: one round trip through the shared Qdrant client, with its latency."""
+    provider = app_settings.VECTOR_DB_PROVIDER
+    if provider != VectorDBEnums.QDRANT.value:
+        return {"provider": provider, "ok": True}
+    url = (app_settings.QDRANT_CLUSTER_URL or "").strip()
+    api_key = (app_settings.QDRANT_KEY or "").strip()
+    if not url or not api_key:
+        return {"provider": provider, "ok": False, "error": "QDRANT_CLUSTER_URL and QDRANT_KEY are not set"}
+    return {"provider": provider, **(await check_qdrant_health(url, api_key))}
@@ -1,6 +1,8 @@
 from fastapi import FastAPI, APIRouter, Depends, UploadFile, status
 from fastapi.responses import JSONResponse
 import os
+import asyncio
+import uuid
 from src.helpers.config import get_settings, Settings
 from src.controllers import BaseController
 from src.controllers import ProjectController
@@ -9,6 +11,8 @@ from src.controllers import ProcessController, PmcProcessController
 import aiofiles
 from src.models import ResponseSignal
 import logging
+from itertools import chain
+from .dependencies import get_vector_db
 from .schemes import (
     ProcessRequest,
     PmcProcessRequest,
@@ -16,9 +20,21 @@ from .schemes import (
     IngestPmcRequest,
 )
 from src.stores.llm.llm_provider_factory import LLMProviderFactory
-from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS
-from src.stores.vectordb.vector_db_provider_factory import VectorDBProviderFactory
-from src.services.biomedical_chunker import chunk_paper_sections
+from src.stores.llm.embedding_defaults import (
+    EMBEDDING_DEFAULTS,
+    OPENAI_DIMENSIONS_MODELS,
+    collection_embedding_metadata,
+)
+from src.stores.llm.llm_enums import DocumentTypeEnum, LLMEnums
+from src.stores.vectordb.collection_cache import get_collection_cache
+from src.stores.vectordb.payload_filter import PAYLOAD_INDEXES, payload_datetime
+from src.stores.vectordb.vector_db_enums import VectorDBEnums
+from src.stores.vectordb.vector_db_interface import VectorDBInterface
+from src.helpers.batching import batched
+from src.services.biomedical_chunker import iter_chunks
+from src.services.chunk_cache import get_chunk_cache
+from src.services.chunker_profile import ChunkerProfile
+from src.services.parallel_chunker import article_sections
 logger = logging.getLogger('uvicorn.error')
 
 data_router = APIRouter(
@@ -26,6 +42,35 @@ data_router = APIRouter(
     tags=["api_v1", "data"],
 )
 
+
+def _insert_failed(chunks_ingested: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "error": "Vector DB insert_many_async failed",
+            "chunks_ingested": chunks_ingested,
+        },
+    )
+
+
+def _step_failed(step: str, error: Exception, chunks_ingested: int) -> JSONResponse:
+    logger.error(f"Ingest failed while {step}", exc_info=error)
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "error": f"Ingest failed while {step}: {error!s}",
+            "chunks_ingested": chunks_ingested,
+        },
+    )
+
+
+def _point_id(metadata: dict) -> str:
+    # The same chunk always gets the same id, so retrying an ingest that failed
+    # after some batches were written overwrites them instead of duplicating
+    key = f"{metadata.get('doc_id')}/{metadata.get('section_order')}/{metadata.get('chunk_index')}"
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+
 @data_router.get("/pmc")
 async def list_pmc_doc_ids():
     doc_ids = PmcProcessController().list_doc_ids()
@@ -192,6 +237,7 @@ async def process_pmc_articles_endpoint(batch_request: BatchPmcProcessRequest):
 async def ingest_pmc_article_endpoint(
     ingest_request: IngestPmcRequest,
     app_settings: Settings = Depends(get_settings),
+    vector_db: VectorDBInterface = Depends(get_vector_db),
 ):
     doc_id = ingest_request.doc_id
     collection_name = ingest_request.collection_name
@@ -208,6 +254,21 @@ async def ingest_pmc_article_endpoint(
     model_id = default_model
     embedding_size = default_size
 
+    # Shortened OpenAI v3 vectors (the `dimensions` parameter)
+    embedding_dimensions = ingest_request.embedding_dimensions
+    native_size = OPENAI_DIMENSIONS_MODELS.get(model_id) if provider == LLMEnums.OPENAI.value else None
+    if embedding_dimensions is not None:
+        if not native_size:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"error": "embedding_dimensions is only supported for OpenAI text-embedding-3 models"},
+            )
+        if not 0 < embedding_dimensions <= native_size:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"error": f"embedding_dimensions must be between 1 and {native_size} for {model_id}"},
+            )
+
     # Backward compat: if chunking_strategy omitted and provider is SENTENCE_TRANSFORMERS, infer BIOMEDICAL
     chunking_strategy = ingest_request.chunking_strategy
     if chunking_strategy is None and provider == "SENTENCE_TRANSFORMERS":
@@ -216,29 +277,37 @@ async def ingest_pmc_article_endpoint(
         chunking_strategy = "CHARACTER"
 
     pmc_controller = PmcProcessController()
+    chunker_profile = None
 
     # --- Chunking branch ---
+    # Chunks are produced lazily and embedded/stored in batches of
+    # INGEST_BATCH_SIZE, so memory stays bounded by the batch, not the paper.
     try:
+        article = pmc_controller.load_article(doc_id=doc_id)
+        # The article's created_at is the day it was scraped (PMC records carry
+        # no publication date); on every chunk as scraped_at, for range filters
+        scraped_at = payload_datetime(article.get("created_at"))
         if chunking_strategy == "BIOMEDICAL":
-            article = pmc_controller.load_article(doc_id=doc_id)
-            doc_title = article.get("doc_title", "")
-            source_url = article.get("source_url", "")
-            sections = article.get("sections", [])
-            sections_dict = {
-                s["title"]: s.get("text", "") or ""
-                for s in sorted(sections, key=lambda x: x.get("order", 0))
-            }
             max_tokens = min(chunk_size or 480, 512)
-            raw_chunks = chunk_paper_sections(
-                sections=sections_dict,
+            chunk_cache = None
+            if app_settings.CHUNK_CACHE_PATH:
+                chunk_cache = get_chunk_cache(
+                    pmc_controller.get_database_path(db_name=app_settings.CHUNK_CACHE_PATH),
+                    app_settings.CHUNK_CACHE_MAX_MB * 1024 * 1024,
+                )
+            if ingest_request.profile:
+                chunker_profile = ChunkerProfile()
+            chunks = iter_chunks(
+                sections=article_sections(article),
                 doc_id=article.get("doc_id", doc_id),
-                doc_title=doc_title,
-                source_url=source_url,
+                doc_title=article.get("doc_title", ""),
+                source_url=article.get("source_url", ""),
                 max_tokens=max_tokens,
                 overlap_tokens=overlap_size,
                 word_overlap=10,
+                cache=chunk_cache,
+                profile=chunker_profile,
             )
-            chunks = [{"text": c["text"], "metadata": c["metadata"]} for c in raw_chunks]
         else:
             char_chunk_size = chunk_size or 800
             docs = pmc_controller.process_article(
@@ -246,14 +315,18 @@ async def ingest_pmc_article_endpoint(
                 chunk_size=char_chunk_size,
                 overlap_size=overlap_size,
             )
-            chunks = [{"text": d.page_content, "metadata": d.metadata} for d in docs]
+            chunks = ({"text": d.page_content, "metadata": d.metadata} for d in docs)
+        chunk_batches = batched(chunks, app_settings.INGEST_BATCH_SIZE)
+        first_batch = next(chunk_batches, None)
     except FileNotFoundError as e:
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"error": str(e)},
         )
+    except Exception as e:
+        return _step_failed("chunking", e, 0)
 
-    if not chunks:
+    if not first_batch:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"error": "No chunks produced"},
@@ -267,75 +340,165 @@ async def ingest_pmc_article_endpoint(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"error": f"LLM provider not available: {provider}"},
         )
-    llm.set_embedding_model(model_id, embedding_size)
-
-    texts = []
-    vectors = []
-    metadata_list = []
-    for i, chunk in enumerate(chunks):
-        vec = llm.embed_text(chunk["text"])
-        if vec is None:
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"error": f"Embedding failed for chunk index {i}"},
-            )
-        texts.append(chunk["text"])
-        vectors.append(vec)
-        metadata_list.append(chunk["metadata"])
 
-    vdb_factory = VectorDBProviderFactory(app_settings)
+    chunks_ingested = 0
+    upsert = None
+    collection_cache = get_collection_cache()
     try:
-        vector_db = vdb_factory.create(app_settings.VECTOR_DB_PROVIDER)
-    except ValueError as e:
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={"error": str(e)},
-        )
-    if vector_db is None:
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"error": f"Vector DB provider not available: {app_settings.VECTOR_DB_PROVIDER}"},
-        )
-
-    try:
-        await vector_db.connect_async()
-        exists = await vector_db.is_collection_existed_async(collection_name)
-        if not exists:
+        collection = await collection_cache.get(vector_db, collection_name)
+        if collection is not None:
+            # Embed like the collection's existing points
+            recorded = collection.embedding
+            if recorded:
+                recorded_provider, recorded_model, recorded_size = recorded
+                if recorded_provider != provider:
+                    # Same size is not enough: another model's vectors live in another space
+                    return JSONResponse(
+                        status_code=status.HTTP_409_CONFLICT,
+                        content={
+                            "error": f"Collection '{collection_name}' holds {recorded_provider} "
+                                     f"{recorded_model} vectors, not {provider}",
+                        },
+                    )
+                if embedding_dimensions is not None and embedding_dimensions != recorded_size:
+                    return JSONResponse(
+                        status_code=status.HTTP_409_CONFLICT,
+                        content={
+                            "error": f"Collection '{collection_name}' holds {recorded_size}-dim vectors, "
+                                     f"not {embedding_dimensions}",
+                        },
+                    )
+                model_id, embedding_size = recorded_model, recorded_size
+            elif embedding_dimensions is not None:
+                embedding_size = embedding_dimensions
+            if collection.vector_size and collection.vector_size != embedding_size:
+                return JSONResponse(
+                    status_code=status.HTTP_409_CONFLICT,
+                    content={
+                        "error": f"Collection '{collection_name}' holds {collection.vector_size}-dim vectors; "
+                                 f"{model_id} produces {embedding_size}",
+                    },
+                )
+        else:
+            if embedding_dimensions is not None:
+                embedding_size = embedding_dimensions
+            elif native_size and 0 < app_settings.OPENAI_EMBEDDING_DIMENSIONS <= native_size:
+                embedding_size = app_settings.OPENAI_EMBEDDING_DIMENSIONS
             await vector_db.create_collection_async(
                 collection_name=collection_name,
                 embedding_size=embedding_size,
                 do_reset=False,
+                metadata=collection_embedding_metadata(provider, model_id, embedding_size),
             )
-        ok = await vector_db.insert_many_async(
-            collection_name=collection_name,
-            texts=texts,
-            vectors=vectors,
-            metadata=metadata_list,
-        )
-        if not ok:
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"error": "Vector DB insert_many_async failed"},
-            )
+        llm.set_embedding_model(model_id, embedding_size)
+
+        # The upsert of each batch runs while the next batch is embedded. Only
+        # the last upsert waits for indexing: every chunk is searchable on
+        # return for LOCAL and single-shard Qdrant collections, but on sharded
+        # or replicated ones earlier batches may still be indexing.
+        batches = chain([first_batch], chunk_batches)
+        batch = next(batches)
+        # Chunking and embedding run inside this loop; their errors are
+        # reported as such once the upsert in flight settles, not as vector
+        # DB failures
+        failed_step = None
+        while batch is not None:
+            try:
+                next_batch = next(batches, None)
+            except Exception as e:
+                failed_step = ("chunking", e)
+                break
+            texts = [chunk["text"] for chunk in batch]
+            metadata_list = [
+                {**chunk["metadata"], "scraped_at": scraped_at} if scraped_at else chunk["metadata"]
+                for chunk in batch
+            ]
+            try:
+                vectors = await llm.embed_texts_async(texts, document_type=DocumentTypeEnum.DOCUMENT.value)
+            except Exception as e:
+                failed_step = ("embedding", e)
+                break
+            if upsert is not None:
+                ok = await upsert
+                upsert = None
+                if not ok:
+                    return _insert_failed(chunks_ingested)
+                chunks_ingested += upserted
+            failed = [chunks_ingested + i for i, vec in enumerate(vectors or [None] * len(texts)) if vec is None]
+            if failed:
+                return JSONResponse(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    content={
+                        "error": f"Embedding failed for {len(failed)} chunk(s)",
+                        "failed_chunk_indices": failed,
+                        "chunks_ingested": chunks_ingested,
+                    },
+                )
+
+            upsert = asyncio.create_task(vector_db.insert_many_async(
+                collection_name=collection_name,
+                texts=texts,
+                vectors=vectors,
+                metadata=metadata_list,
+                record_ids=[_point_id(chunk["metadata"]) for chunk in batch],
+                wait=next_batch is None,
+            ))
+            upserted = len(batch)
+            batch = next_batch
+        if upsert is not None:
+            ok = await upsert
+            upsert = None
+            if not ok:
+                return _insert_failed(chunks_ingested)
+            chunks_ingested += upserted
+        if failed_step is not None:
+            return _step_failed(*failed_step, chunks_ingested)
+
+        if collection is not None and collection.embedding is None:
+            # Older collection without a recorded model: record it now, so
+            # searches stop guessing the provider from the vector size
+            try:
+                await vector_db.update_collection_metadata_async(
+                    collection_name, collection_embedding_metadata(provider, model_id, embedding_size)
+                )
+            except Exception as e:
+                logger.warning(f"Recording the embedding model on collection {collection_name} failed: {e}")
+        if collection is not None and not set(PAYLOAD_INDEXES) <= set(collection.payload_indexes):
+            # Collection created before filtered search: index it for filters
+            try:
+                await vector_db.create_payload_indexes_async(collection_name)
+            except Exception as e:
+                logger.warning(f"Creating payload indexes on collection {collection_name} failed: {e}")
     except ValueError as e:
         return JSONResponse(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             content={"error": str(e)},
         )
     except Exception as e:
-        logger.exception("Ingest failed while writing to Qdrant Cloud")
+        logger.exception("Ingest failed while writing to the vector DB")
+        # The cached description may be stale (collection dropped or recreated elsewhere)
+        collection_cache.invalidate(vector_db.cache_scope, collection_name)
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"error": f"Qdrant ingest failed: {e!s}"},
+            content={"error": f"Vector DB ingest failed: {e!s}", "chunks_ingested": chunks_ingested},
         )
     finally:
-        try:
-            await vector_db.disconnect_async()
-        except Exception:
-            pass
+        if upsert is not None:
+            upsert.cancel()
 
-    return {
+    response = {
         "doc_id": doc_id,
         "collection_name": collection_name,
-        "chunks_ingested": len(chunks),
+        "chunks_ingested": chunks_ingested,
+        "embedding_model": model_id,
+        "embedding_size": embedding_size,
     }
+    if app_settings.VECTOR_DB_PROVIDER == VectorDBEnums.QDRANT.value:
+        response["message"] = (
+            "Chunks stored; on a sharded or replicated Qdrant collection some may take "
+            "a moment to become searchable."
+        )
+    if chunker_profile is not None:
+        logger.info(f"Ingest doc_id={doc_id}: {chunker_profile.summary()}")
+        response["chunker_profile"] = chunker_profile.to_dict()
+    return response
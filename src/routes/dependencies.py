@@ -0,0 +1,27 @@
+from fastapi import Depends, HTTPException, status
+
+from src.helpers.config import get_settings, Settings
+from src.stores.vectordb.vector_db_provider_factory import VectorDBProviderFactory
+
+
+async def get_vector_db(app_settings: Settings = Depends(get_settings)):
+    """
+    Request dependency: the configured vector DB provider, connected. Qdrant
+    providers borrow the process-wide client (qdrant_clients), so this costs
+    no connection setup.
+    """
+    try:
+        vector_db = VectorDBProviderFactory(app_settings).create(app_settings.VECTOR_DB_PROVIDER)
+        if vector_db is not None:
+            await vector_db.connect_async()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if vector_db is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Vector DB provider not available: {app_settings.VECTOR_DB_PROVIDER}",
+        )
+    try:
+        yield vector_db
+    finally:
+        await vector_db.disconnect_async()
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
-from qdrant_client import QdrantClient
-
 from src.helpers.config import get_settings, Settings
 from src.stores.llm.embedding_defaults import EMBEDDING_DEFAULTS, DIMENSION_TO_PROVIDER
 from src.stores.llm.llm_provider_factory import LLMProviderFactory
+from src.stores.llm.llm_enums import DocumentTypeEnum
+from src.stores.llm.query_batcher import get_query_batcher
+from src.stores.vectordb.collection_cache import CollectionInfo, get_collection_cache
+from src.stores.vectordb.vector_db_interface import VectorDBInterface
+from .dependencies import get_vector_db
 from .schemes import SearchRequest, QueryRequest
 
 
@@ -21,47 +24,37 @@ class RetrievedDocument(BaseModel):
     score: float
 
 
-def _get_qdrant_client(app_settings: Settings) -> QdrantClient:
-    url = getattr(app_settings, 'QDRANT_CLUSTER_URL', None) or ''
-    api_key = getattr(app_settings, 'QDRANT_KEY', None) or ''
-    if not url or not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Qdrant Cloud is required. Set QDRANT_CLUSTER_URL and QDRANT_KEY in your .env file.",
-        )
-    return QdrantClient(url=url, api_key=api_key)
-
-
-def _get_provider_for_collection(client, collection_name: str, app_settings: Settings) -> str:
-    """Auto-detect embedding provider from collection's vector dimension."""
-    info = client.get_collection(collection_name=collection_name)
-    params = getattr(info, "config", None) and getattr(info.config, "params", None)
-    if not params or not params.vectors:
-        return app_settings.LLM_PROVIDER
-    vectors_cfg = params.vectors
-    if hasattr(vectors_cfg, "size"):
-        size = vectors_cfg.size
-    elif isinstance(vectors_cfg, dict):
-        first = next(iter(vectors_cfg.values()), None)
-        size = getattr(first, "size", None) if first else None
-    else:
-        return app_settings.LLM_PROVIDER
-    return DIMENSION_TO_PROVIDER.get(size, app_settings.LLM_PROVIDER)
-
+def _get_embedding_for_collection(collection: CollectionInfo, app_settings: Settings) -> tuple:
+    """
+    (provider, model_id, embedding_size) the collection was embedded with.
 
-def _embed_query(query: str, app_settings: Settings, embedding_provider: str | None = None, collection_name: str | None = None, client=None):
-    if embedding_provider:
-        provider = embedding_provider
-    elif collection_name and client:
-        provider = _get_provider_for_collection(client, collection_name, app_settings)
-    else:
-        provider = app_settings.LLM_PROVIDER
-    defaults = EMBEDDING_DEFAULTS.get(provider)
-    if defaults:
-        model_id, embedding_size = defaults
+    Read from the collection metadata recorded at ingest; older collections
+    without it fall back to auto-detecting the provider from the vector
+    dimension, with model_id and embedding_size None (provider defaults).
+    """
+    recorded = collection.embedding
+    if recorded:
+        return recorded
+    return DIMENSION_TO_PROVIDER.get(collection.vector_size, app_settings.LLM_PROVIDER), None, None
+
+
+async def _embed_query(query: str, app_settings: Settings, embedding_provider: str | None = None, collection: CollectionInfo | None = None):
+    model_id = embedding_size = None
+    if collection is not None:
+        detected, model_id, embedding_size = _get_embedding_for_collection(collection, app_settings)
+        provider = embedding_provider or detected
+        if provider != detected:
+            # Explicit provider override: use its defaults
+            model_id = embedding_size = None
     else:
-        model_id = app_settings.EMBEDDING_MODEL_ID
-        embedding_size = app_settings.EMBEDDING_SIZE
+        provider = embedding_provider or app_settings.LLM_PROVIDER
+    if model_id is None:
+        defaults = EMBEDDING_DEFAULTS.get(provider)
+        if defaults:
+            model_id, embedding_size = defaults
+        else:
+            model_id = app_settings.EMBEDDING_MODEL_ID
+            embedding_size = app_settings.EMBEDDING_SIZE
 
     llm_factory = LLMProviderFactory(app_settings)
     llm = llm_factory.create(provider)
@@ -72,7 +65,10 @@ def _embed_query(query: str, app_settings: Settings, embedding_provider: str | N
         )
     llm.set_embedding_model(model_id, embedding_size)
 
-    vec = llm.embed_text(query)
+    # Concurrent searches on the same model are embedded together
+    vec = await get_query_batcher().embed(
+        llm, query, DocumentTypeEnum.QUERY.value, group=(provider, model_id, embedding_size)
+    )
     if vec is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -81,47 +77,56 @@ def _embed_query(query: str, app_settings: Settings, embedding_provider: str | N
     return llm, vec
 
 
-@nlp_router.post("/search")
-async def nlp_search_endpoint(
-    request: SearchRequest,
-    app_settings: Settings = Depends(get_settings),
-):
-    """
-    Semantic search endpoint using official Qdrant query_points method.
-    - Embeds the query via LLMProviderFactory.
-    - Auto-detects embedding provider from collection vector size when not specified.
-    - Uses Qdrant's query_points() method for similarity search.
-    - Returns chunks with text, metadata, and score.
-    """
-    client = _get_qdrant_client(app_settings)
-
-    if not client.collection_exists(request.collection_name):
+async def _search_collection(request, app_settings: Settings, vector_db: VectorDBInterface):
+    """Embed request.query for its collection and return (llm, hits) from the vector DB."""
+    collection_cache = get_collection_cache()
+    collection = await collection_cache.get(vector_db, request.collection_name)
+    if collection is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Collection '{request.collection_name}' does not exist",
         )
 
-    _, query_vector = _embed_query(
+    llm, query_vector = await _embed_query(
         request.query,
         app_settings,
         request.embedding_provider,
-        request.collection_name,
-        client,
+        collection,
     )
 
     try:
-        resp = client.query_points(
+        hits = await vector_db.search_by_vector_async(
             collection_name=request.collection_name,
-            query=query_vector,
+            vector=query_vector,
             limit=request.limit,
-            with_payload=True,
+            payload_filter=request.filter.to_payload_filter() if request.filter else None,
         )
-        hits = resp.points
     except Exception as e:
+        # The cached description may be stale (collection dropped or recreated elsewhere)
+        collection_cache.invalidate(vector_db.cache_scope, request.collection_name)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Qdrant search failed: {e}",
+            detail=f"Vector search failed: {e}",
         )
+    return llm, hits
+
+
+@nlp_router.post("/search")
+async def nlp_search_endpoint(
+    request: SearchRequest,
+    app_settings: Settings = Depends(get_settings),
+    vector_db: VectorDBInterface = Depends(get_vector_db),
+):
+    """
+    Semantic search endpoint on the configured vector DB (VECTOR_DB_PROVIDER).
+    - Embeds the query via LLMProviderFactory.
+    - Embeds with the model and size recorded on the collection at ingest; older
+      collections auto-detect the provider from their vector size.
+    - Searches with vector_db.search_by_vector_async, restricted to request.filter
+      (doc ids, sections, scrape dates) inside the vector DB.
+    - Returns chunks with text, metadata, and score.
+    """
+    _, hits = await _search_collection(request, app_settings, vector_db)
 
     threshold = request.min_score_threshold
     chunks = []
@@ -141,45 +146,20 @@ async def nlp_search_endpoint(
 async def nlp_query_endpoint(
     request: QueryRequest,
     app_settings: Settings = Depends(get_settings),
+    vector_db: VectorDBInterface = Depends(get_vector_db),
 ):
     """
-    RAG query endpoint using official Qdrant query_points method.
-    - Embeds the query. Auto-detects embedding provider from collection when not specified.
-    - Uses Qdrant's query_points() for similarity search.
+    RAG query endpoint on the configured vector DB (VECTOR_DB_PROVIDER).
+    - Embeds the query with the model and size recorded on the collection (or
+      auto-detected from its vector size) unless a provider is specified.
+    - Searches with vector_db.search_by_vector_async, restricted to request.filter
+      (doc ids, sections, scrape dates) inside the vector DB.
     - Filters chunks below app_settings.MIN_SCORE_THRESHOLD.
     - Builds a prompt from the top-k retrieved chunks.
-    - Generates an answer with llm.generate_text.
+    - Generates an answer with llm.generate_text_async.
     - Returns answer and chunks_used.
     """
-    client = _get_qdrant_client(app_settings)
-
-    if not client.collection_exists(request.collection_name):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Collection '{request.collection_name}' does not exist",
-        )
-
-    llm, query_vector = _embed_query(
-        request.query,
-        app_settings,
-        request.embedding_provider,
-        request.collection_name,
-        client,
-    )
-
-    try:
-        resp = client.query_points(
-            collection_name=request.collection_name,
-            query=query_vector,
-            limit=request.limit,
-            with_payload=True,
-        )
-        hits = resp.points
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Qdrant search failed: {e}",
-        )
+    llm, hits = await _search_collection(request, app_settings, vector_db)
 
     if not hits:
         raise HTTPException(
@@ -236,7 +216,7 @@ ANSWER:"""
     llm.default_input_max_characters = len(prompt) + 100
 
     llm.set_generation_model(app_settings.GENERATION_MODEL_ID)
-    answer = llm.generate_text(prompt, chat_history=[])
+    answer = await llm.generate_text_async(prompt, chat_history=[])
     if answer is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -2,6 +2,7 @@ from .process_request import ProcessRequest
 from .pmc_process_request import PmcProcessRequest
 from .batch_pmc_process_request import BatchPmcProcessRequest
 from .ingest_pmc_request import IngestPmcRequest
+from .search_filter import SearchFilter
 from .search_request import SearchRequest
 from .query_request import QueryRequest
 
@@ -10,6 +11,7 @@ __all__ = [
     "PmcProcessRequest",
     "BatchPmcProcessRequest",
     "IngestPmcRequest",
+    "SearchFilter",
     "SearchRequest",
     "QueryRequest",
 ]
\ No newline at end of file
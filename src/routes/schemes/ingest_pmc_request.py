@@ -20,6 +20,9 @@ class IngestPmcRequest(BaseModel):
     - chunk_size: chars for CHARACTER (default 800), tokens for BIOMEDICAL (default 480)
     - overlap_size: chars for CHARACTER, tokens for BIOMEDICAL (default 80)
     - embedding_provider: OPENAI | COHERE | SENTENCE_TRANSFORMERS. Default: config LLM_PROVIDER
+    - embedding_dimensions: OPENAI text-embedding-3 only; shortened vector size (e.g. 256, 512, 1024).
+      Default: config OPENAI_EMBEDDING_DIMENSIONS for new collections, the recorded size for existing ones
+    - profile: BIOMEDICAL only; return per-stage chunker timings as "chunker_profile"
     """
 
     doc_id: str
@@ -28,3 +31,5 @@ class IngestPmcRequest(BaseModel):
     chunk_size: Optional[int] = None
     overlap_size: Optional[int] = 80
     embedding_provider: Optional[str] = None
+    embedding_dimensions: Optional[int] = None
+    profile: Optional[bool] = False
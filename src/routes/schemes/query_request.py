@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional
 
+from .search_filter import SearchFilter
+
 
 class QueryRequest(BaseModel):
     """
@@ -11,6 +13,7 @@ class QueryRequest(BaseModel):
     - limit: maximum number of chunks to retrieve for context (default 5)
     - min_score_threshold: optional; filter chunks below this similarity (0-1)
     - embedding_provider: OPENAI | COHERE | SENTENCE_TRANSFORMERS. Must match collection ingest.
+    - filter: optional; only search chunks matching these doc ids, sections and dates
     """
 
     collection_name: str
@@ -18,3 +21,4 @@ class QueryRequest(BaseModel):
     limit: Optional[int] = 5
     min_score_threshold: Optional[float] = None
     embedding_provider: Optional[str] = None
+    filter: Optional[SearchFilter] = None
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from src.stores.vectordb.payload_filter import PayloadFilter
+
+
+class SearchFilter(BaseModel):
+    """
+    Restricts a search to chunks whose metadata matches every given field;
+    list fields match any of their values. Applied inside the vector DB.
+
+    - doc_ids: article UUIDs as listed by GET /api/v1/data/pmc (not PMC ids,
+      which only appear in source_url)
+    - section_titles: exact section titles, e.g. ["Methods", "Results"]
+    - source_urls: article URLs
+    - section_order_min / section_order_max: inclusive range of section positions
+    - scraped_from / scraped_to: inclusive range of the days the articles were
+      scraped from PMC (YYYY-MM-DD), not their publication dates
+    """
+
+    doc_ids: Optional[List[str]] = None
+    section_titles: Optional[List[str]] = None
+    source_urls: Optional[List[str]] = None
+    section_order_min: Optional[int] = None
+    section_order_max: Optional[int] = None
+    scraped_from: Optional[date] = None
+    scraped_to: Optional[date] = None
+
+    def to_payload_filter(self) -> PayloadFilter:
+        return PayloadFilter(
+            doc_ids=tuple(self.doc_ids or ()),
+            section_titles=tuple(self.section_titles or ()),
+            source_urls=tuple(self.source_urls or ()),
+            section_order_min=self.section_order_min,
+            section_order_max=self.section_order_max,
+            scraped_from=self.scraped_from,
+            scraped_to=self.scraped_to,
+        )
@@ -12,28 +12,79 @@ and downstream reranking pipelines.
 
 from __future__ import annotations
 
+import os
 import re
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any, Iterator
+
+from src.domain import ChunkSpan, PaperChunks
+from src.services.sentence_segmenter import get_sentence_segmenter
+
+if TYPE_CHECKING:
+    from src.services.chunk_cache import ChunkCache
+    from src.services.chunker_profile import ChunkerProfile
 
 # Lazy-load tokenizer to avoid import cost when chunker is not used
 _TOKENIZER = None
 
+# Same vocab as the PubMedBERT embedding model
+TOKENIZER_REPO_ID = "neuml/pubmedbert-base-embeddings"
+# Local tokenizer.json to load instead of the Hugging Face hub (air-gapped hosts)
+TOKENIZER_PATH_ENV = "CHUNKER_TOKENIZER_PATH"
+
 # PubMedBERT max seq length; we use 480 to leave headroom for special tokens
 MAX_CHUNK_TOKENS = 480
 OVERLAP_TOKENS = 80
 WORD_OVERLAP = 10
 
-# Placeholder to protect periods in abbreviations/decimals during sentence split
-_PROTECT_PLACEHOLDER = "\uE000"  # Unicode private use
+# Bump whenever a change alters chunk output, so cached chunks are invalidated
+CHUNKER_VERSION = "3"
+
+# PubMedBERT hard limit; no emitted chunk may exceed it
+_MODEL_MAX_TOKENS = 512
+
+_WORD_RE = re.compile(r"\S+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def load_tokenizer(path: str | None = None):
+    """
+    Load and install the PubMedBERT tokenizer used for all token counts.
+
+    Uses the `tokenizers` library directly (no transformers import). Loads the
+    tokenizer.json at path, else at $CHUNKER_TOKENIZER_PATH, else from the
+    Hugging Face hub (local HF cache first).
+    """
+    global _TOKENIZER
+    from tokenizers import Tokenizer
+
+    path = path or os.environ.get(TOKENIZER_PATH_ENV)
+    if path:
+        tokenizer = Tokenizer.from_file(str(path))
+    else:
+        tokenizer = Tokenizer.from_pretrained(TOKENIZER_REPO_ID)
+    # Counts must cover the full text: never truncate or pad
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    _TOKENIZER = tokenizer
+    return tokenizer
+
+
+def warm_up_tokenizer(path: str | None = None) -> float:
+    """
+    Load the tokenizer (if not loaded yet) and run one encode, so the first
+    chunking request pays no load cost. Returns the elapsed seconds.
+    """
+    started = time.perf_counter()
+    tokenizer = _TOKENIZER if _TOKENIZER is not None else load_tokenizer(path)
+    tokenizer.encode_batch(["Warm-up sentence (p < 0.05)."], add_special_tokens=False)
+    return time.perf_counter() - started
 
 
 def _get_tokenizer():
     """Lazy-load PubMedBERT tokenizer. Uses same vocab as embedding model."""
-    global _TOKENIZER
     if _TOKENIZER is None:
-        from transformers import AutoTokenizer
-
-        _TOKENIZER = AutoTokenizer.from_pretrained("neuml/pubmedbert-base-embeddings")
+        return load_tokenizer()
     return _TOKENIZER
 
 
@@ -41,26 +92,20 @@ def _token_count(text: str) -> int:
     """Return token count for text using PubMedBERT tokenizer."""
     if not text or not str(text).strip():
         return 0
-    return len(_get_tokenizer().encode(text, add_special_tokens=False))
-
-
-def _protect_periods(text: str) -> str:
-    """Replace periods in decimals/abbreviations with placeholder to avoid false splits."""
-    # Decimals: 0.05, 1.23, p=0.001
-    text = re.sub(r"(\d)\.(\d)", r"\1" + _PROTECT_PLACEHOLDER + r"\2", text)
-    # Abbreviations: Fig., et al., Dr., e.g., i.e., vs., No.
-    text = re.sub(
-        r"(Fig|Figs|et\s+al|Dr|Mr|Mrs|Ms|e\.g|i\.e|vs|No)\.(\s|$)",
-        r"\1" + _PROTECT_PLACEHOLDER + r"\2",
-        text,
-        flags=re.IGNORECASE,
-    )
-    return text
+    return len(_get_tokenizer().encode(text, add_special_tokens=False).ids)
 
 
-def _restore_periods(text: str) -> str:
-    """Restore protected periods."""
-    return text.replace(_PROTECT_PLACEHOLDER, ".")
+def _token_counts(texts: list[str]) -> list[int]:
+    """Return token counts for many texts from a single batch encode."""
+    if not texts:
+        return []
+    encodings = _get_tokenizer().encode_batch(texts, add_special_tokens=False)
+    return [len(encoding.ids) for encoding in encodings]
+
+
+def _normalize_whitespace(text: str) -> str:
+    """Strip text and collapse every whitespace run to a single space."""
+    return _WHITESPACE_RE.sub(" ", text.strip())
 
 
 def _split_sentences_scientific(text: str) -> list[str]:
@@ -68,145 +113,314 @@ def _split_sentences_scientific(text: str) -> list[str]:
     Split text into sentences using a scientific-aware splitter.
 
     Protects:
-    - Decimals (0.05, 1.23)
-    - Abbreviations: Fig., Figs., et al., Dr., e.g., i.e., vs., No.
-    - Statistics: p < 0.05, p = 0.001 (decimals protected above)
+    - Decimals (0.05, 1.23, p < .05)
+    - Abbreviations: Fig., Figs., et al., Dr., e.g., i.e., vs., No. and the
+      rest of the segmenter's abbreviation table
     """
     if not text or not str(text).strip():
         return []
 
-    text = text.strip()
-    text = re.sub(r"\s+", " ", text)
-    protected = _protect_periods(text)
-    # Split on . ! ? when followed by space and uppercase (sentence start)
-    parts = re.split(r"(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])$", protected)
-    sentences = [_restore_periods(p.strip()) for p in parts if p.strip()]
-    return sentences
+    text = _normalize_whitespace(text)
+    return [text[start:end] for start, end in get_sentence_segmenter().spans(text)]
 
 
-def _split_long_sentence_wordwise(text: str, max_tokens: int, word_overlap: int) -> list[str]:
+def _word_token_counts(text: str) -> tuple[list[tuple[int, int]], list[int]]:
     """
-    Split a single long sentence into token-safe pieces using word boundaries.
+    Split text on whitespace and return the word (start, end) offsets with
+    their token counts.
 
-    Uses word-level overlap to preserve context for hybrid search and reranker.
+    The text is tokenized once and every token is attributed to the word its
+    character offsets fall in. PubMedBERT pre-tokenizes on whitespace, so the
+    token count of any run of space-joined words is the sum of its word counts.
     """
-    words = text.split()
-    if not words:
-        return []
-    tokenizer = _get_tokenizer()
-    chunks = []
+    spans = [(m.start(), m.end()) for m in _WORD_RE.finditer(text)]
+    counts = [0] * len(spans)
+    if not spans:
+        return spans, counts
+    encoding = _get_tokenizer().encode(text, add_special_tokens=False)
+    w = 0
+    for tok_start, tok_end in encoding.offsets:
+        if tok_end <= tok_start:
+            continue
+        # Tokens arrive in text order, so the owning word only moves forward
+        while w < len(spans) - 1 and tok_start >= spans[w][1]:
+            w += 1
+        counts[w] += 1
+    return spans, counts
+
+
+def _wordwise_windows(counts: list[int], max_tokens: int, word_overlap: int) -> list[tuple[int, int]]:
+    """
+    Return (start, end) word windows that each fit in max_tokens.
+
+    Windows grow greedily one word at a time (a single word is always taken,
+    even if it alone exceeds max_tokens) and the next window steps back by
+    word_overlap words to preserve context for hybrid search and reranker.
+    """
+    prefix = [0]
+    for c in counts:
+        prefix.append(prefix[-1] + c)
+    n = len(counts)
+    windows = []
     start = 0
-    while start < len(words):
-        # Grow chunk until we hit max_tokens
+    while start < n:
         end = start
-        chunk_words = []
-        while end < len(words):
-            candidate = chunk_words + [words[end]]
-            candidate_text = " ".join(candidate)
-            if _token_count(candidate_text) > max_tokens and chunk_words:
-                break
-            chunk_words = candidate
+        while end < n and (prefix[end + 1] - prefix[start] <= max_tokens or end == start):
             end += 1
-        if chunk_words:
-            chunks.append(" ".join(chunk_words))
-        # Overlap: step back by word_overlap (or to start+1 if sentence is very long)
-        start = end - word_overlap if end - word_overlap > start else start + len(chunk_words)
-        if start >= len(words):
-            break
-    return chunks
+        windows.append((start, end))
+        # Overlap: step back by word_overlap (or to end if sentence is very long)
+        start = end - word_overlap if end - word_overlap > start else end
+    return windows
 
 
-def _chunk_section_text(
+def _split_long_sentence_wordwise(text: str, max_tokens: int, word_overlap: int) -> list[str]:
+    """
+    Split a single long sentence into token-safe pieces using word boundaries.
+
+    Uses word-level overlap to preserve context for hybrid search and reranker.
+    The sentence is tokenized once; window boundaries come from per-word token
+    counts, so the cost is linear in sentence length.
+    """
+    word_spans, counts = _word_token_counts(text)
+    words = [text[start:end] for start, end in word_spans]
+    return [
+        " ".join(words[start:end])
+        for start, end in _wordwise_windows(counts, max_tokens, word_overlap)
+    ]
+
+
+def _chunk_section_spans(
     section_text: str,
     max_tokens: int = MAX_CHUNK_TOKENS,
     overlap_tokens: int = OVERLAP_TOKENS,
     word_overlap: int = WORD_OVERLAP,
-) -> list[str]:
+    profile: ChunkerProfile | None = None,
+) -> tuple[str, list[tuple[int, int, int]]]:
     """
-    Chunk section text into token-safe pieces.
+    Chunk section text into (char_start, char_end, token_count) spans.
 
-    - Splits by sentences (scientific-aware).
-    - Each chunk <= max_tokens with overlap_tokens overlap.
-    - If a sentence exceeds max_tokens, splits it word-wise with word_overlap.
-    - Never produces a chunk > 512 tokens (PubMedBERT limit).
+    Returns the whitespace-normalized section text together with the spans;
+    every chunk is a contiguous run of it (sentences and words are separated by
+    single spaces), so chunk text is only sliced out when it is needed.
+
+    All sentences are tokenized in one batch call. Chunks are built from units
+    (sentences, plus word-overlap seeds left by split long sentences) whose
+    counts are known up front, so chunk sizes and overlap windows are sums of
+    those counts and joined chunk text is never re-encoded.
     """
-    sentences = _split_sentences_scientific(section_text)
-    if not sentences:
-        return []
+    if profile is not None:
+        started = time.perf_counter()
+    text = _normalize_whitespace(section_text)
+    sentence_spans = get_sentence_segmenter().spans(text)
+    if profile is not None:
+        profile.record("sentence_split", started)
+        profile.count(sentences=len(sentence_spans))
+    if not sentence_spans:
+        return text, []
+
+    # Never build a chunk over the PubMedBERT limit: a larger max_tokens is
+    # capped (the first chunker silently dropped chunks packed past 512)
+    max_tokens = min(max_tokens, _MODEL_MAX_TOKENS)
+
+    # Unit table: every sentence, then word-overlap seeds as they are created
+    unit_spans = list(sentence_spans)
+    if profile is not None:
+        started = time.perf_counter()
+    unit_counts = _token_counts([text[start:end] for start, end in sentence_spans])
+    if profile is not None:
+        profile.record("tokenize", started)
 
     chunks = []
-    current_sentences = []
+    current_units = []
     current_tokens = 0
-    overlap_sentences = []
-
-    def flush_chunk() -> str | None:
-        nonlocal current_sentences, overlap_sentences
-        if not current_sentences:
-            return None
-        text = " ".join(current_sentences).strip()
-        if not text:
-            return None
-        # Ensure we never exceed 512
-        if _token_count(text) > 512:
-            # Fallback: split current content word-wise
-            return None  # Caller will handle
-        overlap_sentences = _get_overlap_sentences(current_sentences, overlap_tokens)
-        return text
-
-    def _get_overlap_sentences(sents: list[str], target_overlap: int) -> list[str]:
-        """Return trailing sentences that approximate target_overlap tokens."""
+    overlap_units = []
+    overlap_count = 0
+    # False while current_units holds only overlap carried from the last chunk
+    has_new_content = False
+
+    def flush_chunk() -> tuple[int, int, int]:
+        nonlocal overlap_units, overlap_count
+        overlap_units, overlap_count = _get_overlap_units(current_units, overlap_tokens)
+        return unit_spans[current_units[0]][0], unit_spans[current_units[-1]][1], current_tokens
+
+    def _get_overlap_units(units: list[int], target_overlap: int) -> tuple[list[int], int]:
+        """Return trailing units that approximate target_overlap tokens, with their count."""
         result = []
         count = 0
-        for s in reversed(sents):
+        for u in reversed(units):
             if count >= target_overlap:
                 break
-            result.insert(0, s)
-            count += _token_count(s)
-        return result
+            result.append(u)
+            count += unit_counts[u]
+        result.reverse()
+        return result, count
 
     i = 0
-    while i < len(sentences):
-        sent = sentences[i]
-        sent_tokens = _token_count(sent)
+    while i < len(sentence_spans):
+        sent_tokens = unit_counts[i]
 
         # Single sentence exceeds max_tokens: split word-wise
         if sent_tokens > max_tokens:
             # Flush any current chunk first
-            if current_sentences:
-                t = flush_chunk()
-                if t:
-                    chunks.append(t)
-                current_sentences = []
+            if current_units:
+                chunks.append(flush_chunk())
+                current_units = []
                 current_tokens = 0
-            sub_chunks = _split_long_sentence_wordwise(sent, max_tokens, word_overlap)
-            for sc in sub_chunks:
-                if _token_count(sc) <= 512:
-                    chunks.append(sc)
-            overlap_sentences = sub_chunks[-1].split()[-word_overlap:] if sub_chunks else []
-            current_sentences = [" ".join(overlap_sentences)] if overlap_sentences else []
-            current_tokens = _token_count(current_sentences[0]) if current_sentences else 0
+            if profile is not None:
+                started = time.perf_counter()
+            # Tokenize the sentence once; piece sizes come from per-word counts
+            sent_start, sent_end = sentence_spans[i]
+            word_spans, word_counts = _word_token_counts(text[sent_start:sent_end])
+            windows = _wordwise_windows(word_counts, max_tokens, word_overlap)
+            for start, end in windows:
+                piece_tokens = sum(word_counts[start:end])
+                if piece_tokens <= _MODEL_MAX_TOKENS:
+                    chunks.append(
+                        (
+                            sent_start + word_spans[start][0],
+                            sent_start + word_spans[end - 1][1],
+                            piece_tokens,
+                        )
+                    )
+            seed = range(*windows[-1])[-word_overlap:] if windows else range(0)
+            if seed:
+                unit_spans.append((sent_start + word_spans[seed[0]][0], sent_start + word_spans[seed[-1]][1]))
+                unit_counts.append(sum(word_counts[k] for k in seed))
+                overlap_units = [len(unit_spans) - 1]
+                overlap_count = unit_counts[-1]
+            else:
+                overlap_units = []
+                overlap_count = 0
+            if profile is not None:
+                profile.record("long_sentence_split", started)
+                profile.count(long_sentences=1)
+            current_units = overlap_units.copy()
+            current_tokens = overlap_count
+            has_new_content = False
             i += 1
             continue
 
         # Would exceed max_tokens: flush current chunk and start new with overlap
-        if current_tokens + sent_tokens > max_tokens and current_sentences:
-            t = flush_chunk()
-            if t:
-                chunks.append(t)
-            current_sentences = overlap_sentences.copy()
-            current_tokens = sum(_token_count(s) for s in current_sentences)
+        if current_tokens + sent_tokens > max_tokens and current_units:
+            if not has_new_content:
+                # Flushing the carried overlap alone would re-seed the same
+                # overlap forever; start the next chunk without it instead
+                current_units = []
+                current_tokens = 0
+                continue
+            chunks.append(flush_chunk())
+            current_units = overlap_units.copy()
+            current_tokens = overlap_count
+            has_new_content = False
             continue
 
-        current_sentences.append(sent)
+        current_units.append(i)
         current_tokens += sent_tokens
+        has_new_content = True
         i += 1
 
-    if current_sentences:
-        t = flush_chunk()
-        if t and _token_count(t) <= 512:
-            chunks.append(t)
+    if current_units:
+        chunks.append(flush_chunk())
 
-    return chunks
+    return text, chunks
+
+
+def _chunk_section_text(
+    section_text: str,
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+) -> list[str]:
+    """
+    Chunk section text into token-safe pieces.
+
+    - Splits by sentences (scientific-aware).
+    - Each chunk <= max_tokens with overlap_tokens overlap.
+    - If a sentence exceeds max_tokens, splits it word-wise with word_overlap.
+    - Never produces a chunk > 512 tokens (PubMedBERT limit); a larger
+      max_tokens is capped at 512.
+    """
+    text, spans = _chunk_section_spans(
+        section_text,
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+        word_overlap=word_overlap,
+    )
+    return [text[start:end] for start, end, _ in spans]
+
+
+def _section_chunk_spans(
+    section_text: str,
+    max_tokens: int,
+    overlap_tokens: int,
+    word_overlap: int,
+    cache: ChunkCache | None,
+    profile: ChunkerProfile | None = None,
+    doc_id: str = "",
+    section_title: str = "",
+) -> tuple[str, list[tuple[int, int, int, int]]]:
+    """
+    Return the normalized section text and its final chunk spans as
+    (char_start, char_end, token_count, chunk_index).
+
+    With a cache, previously chunked section text is served from it without
+    loading the tokenizer; only whitespace normalization is redone.
+    doc_id and section_title only label the section in the profile.
+    """
+    if profile is not None:
+        section_started = time.perf_counter()
+        profile.begin_section(doc_id, section_title, len(section_text))
+
+    spans = None
+    if cache is not None:
+        if profile is not None:
+            started = time.perf_counter()
+        cache_key = cache.make_key(section_text, max_tokens, overlap_tokens, word_overlap)
+        spans = cache.get(cache_key)
+        if profile is not None:
+            profile.record("cache", started)
+            if spans is not None:
+                profile.mark_cache_hit()
+    if spans is None:
+        text, spans = _chunk_section_spans(
+            section_text,
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            word_overlap=word_overlap,
+            profile=profile,
+        )
+        if cache is not None:
+            if profile is not None:
+                started = time.perf_counter()
+            cache.put(cache_key, spans)
+            if profile is not None:
+                profile.record("cache", started)
+    else:
+        text = _normalize_whitespace(section_text)
+
+    if profile is not None:
+        started = time.perf_counter()
+    result = []
+    for idx, (start, end, token_count) in enumerate(spans):
+        # Final safety: never exceed 512 tokens
+        if token_count > _MODEL_MAX_TOKENS:
+            word_spans, word_counts = _word_token_counts(text[start:end])
+            windows = _wordwise_windows(word_counts, 480, word_overlap)
+            for j, (w_start, w_end) in enumerate(windows):
+                result.append(
+                    (
+                        start + word_spans[w_start][0],
+                        start + word_spans[w_end - 1][1],
+                        sum(word_counts[w_start:w_end]),
+                        idx if len(windows) == 1 else idx * 10 + j,
+                    )
+                )
+        else:
+            result.append((start, end, token_count, idx))
+    if profile is not None:
+        profile.record("safety_pass", started)
+        profile.end_section(section_started, len(result))
+    return text, result
 
 
 def chunk_section(
@@ -219,6 +433,8 @@ def chunk_section(
     max_tokens: int = MAX_CHUNK_TOKENS,
     overlap_tokens: int = OVERLAP_TOKENS,
     word_overlap: int = WORD_OVERLAP,
+    cache: ChunkCache | None = None,
+    profile: ChunkerProfile | None = None,
 ) -> list[dict[str, Any]]:
     """
     Chunk a single section into token-safe pieces.
@@ -226,51 +442,69 @@ def chunk_section(
     Section title and paper title are stored ONLY in metadata, not in chunk text.
     This keeps chunk text focused for semantic search while metadata supports
     filtering and hybrid keyword search on section names.
+
+    With a cache, previously chunked section text is returned from it without
+    loading the tokenizer. With a ChunkerProfile, stage timings are recorded in it.
     """
     if not section_text or not str(section_text).strip():
         return []
 
-    raw_chunks = _chunk_section_text(
-        section_text,
-        max_tokens=max_tokens,
-        overlap_tokens=overlap_tokens,
-        word_overlap=word_overlap,
+    text, spans = _section_chunk_spans(
+        section_text, max_tokens, overlap_tokens, word_overlap, cache, profile, doc_id, section_title
     )
+    return [
+        {
+            "text": text[start:end],
+            "metadata": {
+                "doc_id": doc_id,
+                "doc_title": doc_title,
+                "source_url": source_url,
+                "section_title": section_title,
+                "section_order": section_order,
+                "chunk_index": chunk_index,
+            },
+        }
+        for start, end, _, chunk_index in spans
+    ]
+
+
+def iter_chunks(
+    sections: dict[str, str],
+    doc_id: str,
+    doc_title: str,
+    source_url: str = "",
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+    cache: ChunkCache | None = None,
+    profile: ChunkerProfile | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield a paper's chunks section by section as they are produced.
 
-    result = []
-    for idx, text in enumerate(raw_chunks):
-        # Final safety: never exceed 512 tokens
-        if _token_count(text) > 512:
-            sub = _split_long_sentence_wordwise(text, 480, word_overlap)
-            for j, s in enumerate(sub):
-                result.append(
-                    {
-                        "text": s.strip(),
-                        "metadata": {
-                            "doc_id": doc_id,
-                            "doc_title": doc_title,
-                            "source_url": source_url,
-                            "section_title": section_title,
-                            "section_order": section_order,
-                            "chunk_index": idx if len(sub) == 1 else idx * 10 + j,
-                        },
-                    }
-                )
-        else:
-            result.append(
-                {
-                    "text": text.strip(),
-                    "metadata": {
-                        "doc_id": doc_id,
-                        "doc_title": doc_title,
-                        "source_url": source_url,
-                        "section_title": section_title,
-                        "section_order": section_order,
-                        "chunk_index": idx,
-                    },
-                }
-            )
-    return result
+    Same arguments and chunk schema as chunk_paper_sections, but only one
+    section's chunks are held at a time, so consumers that embed and store in
+    bounded batches keep memory proportional to the batch, not the paper.
+    """
+    section_order = 0
+    for section_title, section_text in sections.items():
+        if not section_title or not str(section_text).strip():
+            section_order += 1
+            continue
+        yield from chunk_section(
+            section_text=section_text,
+            doc_id=doc_id,
+            doc_title=doc_title,
+            source_url=source_url,
+            section_title=section_title,
+            section_order=section_order,
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            word_overlap=word_overlap,
+            cache=cache,
+            profile=profile,
+        )
+        section_order += 1
 
 
 def chunk_paper_sections(
@@ -281,6 +515,8 @@ def chunk_paper_sections(
     max_tokens: int = MAX_CHUNK_TOKENS,
     overlap_tokens: int = OVERLAP_TOKENS,
     word_overlap: int = WORD_OVERLAP,
+    cache: ChunkCache | None = None,
+    profile: ChunkerProfile | None = None,
 ) -> list[dict[str, Any]]:
     """
     Wrapper: chunk a paper from a dictionary of section name -> section text.
@@ -290,30 +526,66 @@ def chunk_paper_sections(
         doc_id: Unique document identifier
         doc_title: Full paper title
         source_url: Paper URL or source
-        max_tokens: Max tokens per chunk (default 480)
+        max_tokens: Max tokens per chunk (default 480; capped at 512, the PubMedBERT limit)
         overlap_tokens: Overlap between chunks (default 80)
         word_overlap: Word overlap when splitting long sentences (default 10)
+        cache: Optional ChunkCache consulted per section before chunking
+        profile: Optional ChunkerProfile that collects per-stage timings
 
     Returns:
         List of chunks, each with "text" and "metadata" in JSON-compatible schema.
     """
-    all_chunks = []
-    section_order = 0
-    for section_title, section_text in sections.items():
-        if not section_title or not str(section_text).strip():
-            section_order += 1
-            continue
-        chunks = chunk_section(
-            section_text=section_text,
+    return list(
+        iter_chunks(
+            sections=sections,
             doc_id=doc_id,
             doc_title=doc_title,
             source_url=source_url,
-            section_title=section_title,
-            section_order=section_order,
             max_tokens=max_tokens,
             overlap_tokens=overlap_tokens,
             word_overlap=word_overlap,
+            cache=cache,
+            profile=profile,
+        )
+    )
+
+
+def chunk_paper_spans(
+    sections: dict[str, str],
+    doc_id: str,
+    doc_title: str,
+    source_url: str = "",
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+    cache: ChunkCache | None = None,
+    profile: ChunkerProfile | None = None,
+) -> PaperChunks:
+    """
+    Chunk a paper into compact span records instead of text + metadata dicts.
+
+    Same chunks as chunk_paper_sections, but each one is a ChunkSpan
+    (section_index, char_start, char_end, token_count, chunk_index) into the
+    paper's normalized section texts, and paper metadata is stored once on the
+    returned PaperChunks. Use PaperChunks.to_dicts() to materialize the usual
+    schema when serializing. Meant for batch jobs that hold many papers.
+    """
+    paper = PaperChunks(doc_id=doc_id, doc_title=doc_title, source_url=source_url)
+    section_order = 0
+    for section_title, section_text in sections.items():
+        if not section_title or not str(section_text).strip():
+            section_order += 1
+            continue
+        text, spans = _section_chunk_spans(
+            section_text, max_tokens, overlap_tokens, word_overlap, cache, profile, doc_id, section_title
+        )
+        section_index = len(paper.section_texts)
+        paper.section_titles.append(section_title)
+        paper.section_orders.append(section_order)
+        paper.section_texts.append(text)
+        paper.spans.extend(
+            ChunkSpan(section_index, start, end, token_count, chunk_index)
+            for start, end, token_count, chunk_index in spans
         )
-        all_chunks.extend(chunks)
         section_order += 1
-    return all_chunks
+    return paper
@@ -0,0 +1,64 @@
+"""
+On-disk cache for biomedical chunker output.
+
+Entries are keyed by the SHA-256 of the section text together with the chunker
+parameters (max_tokens, overlap_tokens, word_overlap) and CHUNKER_VERSION, so
+any change to the text, the parameters or the chunking algorithm is a miss.
+A hit returns the stored (char_start, char_end, token_count) chunk spans
+without touching the tokenizer; spans index the whitespace-normalized section
+text, which is cheap to rebuild.
+
+Storage is a single SQLite file (stdlib, safe to share between the API and
+chunking worker processes). The file is kept under max_bytes by evicting the
+least recently used entries.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Union
+
+from src.helpers.sqlite_lru_cache import SqliteLRUCache
+from src.services.biomedical_chunker import CHUNKER_VERSION
+
+
+class ChunkCache(SqliteLRUCache):
+    """
+    SQLite-backed, size-bounded LRU cache of chunked sections.
+
+    Usage:
+        cache = ChunkCache("chunk_cache.sqlite3", max_bytes=256 * 1024 * 1024)
+        chunks = chunk_paper_sections(sections, ..., cache=cache)
+        cache.stats()  # {"hits": ..., "misses": ..., "hit_rate": ..., ...}
+    """
+
+    TABLE = "chunks"
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 512 * 1024 * 1024):
+        super().__init__(path, max_bytes)
+
+    @staticmethod
+    def make_key(section_text: str, max_tokens: int, overlap_tokens: int, word_overlap: int) -> str:
+        """Return the cache key for a section and the chunker parameters."""
+        text_hash = hashlib.sha256(section_text.encode("utf-8")).hexdigest()
+        return f"{CHUNKER_VERSION}:{max_tokens}:{overlap_tokens}:{word_overlap}:{text_hash}"
+
+    def get(self, key: str) -> list[tuple[int, int, int]] | None:
+        """Return the cached (char_start, char_end, token_count) spans, or None on a miss."""
+        value = self.get_bytes(key)
+        if value is None:
+            return None
+        return [(start, end, count) for start, end, count in json.loads(value)]
+
+    def put(self, key: str, spans: list[tuple[int, int, int]]) -> None:
+        """Store chunk spans, evicting least recently used entries if over max_bytes."""
+        self.put_bytes(key, json.dumps(spans, separators=(",", ":")).encode("utf-8"))
+
+
+@lru_cache(maxsize=None)
+def get_chunk_cache(path: str, max_bytes: int) -> ChunkCache:
+    """Return the process-wide ChunkCache for path, opening it on first use."""
+    return ChunkCache(path, max_bytes=max_bytes)
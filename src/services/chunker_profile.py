@@ -0,0 +1,153 @@
+"""
+Opt-in stage profiling for the biomedical chunker.
+
+Pass a ChunkerProfile as `profile=` to chunk_section / iter_chunks /
+chunk_paper_sections / chunk_paper_spans and it collects wall time and call
+counts per stage, for the whole run, per section and per paper. Without a
+profile the chunker only does `is None` checks.
+
+Stages:
+- sentence_split: scientific sentence segmentation
+- tokenize: the batched sentence token count
+- long_sentence_split: word-wise splitting of sentences over max_tokens
+  (includes the word tokenization it needs)
+- safety_pass: the final 512-token re-check and any re-split
+- cache: chunk cache lookups and stores
+
+Usage:
+    profile = ChunkerProfile()
+    chunks = chunk_paper_sections(sections, ..., profile=profile)
+    logger.info(profile.summary())
+    return {"chunker_profile": profile.to_dict()}
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class StageStats:
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "ms": round(self.seconds * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+@dataclass(slots=True)
+class SectionProfile:
+    doc_id: str
+    section_title: str
+    chars: int
+    sentences: int = 0
+    long_sentences: int = 0
+    chunks: int = 0
+    cache_hit: bool = False
+    seconds: float = 0.0
+    stages: dict[str, StageStats] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "doc_id": self.doc_id,
+            "section_title": self.section_title,
+            "chars": self.chars,
+            "sentences": self.sentences,
+            "long_sentences": self.long_sentences,
+            "chunks": self.chunks,
+            "cache_hit": self.cache_hit,
+            "ms": round(self.seconds * 1000, 3),
+            "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+        }
+
+
+@dataclass
+class ChunkerProfile:
+    """Stage timings and counters collected while chunking; not thread-safe."""
+
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    sections: list[SectionProfile] = field(default_factory=list)
+    _current: SectionProfile | None = field(default=None, repr=False)
+
+    def begin_section(self, doc_id: str, section_title: str, chars: int) -> SectionProfile:
+        self._current = SectionProfile(doc_id=doc_id, section_title=section_title, chars=chars)
+        self.sections.append(self._current)
+        return self._current
+
+    def end_section(self, started: float, chunks: int) -> None:
+        section = self._current
+        if section is not None:
+            section.seconds = time.perf_counter() - started
+            section.chunks = chunks
+        self._current = None
+
+    def record(self, stage: str, started: float) -> None:
+        """Record one call of stage that began at perf_counter() value started."""
+        elapsed = time.perf_counter() - started
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        stats.add(elapsed)
+        if self._current is not None:
+            stats = self._current.stages.get(stage)
+            if stats is None:
+                stats = self._current.stages[stage] = StageStats()
+            stats.add(elapsed)
+
+    def count(self, **counters: int) -> None:
+        """Add to the current section's counters (sentences, long_sentences)."""
+        if self._current is not None:
+            for name, value in counters.items():
+                setattr(self._current, name, getattr(self._current, name) + value)
+
+    def mark_cache_hit(self) -> None:
+        if self._current is not None:
+            self._current.cache_hit = True
+
+    def papers(self) -> list[dict[str, Any]]:
+        """Return per-paper totals, in the order papers were first seen."""
+        papers: dict[str, dict[str, Any]] = {}
+        for section in self.sections:
+            paper = papers.setdefault(
+                section.doc_id,
+                {"doc_id": section.doc_id, "sections": 0, "chunks": 0, "cache_hits": 0, "seconds": 0.0},
+            )
+            paper["sections"] += 1
+            paper["chunks"] += section.chunks
+            paper["cache_hits"] += section.cache_hit
+            paper["seconds"] += section.seconds
+        return [
+            {**{k: v for k, v in p.items() if k != "seconds"}, "ms": round(p["seconds"] * 1000, 3)}
+            for p in papers.values()
+        ]
+
+    def to_dict(self, include_sections: bool = True) -> dict[str, Any]:
+        result = {
+            "total_ms": round(sum(s.seconds for s in self.sections) * 1000, 3),
+            "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+            "papers": self.papers(),
+        }
+        if include_sections:
+            result["sections"] = [s.to_dict() for s in self.sections]
+        return result
+
+    def summary(self) -> str:
+        """One-line summary for logs."""
+        total = sum(s.seconds for s in self.sections)
+        stages = ", ".join(
+            f"{name}={stats.seconds * 1000:.1f}ms/{stats.calls}" for name, stats in self.stages.items()
+        )
+        return f"chunked {len(self.sections)} sections in {total * 1000:.1f}ms ({stages})"
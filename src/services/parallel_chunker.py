@@ -0,0 +1,230 @@
+"""
+Process-pool engine for chunking many PMC articles with the biomedical chunker.
+
+Papers are fanned out to worker processes in small batches. Each worker loads
+the PubMedBERT tokenizer once (pool initializer) and keeps it for its lifetime,
+so re-chunking the whole corpus costs one tokenizer load per core instead of
+one Python loop on a single core.
+
+Results stream back in input order. Only a bounded window of batches is in
+flight at any time, so memory stays flat no matter how many papers are fed in.
+Workers return compact PaperChunks span records, so only the normalized
+section texts and a few integers per chunk cross the process boundary; chunk
+dicts are built in the parent, or not at all with compact=True.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Union
+
+from src.domain import PaperChunks
+from src.helpers.batching import batched
+from src.services.biomedical_chunker import (
+    MAX_CHUNK_TOKENS,
+    OVERLAP_TOKENS,
+    WORD_OVERLAP,
+    TOKENIZER_PATH_ENV,
+    _get_tokenizer,
+    chunk_paper_sections,
+    chunk_paper_spans,
+    load_tokenizer,
+)
+from src.services.chunk_cache import ChunkCache, get_chunk_cache
+
+# A job is either a PMC article dict or a path to its JSON file. Paths are
+# cheaper to ship to workers: only the path is pickled, the worker reads it.
+ArticleJob = Union[dict, str, Path]
+
+
+def article_sections(article: dict) -> dict[str, str]:
+    """Return an article's sections as a title -> text dict in section order."""
+    sections = article.get("sections", [])
+    return {
+        s["title"]: s.get("text", "") or ""
+        for s in sorted(sections, key=lambda x: x.get("order", 0))
+    }
+
+
+def chunk_article(
+    article: dict,
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+    cache: ChunkCache | None = None,
+) -> list[dict[str, Any]]:
+    """Chunk a single PMC article dict (the `pmc_articles/` JSON schema)."""
+    return chunk_paper_sections(
+        sections=article_sections(article),
+        doc_id=article.get("doc_id", ""),
+        doc_title=article.get("doc_title", ""),
+        source_url=article.get("source_url", ""),
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+        word_overlap=word_overlap,
+        cache=cache,
+    )
+
+
+def chunk_article_spans(
+    article: dict,
+    max_tokens: int = MAX_CHUNK_TOKENS,
+    overlap_tokens: int = OVERLAP_TOKENS,
+    word_overlap: int = WORD_OVERLAP,
+    cache: ChunkCache | None = None,
+) -> PaperChunks:
+    """Chunk a single PMC article dict into compact span records."""
+    return chunk_paper_spans(
+        sections=article_sections(article),
+        doc_id=article.get("doc_id", ""),
+        doc_title=article.get("doc_title", ""),
+        source_url=article.get("source_url", ""),
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+        word_overlap=word_overlap,
+        cache=cache,
+    )
+
+
+def _load_job(job: ArticleJob) -> dict:
+    if isinstance(job, dict):
+        return job
+    with Path(job).open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _init_worker(preload_tokenizer: bool, tokenizer_path: str | None = None) -> None:
+    """Pool initializer: load the tokenizer once per worker process."""
+    # One core per worker; the pool provides the parallelism.
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    if tokenizer_path:
+        # Also picked up by a lazy load when the cache defers it
+        os.environ[TOKENIZER_PATH_ENV] = tokenizer_path
+    # With a chunk cache, load lazily: a fully cached corpus never needs it
+    if preload_tokenizer:
+        _get_tokenizer()
+
+
+def _chunk_batch(
+    jobs: list[ArticleJob],
+    max_tokens: int,
+    overlap_tokens: int,
+    word_overlap: int,
+    cache_path: str | None = None,
+    cache_max_bytes: int = 0,
+) -> list[PaperChunks]:
+    cache = get_chunk_cache(cache_path, cache_max_bytes) if cache_path else None
+    return [
+        chunk_article_spans(
+            _load_job(job),
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            word_overlap=word_overlap,
+            cache=cache,
+        )
+        for job in jobs
+    ]
+
+
+class ParallelChunker:
+    """
+    Chunk PMC articles across a process pool.
+
+    - max_workers: worker processes (default: os.cpu_count()). 1 runs in-process.
+    - batch_size: papers sent to a worker per task; larger batches amortize IPC.
+    - max_tokens / overlap_tokens / word_overlap: passed to chunk_paper_sections.
+    - cache_path / cache_max_bytes: optional shared ChunkCache file; each worker
+      opens its own connection to it.
+    - compact: yield PaperChunks span records instead of chunk dict lists.
+    - tokenizer_path: local tokenizer.json for every worker (see load_tokenizer).
+
+    Usage:
+        chunker = ParallelChunker(max_workers=8)
+        for doc_id, chunks in chunker.chunk_files(paths):
+            ...
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        batch_size: int = 4,
+        max_tokens: int = MAX_CHUNK_TOKENS,
+        overlap_tokens: int = OVERLAP_TOKENS,
+        word_overlap: int = WORD_OVERLAP,
+        cache_path: str | None = None,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        compact: bool = False,
+        tokenizer_path: str | None = None,
+    ):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.word_overlap = word_overlap
+        self.cache_path = str(cache_path) if cache_path else None
+        self.cache_max_bytes = cache_max_bytes
+        self.compact = compact
+        self.tokenizer_path = str(tokenizer_path) if tokenizer_path else None
+
+    def chunk_articles(
+        self, jobs: Iterable[ArticleJob]
+    ) -> Iterator[tuple[str, list[dict[str, Any]] | PaperChunks]]:
+        """
+        Yield (doc_id, chunks) for each article dict or JSON path, in input order.
+
+        chunks is a list of chunk dicts, or a PaperChunks when compact=True.
+        """
+        for paper in self._chunk_papers(jobs):
+            yield paper.doc_id, paper if self.compact else paper.to_dicts()
+
+    def _chunk_papers(self, jobs: Iterable[ArticleJob]) -> Iterator[PaperChunks]:
+        batches = batched(jobs, self.batch_size)
+        params = (
+            self.max_tokens,
+            self.overlap_tokens,
+            self.word_overlap,
+            self.cache_path,
+            self.cache_max_bytes,
+        )
+
+        if self.max_workers == 1:
+            if self.tokenizer_path:
+                load_tokenizer(self.tokenizer_path)
+            for batch in batches:
+                yield from _chunk_batch(batch, *params)
+            return
+
+        # spawn: safe with the tokenizers thread pool and matches Windows behaviour
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.cache_path is None, self.tokenizer_path),
+        ) as pool:
+            # Keep every worker busy with one batch queued behind it
+            window = self.max_workers * 2
+            pending: deque[Future] = deque()
+            for batch in batches:
+                pending.append(pool.submit(_chunk_batch, batch, *params))
+                if len(pending) >= window:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def chunk_files(
+        self, paths: Iterable[Union[str, Path]]
+    ) -> Iterator[tuple[str, list[dict[str, Any]] | PaperChunks]]:
+        """Yield (doc_id, chunks) for each article JSON file, in input order."""
+        return self.chunk_articles(str(p) for p in paths)
+
+    def chunk_folder(
+        self, folder: Union[str, Path]
+    ) -> Iterator[tuple[str, list[dict[str, Any]] | PaperChunks]]:
+        """Yield (doc_id, chunks) for every `*.json` article in a folder, sorted by name."""
+        return self.chunk_files(sorted(Path(folder).glob("*.json")))
@@ -0,0 +1,243 @@
+"""
+Process-pool engine for bulk embedding with a local SentenceTransformer model.
+
+One Python process running encode() leaves most cores of a large node idle.
+Texts are fanned out to worker processes in batches; each worker loads the
+model once (pool initializer) through SentenceTransformersProvider, so token
+length bucketing and the ONNX backend work as they do in the API, and keeps
+it for its lifetime. Each worker gets threads_per_worker intra-op threads
+(torch or ONNX Runtime) and can be pinned to its own cores, so workers do not
+oversubscribe the CPU.
+
+Results stream back in input order. Only a bounded window of batches is in
+flight at any time, so memory stays flat no matter how many texts are fed
+in. Workers return float32 arrays, which pickle far smaller than lists.
+
+With max_workers=1, or if the pool cannot start or a worker dies, the
+remaining batches are embedded in-process.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from src.helpers.batching import batched
+from src.stores.llm.llm_enums import EmbeddingBackendEnums
+from src.stores.llm.providers import SentenceTransformersProvider
+
+logger = logging.getLogger(__name__)
+
+IN_PROCESS = "in-process"
+
+# Worker-process state, set by the pool initializer
+_PROVIDER: Optional[SentenceTransformersProvider] = None
+
+
+def _load_provider(
+    model_id: str,
+    backend: str,
+    onnx_dir: str | None,
+    threads: int | None,
+    encode_batch_size: int | None,
+) -> SentenceTransformersProvider:
+    if threads and backend == EmbeddingBackendEnums.TORCH.value:
+        import torch
+
+        torch.set_num_threads(threads)
+    provider = SentenceTransformersProvider(
+        openai_api_key="unused",
+        embedding_batch_size=encode_batch_size,
+        embedding_backend=backend,
+        onnx_model_dir=onnx_dir,
+        onnx_num_threads=threads,
+    )
+    provider.set_embedding_model(model_id, None)
+    return provider
+
+
+def _init_worker(
+    model_id: str,
+    backend: str,
+    onnx_dir: str | None,
+    threads: int | None,
+    encode_batch_size: int | None,
+    cpu_sets: list[list[int]] | None,
+    counter,
+) -> None:
+    """Pool initializer: pin threads (and cores), then load the model once per worker."""
+    global _PROVIDER
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    if threads:
+        # Before torch is imported, so its OpenMP pool is sized to match
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        os.environ["MKL_NUM_THREADS"] = str(threads)
+    if cpu_sets:
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        os.sched_setaffinity(0, cpu_sets[index % len(cpu_sets)])
+    _PROVIDER = _load_provider(model_id, backend, onnx_dir, threads, encode_batch_size)
+
+
+def _embed_with(provider: SentenceTransformersProvider, texts: list[str]) -> tuple:
+    """(vectors, failed indices, seconds); failed rows are left as zeros."""
+    started = time.perf_counter()
+    vectors = provider.embed_texts(texts) or [None] * len(texts)
+    failed = [i for i, vector in enumerate(vectors) if vector is None]
+    size = provider._embedding_size
+    array = np.zeros((len(texts), size), dtype=np.float32)
+    for i, vector in enumerate(vectors):
+        if vector is not None:
+            array[i] = vector
+    return array, failed, time.perf_counter() - started
+
+
+def _embed_batch(texts: list[str]) -> tuple:
+    return (os.getpid(), *_embed_with(_PROVIDER, texts))
+
+
+class ParallelEmbedder:
+    """
+    Embed texts with a local SentenceTransformer model across a process pool.
+
+    - model_id: SentenceTransformer model (or ONNX export with backend="onnx").
+    - max_workers: worker processes (default: os.cpu_count()). 1 runs in-process.
+    - threads_per_worker: intra-op threads per worker (default: cores / workers).
+    - pin_cpus: pin each worker to its own threads_per_worker cores (Linux only).
+    - batch_size: texts sent to a worker per task; larger batches amortize IPC
+      and give the token length bucketing more to work with.
+    - encode_batch_size: texts per forward pass at max sequence length
+      (SentenceTransformersProvider.embedding_batch_size).
+
+    Usage:
+        embedder = ParallelEmbedder("neuml/pubmedbert-base-embeddings", max_workers=8)
+        for vector in embedder.embed(texts):
+            ...
+        print(embedder.worker_stats())
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        max_workers: int | None = None,
+        threads_per_worker: int | None = None,
+        pin_cpus: bool = False,
+        batch_size: int = 256,
+        encode_batch_size: int | None = None,
+        backend: str = EmbeddingBackendEnums.TORCH.value,
+        onnx_dir: str | None = None,
+    ):
+        cpus = os.cpu_count() or 1
+        self.model_id = model_id
+        self.max_workers = max(1, max_workers or cpus)
+        self.threads_per_worker = max(1, threads_per_worker or cpus // self.max_workers)
+        self.pin_cpus = pin_cpus and hasattr(os, "sched_setaffinity")
+        self.batch_size = max(1, batch_size)
+        self.encode_batch_size = encode_batch_size
+        self.backend = backend
+        self.onnx_dir = str(onnx_dir) if onnx_dir else None
+
+        self.embedding_size: Optional[int] = None
+        self._provider: Optional[SentenceTransformersProvider] = None
+        self._stats: dict[str, dict] = {}
+
+    def embed(self, texts: Iterable[str]) -> Iterator[Optional[np.ndarray]]:
+        """Yield one float32 vector per text, in input order; None where embedding failed."""
+        for vectors, failed in self._embed_batches(batched(texts, self.batch_size)):
+            failed = set(failed)
+            for i, vector in enumerate(vectors):
+                yield None if i in failed else vector
+
+    def _embed_batches(self, batches: Iterator[list[str]]) -> Iterator[tuple[np.ndarray, list[int]]]:
+        if self.max_workers == 1:
+            yield from self._embed_in_process(batches)
+            return
+
+        # spawn: safe with torch/tokenizers thread pools and matches Windows behaviour
+        ctx = multiprocessing.get_context("spawn")
+        pending: deque[tuple[list[str], Future]] = deque()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=ctx,
+                initializer=_init_worker,
+                initargs=(
+                    self.model_id,
+                    self.backend,
+                    self.onnx_dir,
+                    self.threads_per_worker,
+                    self.encode_batch_size,
+                    self._cpu_sets(),
+                    ctx.Value("i", 0),
+                ),
+            ) as pool:
+                # Keep every worker busy with one batch queued behind it
+                window = self.max_workers * 2
+                for batch in batches:
+                    pending.append((batch, pool.submit(_embed_batch, batch)))
+                    if len(pending) >= window:
+                        yield self._collect(pending)
+                while pending:
+                    yield self._collect(pending)
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(
+                f"Embedding pool failed ({e}); embedding the remaining batches in-process"
+            )
+            yield from self._embed_in_process(chain((batch for batch, _ in pending), batches))
+
+    def _collect(self, pending: deque) -> tuple[np.ndarray, list[int]]:
+        # Leave the batch queued until it succeeded, so a pool failure can redo it
+        _, future = pending[0]
+        pid, vectors, failed, seconds = future.result()
+        pending.popleft()
+        self._record(f"pid {pid}", len(vectors), seconds, vectors)
+        return vectors, failed
+
+    def _embed_in_process(self, batches: Iterable[list[str]]) -> Iterator[tuple[np.ndarray, list[int]]]:
+        if self._provider is None:
+            self._provider = _load_provider(
+                self.model_id, self.backend, self.onnx_dir, self.threads_per_worker, self.encode_batch_size
+            )
+        for batch in batches:
+            vectors, failed, seconds = _embed_with(self._provider, batch)
+            self._record(IN_PROCESS, len(batch), seconds, vectors)
+            yield vectors, failed
+
+    def _record(self, worker: str, texts: int, seconds: float, vectors: np.ndarray) -> None:
+        self.embedding_size = vectors.shape[1]
+        stats = self._stats.setdefault(worker, {"batches": 0, "texts": 0, "busy_seconds": 0.0})
+        stats["batches"] += 1
+        stats["texts"] += texts
+        stats["busy_seconds"] += seconds
+
+    def _cpu_sets(self) -> list[list[int]] | None:
+        if not self.pin_cpus:
+            return None
+        cpus = sorted(os.sched_getaffinity(0))
+        return [
+            [cpus[(w * self.threads_per_worker + t) % len(cpus)] for t in range(self.threads_per_worker)]
+            for w in range(self.max_workers)
+        ]
+
+    def worker_stats(self) -> list[dict]:
+        """Texts, batches and throughput (texts per busy second) of each worker so far."""
+        return [
+            {
+                "worker": worker,
+                "batches": stats["batches"],
+                "texts": stats["texts"],
+                "busy_seconds": round(stats["busy_seconds"], 3),
+                "texts_per_s": round(stats["texts"] / stats["busy_seconds"], 1) if stats["busy_seconds"] else 0.0,
+            }
+            for worker, stats in self._stats.items()
+        ]
@@ -0,0 +1,117 @@
+"""
+Scientific sentence segmenter for the biomedical chunker.
+
+Finds sentence boundaries in one pass and returns (start, end) character
+offsets, so callers slice sentences out of the text instead of rebuilding them.
+
+A boundary is `.`, `!` or `?` followed by whitespace and an uppercase letter.
+A `.` boundary is rejected when the word it ends is a known abbreviation
+(Fig., et al., e.g., ...). Periods inside numbers (0.05, p < .05, 1.2.3) are
+never followed by whitespace, so they can never be boundaries; no placeholder
+substitution is needed.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+# Abbreviations that are usually followed by a capitalized word and must not
+# end a sentence. Matched case-insensitively against the word before the
+# period; multi-word entries ("et al") match the last words before it.
+DEFAULT_ABBREVIATIONS = (
+    # Citations and cross-references
+    "et al", "fig", "figs", "eq", "eqs", "ref", "refs", "tab", "suppl",
+    "sect", "ch", "vol", "no", "nos", "pp", "cf", "ca", "approx", "vs",
+    # Latin
+    "e.g", "i.e", "viz", "resp",
+    # Statistics written with periods
+    "c.i", "o.r", "h.r", "r.r", "s.d", "s.e", "s.e.m",
+    # Titles
+    "dr", "mr", "mrs", "ms", "prof", "st", "jr", "sr",
+)
+
+# Candidate boundary: sentence punctuation, whitespace, then an uppercase letter
+_BOUNDARY_RE = re.compile(r"[.!?](?=\s+[A-Z])")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Opening punctuation that may precede an abbreviation, e.g. "(Fig. 2"
+_LEADING_PUNCT = "([{\"'"
+
+
+class SentenceSegmenter:
+    """
+    Offset-based sentence segmenter with an extensible abbreviation table.
+
+    Usage:
+        segmenter = SentenceSegmenter()
+        segmenter.add_abbreviations("Tx", "Dept")
+        for start, end in segmenter.spans(text):
+            sentence = text[start:end]
+    """
+
+    def __init__(self, abbreviations: Iterable[str] = DEFAULT_ABBREVIATIONS):
+        # Single words, and multi-word entries indexed by their last word
+        self._words: set[str] = set()
+        self._phrases: dict[str, set[tuple[str, ...]]] = {}
+        self.add_abbreviations(*abbreviations)
+
+    def add_abbreviations(self, *abbreviations: str) -> None:
+        """Add abbreviations (without the trailing period) to the table."""
+        for abbreviation in abbreviations:
+            words = tuple(abbreviation.lower().rstrip(".").split())
+            if len(words) == 1:
+                self._words.add(words[0])
+            elif words:
+                self._phrases.setdefault(words[-1], set()).add(words[:-1])
+
+    def _is_abbreviation(self, text: str, period: int) -> bool:
+        word_start = text.rfind(" ", 0, period) + 1
+        word = text[word_start:period].lstrip(_LEADING_PUNCT).lower()
+        if word in self._words:
+            return True
+        prefixes = self._phrases.get(word)
+        if not prefixes:
+            return False
+        for prefix in prefixes:
+            start = word_start - 1
+            for expected in reversed(prefix):
+                prev_start = text.rfind(" ", 0, start) + 1
+                if text[prev_start:start].lower() != expected:
+                    break
+                start = prev_start - 1
+            else:
+                return True
+        return False
+
+    def spans(self, text: str) -> list[tuple[int, int]]:
+        """
+        Return (start, end) offsets of the sentences in text.
+
+        Text must be whitespace-normalized (stripped, single spaces); sentences
+        exclude the separating space.
+        """
+        spans = []
+        start = 0
+        for m in _BOUNDARY_RE.finditer(text):
+            end = m.end()
+            if text[m.start()] == "." and self._is_abbreviation(text, m.start()):
+                continue
+            if end > start:
+                spans.append((start, end))
+            start = end + 1
+        if start < len(text):
+            spans.append((start, len(text)))
+        return spans
+
+    def split(self, text: str) -> list[str]:
+        """Normalize whitespace in text and return its sentences."""
+        text = _WHITESPACE_RE.sub(" ", text.strip())
+        return [text[start:end] for start, end in self.spans(text)]
+
+
+_DEFAULT_SEGMENTER = SentenceSegmenter()
+
+
+def get_sentence_segmenter() -> SentenceSegmenter:
+    """Return the shared segmenter used by the chunker; add abbreviations to it to extend chunking."""
+    return _DEFAULT_SEGMENTER
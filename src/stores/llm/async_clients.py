@@ -0,0 +1,60 @@
+"""
+Shared HTTP connection pool and concurrency cap for async LLM calls.
+
+Every AsyncOpenAI / cohere.AsyncClient created by the providers sends its
+requests through one httpx.AsyncClient, so connections (and their TLS
+handshakes) are reused across requests. A process-wide semaphore caps how many
+provider calls are in flight at once.
+
+The app lifespan calls configure_async_clients() at startup and
+close_async_clients() at shutdown; without configure, defaults are used.
+"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+_DEFAULT_MAX_CONCURRENCY = 16
+_DEFAULT_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_max_concurrency = _DEFAULT_MAX_CONCURRENCY
+_http_client: Optional[httpx.AsyncClient] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def configure_async_clients(max_concurrency: int = _DEFAULT_MAX_CONCURRENCY) -> None:
+    """Set the in-flight call cap; the pool keeps a few spare connections above it."""
+    global _max_concurrency, _semaphore
+    _max_concurrency = max(1, max_concurrency)
+    _semaphore = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the shared httpx.AsyncClient, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=_DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=_max_concurrency * 2,
+                max_keepalive_connections=_max_concurrency,
+            ),
+        )
+    return _http_client
+
+
+def llm_call_slot() -> asyncio.Semaphore:
+    """Semaphore to hold while a provider call is in flight."""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(_max_concurrency)
+    return _semaphore
+
+
+async def close_async_clients() -> None:
+    global _http_client, _semaphore
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _semaphore = None
@@ -0,0 +1,139 @@
+"""Shared batching for LLMInterface.embed_texts implementations."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from src.helpers.batching import batched, packed
+
+from .rate_limiter import is_retryable_error
+
+# One provider call: embed a list of texts, return one vector per text (or None on failure)
+EmbedBatchFn = Callable[[list[str]], Optional[list[list[float]]]]
+AsyncEmbedBatchFn = Callable[[list[str]], Awaitable[Optional[list[list[float]]]]]
+
+
+def embed_in_batches(
+    texts: list[str],
+    batch_size: int,
+    embed_batch: EmbedBatchFn,
+    logger: logging.Logger,
+) -> list[Optional[list[float]]]:
+    """
+    Embed texts with one embed_batch call per batch_size texts.
+
+    Returns one vector per input text, in input order. Items that could not be
+    embedded are None: empty texts are never sent, and when a batch call fails
+    its texts are retried one at a time, so only the texts that really fail
+    are None. A batch that failed on throttling or a transient error is not
+    split: that would only multiply calls to a provider that is already
+    refusing them.
+    """
+    vectors: list[Optional[list[float]]] = [None] * len(texts)
+    indices = [i for i, text in enumerate(texts) if text and str(text).strip()]
+
+    for batch in batched(indices, max(1, batch_size)):
+        result, splittable = _call(embed_batch, [texts[i] for i in batch], logger)
+        if result is not None and len(result) == len(batch):
+            for i, vector in zip(batch, result):
+                vectors[i] = vector
+            continue
+        if len(batch) == 1 or not splittable:
+            continue
+        logger.warning(f"Embedding batch of {len(batch)} texts failed; retrying one by one")
+        for i in batch:
+            result, _ = _call(embed_batch, [texts[i]], logger)
+            if result:
+                vectors[i] = result[0]
+
+    _log_failed(vectors, logger)
+    return vectors
+
+
+async def embed_in_batches_async(
+    texts: list[str],
+    batch_size: int,
+    embed_batch: AsyncEmbedBatchFn,
+    logger: logging.Logger,
+    max_batch_tokens: Optional[int] = None,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> list[Optional[list[float]]]:
+    """
+    Async embed_in_batches: all batches are sent concurrently (the provider
+    caps in-flight calls), with the same result and retry semantics.
+
+    With max_batch_tokens and count_tokens, batches are also packed so their
+    summed token count stays under the provider's per-request token limit.
+    """
+    vectors: list[Optional[list[float]]] = [None] * len(texts)
+    indices = [i for i, text in enumerate(texts) if text and str(text).strip()]
+
+    async def run(batch: list[int]) -> None:
+        result, splittable = await _call_async(embed_batch, [texts[i] for i in batch], logger)
+        if result is not None and len(result) == len(batch):
+            for i, vector in zip(batch, result):
+                vectors[i] = vector
+            return
+        if len(batch) == 1 or not splittable:
+            return
+        logger.warning(f"Embedding batch of {len(batch)} texts failed; retrying one by one")
+        await asyncio.gather(*(run([i]) for i in batch))
+
+    if max_batch_tokens and count_tokens:
+        costs = [count_tokens(texts[i]) for i in indices]
+        batches = packed(indices, costs, max(1, batch_size), max_batch_tokens)
+    else:
+        batches = batched(indices, max(1, batch_size))
+
+    await asyncio.gather(*(run(batch) for batch in batches))
+    _log_failed(vectors, logger)
+    return vectors
+
+
+def token_budget_batches(lengths: list[int], max_batch_tokens: int, max_batch_size: int) -> list[list[int]]:
+    """
+    Group text indices into batches of similar token length for padded encoders.
+
+    Indices are sorted by length and each batch grows while its padded size
+    (count x longest member) stays within max_batch_tokens, so short texts go
+    in large batches and long ones in small batches. Returns lists of
+    indices into lengths; callers scatter results back to input order.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    for i in order:
+        # Sorted ascending, so the new item is the batch's longest
+        if batch and (len(batch) >= max_batch_size or (len(batch) + 1) * lengths[i] > max_batch_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _log_failed(vectors: list, logger: logging.Logger) -> None:
+    failed = [i for i, vector in enumerate(vectors) if vector is None]
+    if failed:
+        logger.error(f"Embedding failed for {len(failed)} of {len(vectors)} texts at indices {failed}")
+
+
+# Both return (vectors or None, whether retrying the texts one by one may help):
+# an invalid input fails its whole batch, but a throttled or transient error
+# would just fail again for each text
+
+async def _call_async(embed_batch: AsyncEmbedBatchFn, texts: list[str], logger: logging.Logger):
+    try:
+        return await embed_batch(texts), True
+    except Exception as e:
+        logger.error(f"Error while embedding {len(texts)} texts: {e}")
+        return None, not is_retryable_error(e)
+
+
+def _call(embed_batch: EmbedBatchFn, texts: list[str], logger: logging.Logger):
+    try:
+        return embed_batch(texts), True
+    except Exception as e:
+        logger.error(f"Error while embedding {len(texts)} texts: {e}")
+        return None, not is_retryable_error(e)
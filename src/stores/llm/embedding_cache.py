@@ -0,0 +1,81 @@
+"""
+Persistent cache of text embeddings.
+
+Entries are keyed by (provider, model_id, dimensions, document_type,
+sha256(text)), where provider also names a non-default SentenceTransformers
+backend ("SENTENCE_TRANSFORMERS@onnx"), so re-ingesting the same chunk text into another collection,
+with other chunk params that reproduce it, or replaying a failed ingest never
+pays for the same embedding twice. Vectors are stored as float32 or float16
+blobs in a size-bounded LRU SQLite file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from src.helpers.sqlite_lru_cache import SqliteLRUCache
+
+from .llm_enums import DocumentTypeEnum
+
+# First byte of every stored value names its dtype, so changing the cache
+# dtype never misreads older entries
+_DTYPE_CODES = {"float32": b"4", "float16": b"2"}
+_CODE_DTYPES = {code: np.dtype(name) for name, code in _DTYPE_CODES.items()}
+
+
+def _document_type_value(document_type) -> str:
+    # Providers embed document_type=None as a document
+    if isinstance(document_type, Enum):
+        return document_type.value
+    return document_type or DocumentTypeEnum.DOCUMENT.value
+
+
+class EmbeddingCache(SqliteLRUCache):
+    """
+    SQLite-backed, size-bounded LRU cache of embedding vectors.
+
+    - dtype: "float32" (exact) or "float16" (half the disk, ~3 significant digits)
+    """
+
+    TABLE = "embeddings"
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 1024 * 1024 * 1024, dtype: str = "float32"):
+        if dtype not in _DTYPE_CODES:
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        super().__init__(path, max_bytes)
+        self.dtype = dtype
+
+    @staticmethod
+    def make_key(provider: str, model_id: str, dimensions: Optional[int], document_type, text: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{provider}:{model_id}:{dimensions}:{_document_type_value(document_type)}:{text_hash}"
+
+    def _encode(self, vector) -> bytes:
+        return _DTYPE_CODES[self.dtype] + np.asarray(vector, dtype=self.dtype).tobytes()
+
+    @staticmethod
+    def _decode(value: bytes) -> list[float]:
+        dtype = _CODE_DTYPES[value[:1]]
+        return np.frombuffer(value[1:], dtype=dtype).astype(np.float32).tolist()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return {key: vector} for the cached keys."""
+        return {key: self._decode(value) for key, value in self.get_many_bytes(keys).items()}
+
+    def put_many(self, items: list[tuple[str, list[float]]]) -> None:
+        self.put_many_bytes((key, self._encode(vector)) for key, vector in items)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "dtype": self.dtype}
+
+
+@lru_cache(maxsize=None)
+def get_embedding_cache(path: str, max_bytes: int, dtype: str = "float32") -> EmbeddingCache:
+    """Return the process-wide EmbeddingCache for path, opening it on first use."""
+    return EmbeddingCache(path, max_bytes=max_bytes, dtype=dtype)
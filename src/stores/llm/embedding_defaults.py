@@ -8,3 +8,36 @@ EMBEDDING_DEFAULTS = {
 
 # Map embedding dimension -> provider (for auto-detect from collection)
 DIMENSION_TO_PROVIDER = {size: provider for provider, (_, size) in EMBEDDING_DEFAULTS.items()}
+
+# OpenAI v3 models return shortened vectors (e.g. 256, 512, 1024) via the
+# `dimensions` parameter; native sizes
+OPENAI_DIMENSIONS_MODELS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+}
+
+# Collection metadata recording how its vectors were embedded, so queries
+# embed with the same model and size
+COLLECTION_EMBEDDING_PROVIDER = "embedding_provider"
+COLLECTION_EMBEDDING_MODEL = "embedding_model"
+COLLECTION_EMBEDDING_SIZE = "embedding_size"
+
+
+def collection_embedding_metadata(provider: str, model_id: str, embedding_size: int) -> dict:
+    return {
+        COLLECTION_EMBEDDING_PROVIDER: provider,
+        COLLECTION_EMBEDDING_MODEL: model_id,
+        COLLECTION_EMBEDDING_SIZE: embedding_size,
+    }
+
+
+def embedding_from_collection_metadata(metadata: dict | None) -> tuple | None:
+    """(provider, model_id, embedding_size) recorded on a collection, or None for older collections."""
+    if not metadata:
+        return None
+    provider = metadata.get(COLLECTION_EMBEDDING_PROVIDER)
+    model_id = metadata.get(COLLECTION_EMBEDDING_MODEL)
+    size = metadata.get(COLLECTION_EMBEDDING_SIZE)
+    if not provider or not model_id or not size:
+        return None
+    return provider, model_id, int(size)
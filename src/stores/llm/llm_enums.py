@@ -5,6 +5,11 @@ class LLMEnums(Enum):
     COHERE = "COHERE"
     SENTENCE_TRANSFORMERS = "SENTENCE_TRANSFORMERS"
 
+class EmbeddingBackendEnums(Enum):
+    # Runtime for SentenceTransformers embeddings
+    TORCH = "torch"
+    ONNX = "onnx"
+
 class OpenAIEnums(Enum):
     SYSTEM = "system"
     USER = "user"
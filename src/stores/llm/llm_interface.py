@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class LLMInterface(ABC):
@@ -19,6 +20,27 @@ class LLMInterface(ABC):
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    def embed_texts(self, texts: list, document_type: str = None):
+        """Return one embedding per text, in order; items that failed are None."""
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
+
+    # Async variants for use inside async endpoints. Providers with an async
+    # client override them; the defaults run the sync call in a worker thread
+    # so the event loop is never blocked.
+
+    async def embed_text_async(self, text: str, document_type: str = None):
+        return await asyncio.to_thread(self.embed_text, text, document_type)
+
+    async def embed_texts_async(self, texts: list, document_type: str = None):
+        return await asyncio.to_thread(self.embed_texts, texts, document_type)
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None, **kwargs):
+        return await asyncio.to_thread(
+            self.generate_text, prompt, chat_history, max_output_tokens, temperature, **kwargs
+        )
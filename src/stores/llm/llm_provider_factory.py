@@ -1,5 +1,8 @@
-from .llm_enums import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider, SentenceTransformersProvider
+from src.controllers.base_controller import BaseController
+
+from .llm_enums import EmbeddingBackendEnums, LLMEnums
+from .embedding_cache import get_embedding_cache
+from .providers import OpenAIProvider, CoHereProvider, SentenceTransformersProvider, CachedEmbeddingProvider
 
 
 class LLMProviderFactory:
@@ -7,13 +10,35 @@ class LLMProviderFactory:
         self.config = config
 
     def create(self, provider: str):
+        llm = self._create(provider)
+        cache_path = getattr(self.config, "EMBEDDING_CACHE_PATH", None)
+        if llm is None or not cache_path:
+            return llm
+        # Consult the persistent embedding cache before calling the provider
+        cache = get_embedding_cache(
+            BaseController().get_database_path(db_name=cache_path),
+            self.config.EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+            self.config.EMBEDDING_CACHE_DTYPE,
+        )
+        return CachedEmbeddingProvider(llm, self._cache_provider_name(provider), cache)
+
+    def _cache_provider_name(self, provider: str) -> str:
+        # The int8 ONNX backend's vectors differ from torch's: key them apart
+        # (torch keeps the bare name, so existing entries stay valid)
+        backend = self.config.EMBEDDING_BACKEND
+        if provider == LLMEnums.SENTENCE_TRANSFORMERS.value and backend != EmbeddingBackendEnums.TORCH.value:
+            return f"{provider}@{backend}"
+        return provider
+
+    def _create(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
             return OpenAIProvider(
                 api_key = self.config.OPENAI_API_KEY,
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_batch_size=self.config.EMBEDDING_BATCH_SIZE,
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -21,7 +46,8 @@ class LLMProviderFactory:
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_batch_size=self.config.EMBEDDING_BATCH_SIZE,
             )
 
         if provider == LLMEnums.SENTENCE_TRANSFORMERS.value:
@@ -30,7 +56,11 @@ class LLMProviderFactory:
                 openai_api_url=self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_batch_size=self.config.EMBEDDING_BATCH_SIZE,
+                embedding_backend=self.config.EMBEDDING_BACKEND,
+                onnx_model_dir=BaseController().get_database_path(db_name=self.config.EMBEDDING_ONNX_DIR),
+                onnx_num_threads=self.config.EMBEDDING_ONNX_THREADS or None,
             )
 
         return None
@@ -0,0 +1,147 @@
+"""
+Process-wide registry of loaded SentenceTransformer models.
+
+Loading a model (e.g. the ~400MB PubMedBERT checkpoint) takes seconds, so each
+model id is loaded once per process and shared by every provider instance and
+request. A model is loaded with one of two backends: "torch" (the
+SentenceTransformer itself) or "onnx" (an OnnxSentenceEmbedder over the export
+made by src/cli/export_onnx.py); both expose the same encode() API. Lookups of a loaded model take no lock; a per-model lock makes sure
+concurrent first requests for the same model load it only once, while other
+models stay available.
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from .llm_enums import EmbeddingBackendEnums
+from .onnx_embedder import OnnxSentenceEmbedder, onnx_model_dir
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SentenceTransformerRegistry:
+
+    def __init__(self):
+        self._models: dict[str, Any] = {}
+        self._stats: dict[str, dict] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _key(model_id: str, backend: str) -> str:
+        if backend == EmbeddingBackendEnums.TORCH.value:
+            return model_id
+        return f"{model_id}@{backend}"
+
+    def get(self, model_id: str, backend: str = EmbeddingBackendEnums.TORCH.value,
+            onnx_dir: Optional[str] = None, num_threads: Optional[int] = None):
+        """
+        Return the shared model for model_id on the given backend, loading it on first use.
+
+        - onnx_dir: root of the ONNX exports (onnx backend only)
+        - num_threads: ONNX Runtime intra-op threads (onnx backend only)
+        """
+        key = self._key(model_id, backend)
+        model = self._models.get(key)
+        if model is not None:
+            self._stats[key]["hits"] += 1
+            return model
+        with self._lock_for(key):
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(key, model_id, backend, onnx_dir, num_threads)
+            else:
+                self._stats[key]["hits"] += 1
+        return model
+
+    def _load(self, key: str, model_id: str, backend: str, onnx_dir: Optional[str], num_threads: Optional[int]):
+        rss_before = _peak_rss_bytes()
+        started = time.perf_counter()
+        if backend == EmbeddingBackendEnums.ONNX.value:
+            if not onnx_dir:
+                raise ValueError("The onnx embedding backend needs the ONNX export directory")
+            model = OnnxSentenceEmbedder(onnx_model_dir(onnx_dir, model_id), num_threads=num_threads)
+        elif backend == EmbeddingBackendEnums.TORCH.value:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(model_id)
+        else:
+            raise ValueError(f"Unsupported embedding backend: {backend}")
+        load_seconds = time.perf_counter() - started
+        rss_after = _peak_rss_bytes()
+
+        param_bytes = getattr(model, "model_bytes", None)
+        try:
+            param_bytes = param_bytes or sum(p.numel() * p.element_size() for p in model.parameters())
+        except Exception:
+            pass
+
+        self._stats[key] = {
+            "model_id": model_id,
+            "backend": backend,
+            "load_seconds": round(load_seconds, 3),
+            "param_mb": round(param_bytes / (1024 * 1024), 1) if param_bytes is not None else None,
+            # Growth of the process peak RSS during the load; 0 if an earlier peak was higher
+            "peak_rss_delta_mb": (
+                round((rss_after - rss_before) / (1024 * 1024), 1) if rss_before is not None else None
+            ),
+            "embedding_size": model.get_sentence_embedding_dimension(),
+            "hits": 0,
+        }
+        self._models[key] = model
+        logger.info(f"Loaded SentenceTransformer {model_id} ({backend}) in {load_seconds:.2f}s")
+        return model
+
+    def preload(self, model_ids: Iterable[str], backend: str = EmbeddingBackendEnums.TORCH.value,
+                onnx_dir: Optional[str] = None, num_threads: Optional[int] = None) -> list[dict]:
+        """Load models up front (e.g. at app startup) and return their stats."""
+        return [
+            self.stats_for(model_id, backend)
+            for model_id in model_ids
+            if self.get(model_id, backend, onnx_dir, num_threads) is not None
+        ]
+
+    def is_loaded(self, model_id: str, backend: str = EmbeddingBackendEnums.TORCH.value) -> bool:
+        return self._key(model_id, backend) in self._models
+
+    def stats_for(self, model_id: str, backend: str = EmbeddingBackendEnums.TORCH.value) -> Optional[dict]:
+        stats = self._stats.get(self._key(model_id, backend))
+        return dict(stats) if stats else None
+
+    def stats(self) -> list[dict]:
+        """Load time, memory and hit count of every loaded model."""
+        return [dict(stats) for stats in self._stats.values()]
+
+    def unload(self, model_id: str, backend: str = EmbeddingBackendEnums.TORCH.value) -> None:
+        key = self._key(model_id, backend)
+        with self._lock_for(key):
+            self._models.pop(key, None)
+            self._stats.pop(key, None)
+
+
+_REGISTRY = SentenceTransformerRegistry()
+
+
+def get_model_registry() -> SentenceTransformerRegistry:
+    """Return the process-wide SentenceTransformer registry."""
+    return _REGISTRY
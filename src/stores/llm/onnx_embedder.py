@@ -0,0 +1,136 @@
+"""
+ONNX Runtime embedding backend for SentenceTransformer models.
+
+Runs a transformer exported (and usually int8 dynamically quantized) by
+src/cli/export_onnx.py, then applies the same mean pooling and optional
+normalization as the SentenceTransformer pipeline it came from. On CPU-only
+nodes this is much cheaper than PyTorch inference.
+
+An export directory holds:
+- model_int8.onnx (or model.onnx when exported without quantization)
+- tokenizer.json, the model's fast tokenizer
+- embedder_config.json: model_id, max_seq_length, embedding_size, normalize
+
+OnnxSentenceEmbedder.encode() mirrors SentenceTransformer.encode() for the
+arguments the providers use, so the model registry can hand out either one.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+CONFIG_FILE = "embedder_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+MODEL_FILE = "model.onnx"
+
+
+def onnx_model_dir(root: Union[str, Path], model_id: str) -> Path:
+    """Export directory of model_id under root, e.g. onnx_models/neuml__pubmedbert-base-embeddings."""
+    return Path(root) / model_id.replace("/", "__")
+
+
+class OnnxSentenceEmbedder:
+    """
+    Mean-pooled sentence embeddings from an exported ONNX transformer.
+
+    - num_threads: intra-op threads for the session; None uses the ONNX Runtime default
+    """
+
+    def __init__(self, model_dir: Union[str, Path], num_threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        with open(self.model_dir / CONFIG_FILE, "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+
+        self.model_path = self.model_dir / QUANTIZED_MODEL_FILE
+        if not self.model_path.exists():
+            self.model_path = self.model_dir / MODEL_FILE
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            str(self.model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        self.max_seq_length = self.config["max_seq_length"]
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(
+            pad_id=self.config.get("pad_token_id", 0), pad_token=self.config.get("pad_token", "[PAD]")
+        )
+
+    @property
+    def model_bytes(self) -> int:
+        return os.path.getsize(self.model_path)
+
+    def token_lengths(self, texts: list[str]) -> list[int]:
+        """Tokens per text after truncation, without padding."""
+        return [sum(e.attention_mask) for e in self.tokenizer.encode_batch(texts)]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["embedding_size"]
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        """Embed sentences (str or list of str); returns float32 arrays like SentenceTransformer.encode."""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Longest first, as SentenceTransformer does, so batches pad little
+        order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+        embeddings = np.empty((len(sentences), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        for start in range(0, len(order), max(1, batch_size)):
+            batch = order[start:start + batch_size]
+            embeddings[batch] = self._embed_batch([sentences[i] for i in batch])
+
+        if normalize_embeddings and not self.config.get("normalize"):
+            embeddings = _l2_normalize(embeddings)
+        return embeddings[0] if single else embeddings
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {name: value for name, value in feeds.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean over real tokens, as sentence_transformers.models.Pooling(mean)
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config.get("normalize"):
+            pooled = _l2_normalize(pooled)
+        return pooled.astype(np.float32)
+
+
+def _l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def embedding_parity(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    """Row-wise cosine similarity between two embedding matrices of the same texts."""
+    reference = _l2_normalize(np.asarray(reference, dtype=np.float32))
+    candidate = _l2_normalize(np.asarray(candidate, dtype=np.float32))
+    cosines = (reference * candidate).sum(axis=1)
+    return {
+        "texts": int(len(cosines)),
+        "min_cosine": float(cosines.min()) if len(cosines) else None,
+        "mean_cosine": float(cosines.mean()) if len(cosines) else None,
+    }
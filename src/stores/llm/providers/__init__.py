@@ -1,3 +1,4 @@
 from .cohere_provider import CoHereProvider
 from .openai_provider import OpenAIProvider
 from .sentence_transformers_provider import SentenceTransformersProvider
+from .cached_embedding_provider import CachedEmbeddingProvider
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+
+from ..llm_interface import LLMInterface
+from ..embedding_cache import EmbeddingCache
+
+
+class CachedEmbeddingProvider(LLMInterface):
+    """
+    Wraps any LLMInterface provider with a persistent EmbeddingCache.
+
+    embed_text / embed_texts look every text up in the cache first and only
+    send the misses to the wrapped provider; new vectors are written back.
+    Generation and everything else is delegated unchanged.
+    """
+
+    def __init__(self, provider: LLMInterface, provider_name: str, cache: EmbeddingCache):
+        self.provider = provider
+        self.provider_name = provider_name
+        self.cache = cache
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set here, e.g. provider defaults
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    @property
+    def default_input_max_characters(self) -> int:
+        return self.provider.default_input_max_characters
+
+    @default_input_max_characters.setter
+    def default_input_max_characters(self, value: int):
+        # Routes tune this on the llm they are given; it must reach the provider
+        self.provider.default_input_max_characters = value
+
+    def set_generation_model(self, model_id: str):
+        self.provider.set_generation_model(model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.provider.set_embedding_model(model_id, embedding_size)
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None, **kwargs):
+        return self.provider.generate_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            **kwargs,
+        )
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None, **kwargs):
+        return await self.provider.generate_text_async(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            **kwargs,
+        )
+
+    def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_texts([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        keys, vectors, missing = self._lookup(texts, document_type)
+        if not missing:
+            return vectors
+
+        embedded = self.provider.embed_texts([texts[i] for i in missing], document_type=document_type)
+        return self._store(keys, vectors, missing, embedded)
+
+    async def embed_text_async(self, text: str, document_type: str = None):
+        vectors = await self.embed_texts_async([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    async def embed_texts_async(self, texts: list, document_type: str = None):
+        # Cache reads and writes are SQLite I/O (hits update recency and
+        # commit); keep them off the event loop
+        keys, vectors, missing = await asyncio.to_thread(self._lookup, texts, document_type)
+        if not missing:
+            return vectors
+
+        embedded = await self.provider.embed_texts_async(
+            [texts[i] for i in missing], document_type=document_type
+        )
+        return await asyncio.to_thread(self._store, keys, vectors, missing, embedded)
+
+    def _lookup(self, texts: list, document_type):
+        """Return (keys, vectors with None for misses, indices of the misses)."""
+        keys = [
+            self.cache.make_key(
+                self.provider_name, self.embedding_model_id, self.embedding_size, document_type, text or ""
+            )
+            for text in texts
+        ]
+        try:
+            cached = self.cache.get_many(keys)
+        except Exception as e:
+            self.logger.warning(f"Embedding cache lookup failed, embedding all texts: {e}")
+            cached = {}
+
+        vectors = [cached.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        return keys, vectors, missing
+
+    def _store(self, keys: list, vectors: list, missing: list, embedded):
+        if embedded is None:
+            return None
+
+        new_entries = []
+        for i, vector in zip(missing, embedded):
+            if vector is not None:
+                vectors[i] = vector
+                new_entries.append((keys[i], vector))
+        try:
+            self.cache.put_many(new_entries)
+        except Exception as e:
+            self.logger.warning(f"Embedding cache write failed: {e}")
+        return vectors
+
+    def construct_prompt(self, prompt: str, role: str, **kwargs):
+        return self.provider.construct_prompt(prompt=prompt, role=role, **kwargs)
@@ -3,15 +3,24 @@ import logging
 import cohere
 
 from ..llm_interface import LLMInterface
-from ..llm_enums import CoHereEnums, DocumentTypeEnum
+from ..llm_enums import CoHereEnums, DocumentTypeEnum, LLMEnums
+from ..embedding_batches import embed_in_batches, embed_in_batches_async
+from ..async_clients import get_async_http_client, llm_call_slot
+from ..rate_limiter import estimate_tokens, get_rate_limit_scheduler
 
 
 class CoHereProvider(LLMInterface):
 
+    # Cohere embed accepts at most 96 texts per request
+    EMBEDDING_MAX_BATCH_SIZE = 96
+    # Retries are left to the rate limit scheduler
+    _NO_SDK_RETRIES = {"max_retries": 0}
+
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       embedding_batch_size: int=None):
         
         self.api_key = api_key
 
@@ -23,11 +32,22 @@ class CoHereProvider(LLMInterface):
 
         self.embedding_model_id = None
         self.embedding_size = None
+        self.embedding_batch_size = min(
+            embedding_batch_size or self.EMBEDDING_MAX_BATCH_SIZE, self.EMBEDDING_MAX_BATCH_SIZE
+        )
 
         self.client = cohere.Client(api_key=self.api_key)
+        self._async_client = None
 
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def async_client(self) -> cohere.AsyncClient:
+        """cohere.AsyncClient on the shared connection pool, created on first async call."""
+        if self._async_client is None:
+            self._async_client = cohere.AsyncClient(api_key=self.api_key, httpx_client=get_async_http_client())
+        return self._async_client
+
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
 
@@ -60,6 +80,39 @@ class CoHereProvider(LLMInterface):
             max_tokens = max_output_tokens
         )
 
+        return self._chat_text(response)
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None):
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        message = self.process_text(prompt)
+        scheduler = get_rate_limit_scheduler(LLMEnums.COHERE.value, self.generation_model_id)
+
+        async def call():
+            async with llm_call_slot():
+                raw = await self.async_client.with_raw_response.chat(
+                    model = self.generation_model_id,
+                    chat_history = chat_history,
+                    message = message,
+                    temperature = temperature,
+                    max_tokens = max_output_tokens,
+                    request_options = self._NO_SDK_RETRIES,
+                )
+            scheduler.observe(raw.headers)
+            return raw.data
+
+        response = await scheduler.run(call, tokens=estimate_tokens(message) + max_output_tokens)
+
+        return self._chat_text(response)
+
+    def _chat_text(self, response):
         if not response or not response.text:
             self.logger.error("Error while generating text with CoHere")
             return None
@@ -67,6 +120,10 @@ class CoHereProvider(LLMInterface):
         return response.text
     
     def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_texts([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
@@ -75,22 +132,64 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Embedding model for CoHere was not set")
             return None
         
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
-
-        response = self.client.embed(
-            model = self.embedding_model_id,
-            texts = [self.process_text(text)],
-            input_type = input_type,
-            embedding_types=['float'],
-        )
+        input_type = self._input_type(document_type)
+
+        def embed_batch(batch: list):
+            response = self.client.embed(
+                model = self.embedding_model_id,
+                texts = [self.process_text(text) for text in batch],
+                input_type = input_type.value,
+                embedding_types=['float'],
+            )
+            return self._embedding_vectors(response)
+
+        return embed_in_batches(texts, self.embedding_batch_size, embed_batch, self.logger)
+
+    async def embed_text_async(self, text: str, document_type: str = None):
+        vectors = await self.embed_texts_async([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    async def embed_texts_async(self, texts: list, document_type: str = None):
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        input_type = self._input_type(document_type)
 
+        scheduler = get_rate_limit_scheduler(LLMEnums.COHERE.value, self.embedding_model_id)
+
+        async def embed_batch(batch: list):
+            batch = [self.process_text(text) for text in batch]
+
+            async def call():
+                async with llm_call_slot():
+                    raw = await self.async_client.with_raw_response.embed(
+                        model = self.embedding_model_id,
+                        texts = batch,
+                        input_type = input_type.value,
+                        embedding_types=['float'],
+                        request_options = self._NO_SDK_RETRIES,
+                    )
+                scheduler.observe(raw.headers)
+                return raw.data
+
+            response = await scheduler.run(call, tokens=sum(estimate_tokens(text) for text in batch))
+            return self._embedding_vectors(response)
+
+        return await embed_in_batches_async(texts, self.embedding_batch_size, embed_batch, self.logger)
+
+    @staticmethod
+    def _input_type(document_type) -> CoHereEnums:
+        if document_type in (DocumentTypeEnum.QUERY, DocumentTypeEnum.QUERY.value):
+            return CoHereEnums.QUERY
+        return CoHereEnums.DOCUMENT
+
+    def _embedding_vectors(self, response):
         if not response or not response.embeddings or not response.embeddings.float:
-            self.logger.error("Error while embedding text with CoHere")
+            self.logger.error("Error while embedding texts with CoHere")
             return None
-        
-        return response.embeddings.float[0]
+
+        return response.embeddings.float
     
     def construct_prompt(self, prompt: str, role: str):
         return {
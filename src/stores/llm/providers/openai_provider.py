@@ -1,17 +1,30 @@
 import logging
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from ..llm_interface import LLMInterface
-from ..llm_enums import OpenAIEnums
+from ..llm_enums import LLMEnums, OpenAIEnums
+from ..embedding_batches import embed_in_batches, embed_in_batches_async
+from ..embedding_defaults import OPENAI_DIMENSIONS_MODELS
+from ..async_clients import get_async_http_client, llm_call_slot
+from ..rate_limiter import estimate_tokens, get_rate_limit_scheduler
 
 
 class OpenAIProvider(LLMInterface):
 
+    # API limit is 2048 inputs per request; the default also stays well under
+    # the per-request token limit for chunk-sized inputs
+    EMBEDDING_MAX_BATCH_SIZE = 2048
+    EMBEDDING_DEFAULT_BATCH_SIZE = 256
+    # API limit is 300k tokens per embeddings request; leave headroom for
+    # estimation error
+    EMBEDDING_MAX_BATCH_TOKENS = 250_000
+
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       embedding_batch_size: int=None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -24,6 +37,10 @@ class OpenAIProvider(LLMInterface):
 
         self.embedding_model_id = None
         self.embedding_size = None
+        self.embedding_dimensions = None
+        self.embedding_batch_size = min(
+            embedding_batch_size or self.EMBEDDING_DEFAULT_BATCH_SIZE, self.EMBEDDING_MAX_BATCH_SIZE
+        )
 
  
         client_kwargs = {"api_key": self.api_key}
@@ -31,9 +48,21 @@ class OpenAIProvider(LLMInterface):
             client_kwargs["base_url"] = self.api_url
 
         self.client = OpenAI(**client_kwargs)
+        self._client_kwargs = client_kwargs
+        self._async_client = None
 
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """AsyncOpenAI on the shared connection pool, created on first async call."""
+        if self._async_client is None:
+            # Retries are left to the rate limit scheduler
+            self._async_client = AsyncOpenAI(
+                **self._client_kwargs, http_client=get_async_http_client(), max_retries=0
+            )
+        return self._async_client
+
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
 
@@ -41,6 +70,16 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
 
+        # v3 models shorten their vectors server-side when asked for fewer dims
+        native_size = OPENAI_DIMENSIONS_MODELS.get(model_id)
+        if native_size and embedding_size and embedding_size != native_size:
+            self.embedding_dimensions = embedding_size
+        else:
+            self.embedding_dimensions = None
+
+    def _dimensions_kwargs(self) -> dict:
+        return {"dimensions": self.embedding_dimensions} if self.embedding_dimensions else {}
+
     def process_text(self, text: str, max_characters: int = None):
 
         limit = max_characters if max_characters is not None else self.default_input_max_characters
@@ -76,6 +115,46 @@ class OpenAIProvider(LLMInterface):
             temperature=temperature,
         )
 
+        return self._completion_content(response)
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float=None, max_input_characters: int=None):
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        messages = list(chat_history) + [
+            self.construct_prompt(
+                prompt=prompt,
+                role=OpenAIEnums.USER.value,
+                max_input_characters=max_input_characters,
+            )
+        ]
+
+        scheduler = get_rate_limit_scheduler(LLMEnums.OPENAI.value, self.generation_model_id)
+
+        async def call():
+            async with llm_call_slot():
+                raw = await self.async_client.chat.completions.with_raw_response.create(
+                    model=self.generation_model_id,
+                    messages=messages,
+                    max_tokens=max_output_tokens,
+                    temperature=temperature,
+                )
+            scheduler.observe(raw.headers)
+            return raw.parse()
+
+        # max_tokens counts against the tokens-per-minute budget up front
+        tokens = sum(estimate_tokens(str(message.get("content", ""))) for message in messages) + max_output_tokens
+        response = await scheduler.run(call, tokens=tokens)
+
+        return self._completion_content(response)
+
+    def _completion_content(self, response):
         if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
             self.logger.error("Error while generating text with OpenAI")
             return None
@@ -90,6 +169,11 @@ class OpenAIProvider(LLMInterface):
 
     def embed_text(self, text: str, document_type: str=None):
         
+        vectors = self.embed_texts([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    def embed_texts(self, texts: list, document_type: str=None):
+
         if not self.client:
             self.logger.error("OpenAI client was not set")
             return None
@@ -97,17 +181,58 @@ class OpenAIProvider(LLMInterface):
         if not self.embedding_model_id:
             self.logger.error("Embedding model for OpenAI was not set")
             return None
-        
+
+        return embed_in_batches(texts, self.embedding_batch_size, self._embed_batch, self.logger)
+
+    async def embed_text_async(self, text: str, document_type: str=None):
+        vectors = await self.embed_texts_async([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    async def embed_texts_async(self, texts: list, document_type: str=None):
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        return await embed_in_batches_async(
+            texts, self.embedding_batch_size, self._embed_batch_async, self.logger,
+            max_batch_tokens=self.EMBEDDING_MAX_BATCH_TOKENS, count_tokens=estimate_tokens,
+        )
+
+    def _embed_batch(self, texts: list):
         response = self.client.embeddings.create(
             model=self.embedding_model_id,
-            input=text,
+            input=texts,
+            **self._dimensions_kwargs(),
         )
-
-        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
-            self.logger.error("Error while embedding text with OpenAI")
+        return self._embedding_vectors(response, len(texts))
+
+    async def _embed_batch_async(self, texts: list):
+        scheduler = get_rate_limit_scheduler(LLMEnums.OPENAI.value, self.embedding_model_id)
+
+        async def call():
+            async with llm_call_slot():
+                raw = await self.async_client.embeddings.with_raw_response.create(
+                    model=self.embedding_model_id,
+                    input=texts,
+                    **self._dimensions_kwargs(),
+                )
+            scheduler.observe(raw.headers)
+            return raw.parse()
+
+        response = await scheduler.run(call, tokens=sum(estimate_tokens(text) for text in texts))
+        return self._embedding_vectors(response, len(texts))
+
+    def _embedding_vectors(self, response, count: int):
+        if not response or not response.data or len(response.data) != count:
+            self.logger.error("Error while embedding texts with OpenAI")
             return None
 
-        return response.data[0].embedding
+        # Results carry their input index; don't rely on response order
+        vectors = [None] * count
+        for item in response.data:
+            vectors[item.index] = item.embedding
+        return vectors
 
     def construct_prompt(self, prompt: str, role: str, max_input_characters: int=None):
         return {
@@ -1,9 +1,10 @@
 import logging
-from typing import Optional
-
-from sentence_transformers import SentenceTransformer
+from typing import Any, Optional
 
 from ..llm_interface import LLMInterface
+from ..llm_enums import EmbeddingBackendEnums
+from ..embedding_batches import embed_in_batches, token_budget_batches
+from ..model_registry import get_model_registry
 from .openai_provider import OpenAIProvider
 
 
@@ -11,8 +12,17 @@ class SentenceTransformersProvider(LLMInterface):
     """
     Provider that uses SentenceTransformers (e.g. neuml/pubmedbert-base-embeddings)
     for embeddings and delegates text generation to OpenAI.
+
+    Models come from the process-wide registry, so creating a provider per
+    request does not reload the model. embedding_backend picks PyTorch
+    ("torch") or an int8 ONNX export under onnx_model_dir ("onnx").
     """
 
+    EMBEDDING_DEFAULT_BATCH_SIZE = 32
+    EMBEDDING_CALL_SIZE = 256
+    # Upper bound on texts per forward pass when texts are short
+    EMBEDDING_MAX_BUCKET_SIZE = 256
+
     def __init__(
         self,
         openai_api_key: str,
@@ -20,6 +30,10 @@ class SentenceTransformersProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
+        embedding_batch_size: Optional[int] = None,
+        embedding_backend: str = EmbeddingBackendEnums.TORCH.value,
+        onnx_model_dir: Optional[str] = None,
+        onnx_num_threads: Optional[int] = None,
     ):
         self._openai = OpenAIProvider(
             api_key=openai_api_key,
@@ -28,8 +42,16 @@ class SentenceTransformersProvider(LLMInterface):
             default_generation_max_output_tokens=default_generation_max_output_tokens,
             default_generation_temperature=default_generation_temperature,
         )
-        self._embedding_model: Optional[SentenceTransformer] = None
+        self._embedding_model: Optional[Any] = None
         self._embedding_size: Optional[int] = None
+        # Texts per forward pass at the model's max sequence length; shorter
+        # texts are bucketed by token length into larger batches with the same
+        # padded token budget. Texts are handed to encode() in groups of
+        # EMBEDDING_CALL_SIZE so one bad text only fails its own group
+        self.embedding_batch_size = embedding_batch_size or self.EMBEDDING_DEFAULT_BATCH_SIZE
+        self.embedding_backend = embedding_backend
+        self.onnx_model_dir = onnx_model_dir
+        self.onnx_num_threads = onnx_num_threads
         self.logger = logging.getLogger(__name__)
 
     @property
@@ -44,24 +66,53 @@ class SentenceTransformersProvider(LLMInterface):
         self._openai.set_generation_model(model_id)
 
     def set_embedding_model(self, model_id: str, embedding_size: int) -> None:
-        self._embedding_model = SentenceTransformer(model_id)
-        self._embedding_size = 768  # PubMedBERT and similar models use 768
+        self._embedding_model = get_model_registry().get(
+            model_id, self.embedding_backend, self.onnx_model_dir, self.onnx_num_threads
+        )
+        # PubMedBERT and similar models use 768
+        self._embedding_size = self._embedding_model.get_sentence_embedding_dimension() or 768
 
     def embed_text(self, text: str, document_type: str = None):
-        if self._embedding_model is None:
-            self.logger.error("Embedding model was not set")
-            return None
         if not text or not str(text).strip():
             self.logger.error("Cannot embed empty text")
             return None
-        try:
-            embedding = self._embedding_model.encode(
-                text, truncate=True, max_length=512, convert_to_numpy=True
-            )
-            return embedding.tolist()
-        except Exception as e:
-            self.logger.error(f"Error while embedding text: {e}")
+        vectors = self.embed_texts([text], document_type=document_type)
+        return vectors[0] if vectors else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        if self._embedding_model is None:
+            self.logger.error("Embedding model was not set")
             return None
+        return embed_in_batches(texts, self.EMBEDDING_CALL_SIZE, self._embed_batch, self.logger)
+
+    def _embed_batch(self, texts: list):
+        # Encode buckets of similar token length so batches are not padded
+        # to the longest chunk in the group
+        model = self._embedding_model
+        max_seq_length = getattr(model, "max_seq_length", None) or 512
+        buckets = token_budget_batches(
+            self._token_lengths(texts),
+            max_batch_tokens=self.embedding_batch_size * max_seq_length,
+            max_batch_size=max(self.embedding_batch_size, self.EMBEDDING_MAX_BUCKET_SIZE),
+        )
+        vectors = [None] * len(texts)
+        for bucket in buckets:
+            embeddings = model.encode(
+                [texts[i] for i in bucket],
+                batch_size=len(bucket),
+                convert_to_numpy=True,
+            )
+            for i, vector in zip(bucket, embeddings.tolist()):
+                vectors[i] = vector
+        return vectors
+
+    def _token_lengths(self, texts: list) -> list:
+        model = self._embedding_model
+        if hasattr(model, "token_lengths"):
+            return model.token_lengths(texts)
+        max_seq_length = getattr(model, "max_seq_length", None) or 512
+        encoded = model.tokenizer(list(texts), truncation=True, max_length=max_seq_length)
+        return [len(ids) for ids in encoded["input_ids"]]
 
     def generate_text(
         self,
@@ -79,6 +130,22 @@ class SentenceTransformersProvider(LLMInterface):
             max_input_characters=max_input_characters,
         )
 
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+        max_input_characters: int = None,
+    ):
+        return await self._openai.generate_text_async(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            max_input_characters=max_input_characters,
+        )
+
     def construct_prompt(
         self, prompt: str, role: str, max_input_characters: int = None
     ):
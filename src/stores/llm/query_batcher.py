@@ -0,0 +1,168 @@
+"""
+In-process micro-batching of query embeddings.
+
+Concurrent /nlp/search and /nlp/query requests each embed one short query;
+with a local model that is one tiny forward pass per request. The batcher
+queues those single-text requests per embedding model and sends them to the
+provider as one embed_texts_async call, then hands each caller its vector.
+
+A request that arrives while nothing is being embedded for its model is
+embedded right away in the caller's own task, so an idle server adds no
+latency, not even a scheduling hop. While a batch is in flight,
+new requests wait up to max_wait_ms, or until max_batch_size are queued, or
+until the in-flight batch finishes, whichever is first. At most
+max_in_flight batches per model run at once; beyond that requests keep
+queueing until one finishes, so under overload batches grow instead of
+piling more small forward passes onto a busy model.
+
+A batch that is cancelled (shutdown, or the disconnected client whose task
+was embedding it) still resolves its requests, with None, and frees its
+in-flight slot, so the rest of its group keeps being served.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+
+from .llm_interface import LLMInterface
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Group:
+    pending: list = field(default_factory=list)  # (text, future, enqueued_at)
+    in_flight: int = 0
+    timer: Optional[asyncio.Handle] = None
+
+
+class QueryEmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embeddings into batched provider calls.
+
+    Usage:
+        vector = await get_query_batcher().embed(llm, query, DocumentTypeEnum.QUERY.value,
+                                                 group=(provider, model_id, embedding_size))
+
+    Requests are only batched with others of the same group and document
+    type, so one batch never mixes models; the batch is embedded with the llm
+    of its first request.
+    """
+
+    def __init__(self, max_wait_ms: float = 5.0, max_batch_size: int = 32, max_in_flight: int = 2):
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self._groups: dict[Hashable, _Group] = {}
+        self._llms: dict[Hashable, LLMInterface] = {}
+
+        self.batches = 0
+        self.queries = 0
+        self.failures = 0
+        self.batch_sizes: Counter = Counter()
+        self.wait_seconds = 0.0
+
+    async def embed(self, llm: LLMInterface, text: str, document_type: str = None, group: Hashable = None):
+        """Embed one text as part of a batch; returns the vector, or None if embedding failed."""
+        key = (group if group is not None else id(llm), document_type)
+        state = self._groups.setdefault(key, _Group())
+        self._llms.setdefault(key, llm)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item = (text, future, time.perf_counter())
+
+        if state.in_flight == 0 and not state.pending:
+            # Idle: embed in this task; requests arriving meanwhile queue behind it
+            state.in_flight += 1
+            await self._run(key, state, [item])
+            return future.result()
+
+        state.pending.append(item)
+        if len(state.pending) >= self.max_batch_size:
+            self._flush(key)
+        elif state.timer is None:
+            state.timer = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        state = self._groups.get(key)
+        if state is None:
+            return
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+        # At capacity: the next finishing batch flushes the queue
+        if not state.pending or state.in_flight >= self.max_in_flight:
+            return
+
+        items = state.pending[:self.max_batch_size]
+        state.pending = state.pending[self.max_batch_size:]
+        state.in_flight += 1
+        asyncio.get_running_loop().create_task(self._run(key, state, items))
+        if state.pending:
+            self._flush(key)
+
+    async def _run(self, key: Hashable, state: _Group, items: list) -> None:
+        llm = self._llms[key]
+        document_type = key[1]
+        started = time.perf_counter()
+        self.batches += 1
+        self.queries += len(items)
+        self.batch_sizes[len(items)] += 1
+        self.wait_seconds += sum(started - enqueued_at for _, _, enqueued_at in items)
+
+        vectors = None
+        try:
+            vectors = await llm.embed_texts_async([text for text, _, _ in items], document_type=document_type)
+        except Exception as e:
+            logger.error(f"Query embedding batch of {len(items)} failed: {e}")
+        finally:
+            # Also on cancellation: no request may wait on a batch that is gone
+            if vectors is None:
+                self.failures += len(items)
+                vectors = [None] * len(items)
+            for (_, future, _), vector in zip(items, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+            state.in_flight -= 1
+            if state.pending:
+                # The model is free again; don't wait out the timer
+                self._flush(key)
+            elif state.in_flight == 0 and state.timer is None:
+                self._groups.pop(key, None)
+                self._llms.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch_size": self.max_batch_size,
+            "max_in_flight": self.max_in_flight,
+            "batches": self.batches,
+            "queries": self.queries,
+            "failures": self.failures,
+            "mean_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "mean_wait_ms": round(self.wait_seconds / self.queries * 1000, 3) if self.queries else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+        }
+
+
+_BATCHER = QueryEmbeddingBatcher()
+
+
+def configure_query_batcher(max_wait_ms: float = 5.0, max_batch_size: int = 32, max_in_flight: int = 2) -> None:
+    global _BATCHER
+    _BATCHER = QueryEmbeddingBatcher(
+        max_wait_ms=max_wait_ms, max_batch_size=max_batch_size, max_in_flight=max_in_flight
+    )
+
+
+def get_query_batcher() -> QueryEmbeddingBatcher:
+    """Return the process-wide query embedding batcher."""
+    return _BATCHER
@@ -0,0 +1,356 @@
+"""
+Rate-limit-aware scheduling for async provider calls.
+
+Each (provider, model) pair gets one RateLimitScheduler, shared process-wide
+because providers are created per request. A scheduler:
+
+- paces calls with token buckets for requests and tokens per minute, kept in
+  line with the provider's x-ratelimit-* response headers;
+- adapts how many calls it keeps in flight AIMD-style: +1/limit per success,
+  halved on a 429 (at most once per cooldown, so one burst of 429s counts once);
+- retries 429s, 5xx and connection errors with jittered exponential backoff,
+  honouring Retry-After when the provider sends it.
+
+The app lifespan calls configure_rate_limits() with the settings; without it,
+schedulers only adapt to headers and 429s.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Mapping, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {408, 409, 429}
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+_defaults = {
+    "requests_per_minute": None,
+    "tokens_per_minute": None,
+    "max_concurrency": 16,
+    "max_retries": 6,
+}
+_schedulers: dict[tuple[str, str], "RateLimitScheduler"] = {}
+
+
+class TokenBucket:
+    """Bucket of `capacity` units refilled continuously at `capacity` per `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.period = period
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until `amount` units are available and take them; returns seconds waited."""
+        # A request larger than the whole bucket would wait forever
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return waited
+            delay = (amount - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def sync(self, limit: Optional[float] = None, remaining: Optional[float] = None) -> None:
+        """Adopt the limit and remaining budget the provider reported."""
+        self._refill()
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+        self.tokens = min(self.tokens, self.capacity)
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit that grows additively on success and halves on throttling."""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 64,
+                 decrease_factor: float = 0.5, cooldown: float = 2.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def __aenter__(self):
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def increase(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def decrease(self) -> bool:
+        """Back off multiplicatively; returns False while still cooling down from the last decrease."""
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return False
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        return True
+
+
+class RateLimitScheduler:
+    """
+    Runs provider calls within request/token budgets, adapting concurrency and
+    retrying rate-limited or transient failures.
+
+    Usage:
+        scheduler = get_rate_limit_scheduler("OPENAI", model_id)
+        response = await scheduler.run(lambda: client.embeddings.create(...), tokens=estimate)
+
+    Calls that can see response headers should pass them to observe() so the
+    buckets follow the provider's own accounting.
+    """
+
+    def __init__(self, name: str,
+                       requests_per_minute: Optional[int] = None,
+                       tokens_per_minute: Optional[int] = None,
+                       max_concurrency: int = 16,
+                       max_retries: int = 6,
+                       base_delay: float = 0.5,
+                       max_delay: float = 60.0):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(initial=max_concurrency, maximum=max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+
+    async def run(self, call: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """Await call() once budgets allow, retrying retryable errors; re-raises the last error."""
+        attempt = 0
+        while True:
+            if self.requests:
+                self.wait_seconds += await self.requests.acquire(1)
+            if self.tokens and tokens:
+                self.wait_seconds += await self.tokens.acquire(tokens)
+
+            async with self.concurrency:
+                self.calls += 1
+                try:
+                    result = await call()
+                except Exception as e:
+                    status, headers = _error_details(e)
+                    if status == 429:
+                        self.throttled += 1
+                        if self.concurrency.decrease():
+                            logger.warning(
+                                f"{self.name} rate limited; concurrency limit now {int(self.concurrency.limit)}"
+                            )
+                    if headers:
+                        self.observe(headers)
+                    if not _is_retryable(e, status) or attempt >= self.max_retries:
+                        self.failures += 1
+                        raise
+                    delay = self._retry_delay(attempt, headers)
+                    logger.info(
+                        f"{self.name} call failed ({status or type(e).__name__}); "
+                        f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                    )
+                else:
+                    self.concurrency.increase()
+                    return result
+
+            # Sleep outside the concurrency slot so other calls can use it
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Sync the buckets with x-ratelimit-limit-* / x-ratelimit-remaining-* headers."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        for kind in ("requests", "tokens"):
+            limit = _to_float(headers.get(f"x-ratelimit-limit-{kind}"))
+            remaining = _to_float(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if limit is None and remaining is None:
+                continue
+            bucket = getattr(self, kind)
+            if bucket is None:
+                if not limit:
+                    continue
+                bucket = TokenBucket(limit)
+                setattr(self, kind, bucket)
+            bucket.sync(limit=limit, remaining=remaining)
+
+    def _retry_delay(self, attempt: int, headers: Optional[Mapping[str, str]]) -> float:
+        retry_after = _retry_after(headers) if headers else None
+        if retry_after is not None:
+            # Small jitter so callers told the same Retry-After don't return in lockstep
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        # Full jitter exponential backoff
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "requests_per_minute": self.requests.capacity if self.requests else None,
+            "tokens_per_minute": self.tokens.capacity if self.tokens else None,
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "failures": self.failures,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+def configure_rate_limits(requests_per_minute: Optional[int] = None,
+                          tokens_per_minute: Optional[int] = None,
+                          max_concurrency: int = 16,
+                          max_retries: int = 6) -> None:
+    """Set the budgets for schedulers created from now on and drop existing ones."""
+    _defaults.update(
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_concurrency=max(1, max_concurrency),
+        max_retries=max(0, max_retries),
+    )
+    _schedulers.clear()
+
+
+def get_rate_limit_scheduler(provider: str, model_id: str) -> RateLimitScheduler:
+    """Return the process-wide scheduler for a provider model, creating it on first use."""
+    key = (provider, model_id or "")
+    if key not in _schedulers:
+        _schedulers[key] = RateLimitScheduler(f"{provider}/{model_id}", **_defaults)
+    return _schedulers[key]
+
+
+def rate_limit_stats() -> list[dict]:
+    return [scheduler.stats() for scheduler in _schedulers.values()]
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.info(f"tiktoken unavailable, estimating tokens from characters: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count for budgeting: tiktoken cl100k when available, else ~4 characters per token."""
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """Whether exc is throttling or a transient failure (what RateLimitScheduler retries)."""
+    status, _ = _error_details(exc)
+    return _is_retryable(exc, status)
+
+
+def _error_details(exc: Exception) -> tuple[Optional[int], Optional[Mapping[str, str]]]:
+    # openai.APIStatusError carries .status_code and .response; cohere ApiError
+    # carries .status_code and .headers
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None)
+    headers = getattr(exc, "headers", None) or getattr(response, "headers", None)
+    return status, headers
+
+
+def _is_retryable(exc: Exception, status: Optional[int]) -> bool:
+    if status is not None:
+        return status in _RETRYABLE_STATUS or status >= 500
+    # SDK connection/timeout errors wrap the underlying httpx error
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError)) or isinstance(
+        exc.__cause__, httpx.TransportError
+    )
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    headers = {k.lower(): v for k, v in headers.items()}
+    retry_after_ms = _to_float(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000.0
+    retry_after = _to_float(headers.get("retry-after"))
+    if retry_after is not None:
+        return retry_after
+    # OpenAI: time until the exhausted budget resets, e.g. "1s", "6m0s", "20ms"
+    resets = [
+        _parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+        for kind in ("requests", "tokens")
+        if _to_float(headers.get(f"x-ratelimit-remaining-{kind}")) == 0
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return _to_float(value)
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _to_float(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,157 @@
+"""
+Process-wide cache of collection descriptions.
+
+Every search, query and ingest first needs to know whether the collection
+exists, its vector size, and the embedding model recorded on it at ingest.
+Against Qdrant Cloud that is a network round trip before the query is even
+embedded. The cache keeps one CollectionInfo per (backend, collection) for
+ttl_seconds; concurrent misses for the same collection share one lookup.
+
+Entries are dropped explicitly when a provider creates, deletes or updates a
+collection (invalidate), so changes made through this process are seen at
+once. Changes made elsewhere (another replica, the Qdrant console) are seen
+after at most ttl_seconds; callers also invalidate when an operation on a
+cached collection fails. Missing collections are not cached, so a collection
+created elsewhere is found on the next request.
+
+The app lifespan calls configure_collection_cache() at startup; without
+configure, defaults are used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.stores.llm.embedding_defaults import embedding_from_collection_metadata
+
+from .vector_db_interface import VectorDBInterface
+
+
+@dataclass(frozen=True)
+class CollectionInfo:
+    name: str
+    vector_size: Optional[int]
+    distance: Optional[str]
+    metadata: dict = field(default_factory=dict)
+    payload_indexes: tuple = ()  # indexed payload paths, e.g. "metadata.doc_id"
+
+    @property
+    def embedding(self) -> tuple | None:
+        """(provider, model_id, embedding_size) recorded at ingest, or None for older collections."""
+        return embedding_from_collection_metadata(self.metadata)
+
+
+class CollectionMetadataCache:
+    """
+    TTL + LRU cache of CollectionInfo, keyed by the provider's cache_scope.
+
+    Usage:
+        info = await get_collection_cache().get(vector_db, collection_name)
+        if info is None:
+            ...  # collection does not exist
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024):
+        self.ttl = max(0.0, ttl_seconds)
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple, tuple[float, CollectionInfo]] = OrderedDict()
+        self._loading: dict[tuple, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, vector_db: VectorDBInterface, collection_name: str) -> Optional[CollectionInfo]:
+        """The collection's CollectionInfo, from cache or one provider lookup; None if it does not exist."""
+        key = (vector_db.cache_scope, collection_name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, info = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return info
+            del self._entries[key]
+
+        self.misses += 1
+        loading = self._loading.get(key)
+        if loading is not None:
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                if not loading.cancelled():
+                    raise
+                # The request doing the lookup was cancelled; do it ourselves
+                return await self.get(vector_db, collection_name)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            described = await vector_db.describe_collection_async(collection_name)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; don't warn if there are none
+            future.exception()
+            raise
+        else:
+            info = None
+            if described is not None:
+                info = CollectionInfo(name=collection_name, **described)
+                # Not cached if invalidated while loading: the lookup may predate the change
+                if self._loading.get(key) is future and self.ttl > 0:
+                    self._entries[key] = (time.monotonic() + self.ttl, info)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            future.set_result(info)
+            return info
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+    def invalidate(self, scope: str, collection_name: str = None) -> None:
+        """Drop one collection of a backend, or all of them when collection_name is None."""
+        keys = [
+            key for key in list(self._entries) + list(self._loading)
+            if key[0] == scope and (collection_name is None or key[1] == collection_name)
+        ]
+        for key in keys:
+            self._entries.pop(key, None)
+            self._loading.pop(key, None)
+        if keys:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loading.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+_CACHE = CollectionMetadataCache()
+
+
+def configure_collection_cache(ttl_seconds: float = 300.0, max_entries: int = 1024) -> None:
+    global _CACHE
+    _CACHE = CollectionMetadataCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+
+def get_collection_cache() -> CollectionMetadataCache:
+    """Return the process-wide collection metadata cache."""
+    return _CACHE
@@ -0,0 +1,440 @@
+"""
+Embedded vector index for the LOCAL vector DB provider.
+
+Each collection is a directory under VECTOR_DB_PATH:
+- collection.json: embedding_size, distance and the collection metadata
+- vectors.f32: row-major float32 matrix, memory-mapped; row i is point i.
+  The file grows by doubling, so appends rarely remap it
+- points.sqlite: row -> point id and JSON payload, with expression indexes
+  on the PAYLOAD_INDEXES fields for filtered search
+- hnsw.bin: optional HNSW graph over the rows (hnswlib). It is saved on
+  close and rebuilt from vectors.f32 when missing or stale, so the vectors
+  file stays the source of truth
+
+Cosine collections store unit vectors, so cosine and dot both score with one
+matrix-vector product. Search is exact (vectorized NumPy) until a collection
+reaches hnsw_min_points, then goes through the HNSW graph. A filtered search
+first selects the matching rows through the SQLite indexes (cached per
+filter until the next upsert); it is exact over those rows when there are
+fewer than hnsw_min_points of them, otherwise the HNSW traversal only returns
+matching rows.
+
+Collections are opened once per process (open_collection) and shared by all
+provider instances; close_local_collections() saves the graphs at shutdown.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from .payload_filter import PAYLOAD_INDEXES, SCRAPED_AT, SECTION_ORDER, PayloadFilter
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILE = "collection.json"
+VECTORS_FILE = "vectors.f32"
+POINTS_FILE = "points.sqlite"
+GRAPH_FILE = "hnsw.bin"
+
+COSINE = "cosine"
+DOT = "dot"
+
+_MIN_CAPACITY = 1024
+_SQLITE_MAX_VARIABLES = 500
+_GRAPH_BUILD_BATCH = 10_000
+_FILTER_CACHE_ROWS = 4_000_000  # rows kept across cached filter results (int64: 32MB)
+
+
+@lru_cache(maxsize=1)
+def _hnswlib():
+    try:
+        import hnswlib
+        return hnswlib
+    except Exception as e:
+        logger.info(f"hnswlib unavailable, local vector search stays exact: {e}")
+        return None
+
+
+def _write_config(path: Path, config: dict) -> None:
+    # Atomic replace, so a crash never leaves a half-written config
+    tmp = path / (CONFIG_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    os.replace(tmp, path / CONFIG_FILE)
+
+
+def _payload_field(path: str) -> str:
+    # Must match the indexed expression exactly for SQLite to use the index
+    return f"json_extract(payload, '$.{path}')"
+
+
+def _filter_sql(payload_filter: PayloadFilter) -> tuple[str, list]:
+    """WHERE clause and parameters selecting the points that match payload_filter."""
+    clauses, params = [], []
+    for path, values in payload_filter.matches().items():
+        clauses.append(f"{_payload_field(path)} IN ({','.join('?' * len(values))})")
+        params.extend(values)
+    if payload_filter.section_order_min is not None:
+        clauses.append(f"{_payload_field(SECTION_ORDER)} >= ?")
+        params.append(payload_filter.section_order_min)
+    if payload_filter.section_order_max is not None:
+        clauses.append(f"{_payload_field(SECTION_ORDER)} <= ?")
+        params.append(payload_filter.section_order_max)
+    # scraped_at is stored as RFC 3339 UTC ("...Z"), which sorts as text
+    scraped_from, scraped_before = payload_filter.scraped_range()
+    if scraped_from is not None:
+        clauses.append(f"{_payload_field(SCRAPED_AT)} >= ?")
+        params.append(scraped_from.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    if scraped_before is not None:
+        clauses.append(f"{_payload_field(SCRAPED_AT)} < ?")
+        params.append(scraped_before.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return " AND ".join(clauses), params
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+class LocalCollection:
+    """
+    One on-disk collection: memory-mapped vectors, SQLite payloads, optional HNSW graph.
+
+    - hnsw: maintain an HNSW graph when hnswlib is installed
+    - hnsw_min_points: collections smaller than this are searched exactly
+    - hnsw_ef: query-time candidate list size (recall vs latency)
+    - hnsw_m / hnsw_ef_construction: graph degree and build-time candidate list size
+    """
+
+    def __init__(self, path: Union[str, Path], hnsw: bool = True, hnsw_min_points: int = 20_000,
+                 hnsw_ef: int = 64, hnsw_m: int = 16, hnsw_ef_construction: int = 200):
+        self.path = Path(path)
+        with open(self.path / CONFIG_FILE, "r", encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.embedding_size = int(self.config["embedding_size"])
+        self.distance = self.config.get("distance", COSINE)
+        self.metadata = self.config.get("metadata") or {}
+
+        self.hnsw_min_points = hnsw_min_points
+        self.hnsw_ef = hnsw_ef
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+
+        self._lock = threading.RLock()
+        self._filter_rows: OrderedDict[PayloadFilter, np.ndarray] = OrderedDict()
+        self._filter_rows_cached = 0
+        self._db = sqlite3.connect(str(self.path / POINTS_FILE), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS points (row INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, payload TEXT)"
+        )
+        for path in PAYLOAD_INDEXES:
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{path.replace('.', '_')} ON points ({_payload_field(path)})"
+            )
+        self._db.commit()
+        self.count = self._db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM points").fetchone()[0]
+
+        self._vectors_path = self.path / VECTORS_FILE
+        self._row_bytes = self.embedding_size * 4
+        self._capacity = os.path.getsize(self._vectors_path) // self._row_bytes
+        self._vectors: Optional[np.memmap] = self._map() if self._capacity else None
+
+        self._graph = None
+        self._graph_saved = False
+        if hnsw and _hnswlib() is not None:
+            self._open_graph()
+
+    @classmethod
+    def create(cls, path: Union[str, Path], embedding_size: int, distance: str = COSINE,
+               metadata: dict = None, **options) -> "LocalCollection":
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / VECTORS_FILE).touch()
+        config = {"embedding_size": int(embedding_size), "distance": distance, "metadata": metadata or {}}
+        _write_config(path, config)
+        return cls(path, **options)
+
+    def update_metadata(self, metadata: dict) -> None:
+        """Merge metadata into the collection metadata and persist it."""
+        with self._lock:
+            self.metadata = {**self.metadata, **metadata}
+            self.config["metadata"] = self.metadata
+            _write_config(self.path, self.config)
+
+    # --- storage -----------------------------------------------------------
+
+    def _map(self) -> np.memmap:
+        return np.memmap(self._vectors_path, dtype=np.float32, mode="r+",
+                         shape=(self._capacity, self.embedding_size))
+
+    def _reserve(self, rows: int) -> None:
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, self._capacity * 2, _MIN_CAPACITY)
+        if self._vectors is not None:
+            self._vectors.flush()
+        with open(self._vectors_path, "r+b") as f:
+            f.truncate(capacity * self._row_bytes)
+        self._capacity = capacity
+        self._vectors = self._map()
+        if self._graph is not None and self._graph.get_max_elements() < capacity:
+            self._graph.resize_index(capacity)
+
+    def _rows_for(self, ids: list[str]) -> dict[str, int]:
+        rows = {}
+        for start in range(0, len(ids), _SQLITE_MAX_VARIABLES):
+            part = ids[start:start + _SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(part))
+            rows.update(
+                (point_id, row) for row, point_id in
+                self._db.execute(f"SELECT row, id FROM points WHERE id IN ({placeholders})", part)
+            )
+        return rows
+
+    def upsert(self, ids: list[str], vectors, payloads: list[dict]) -> None:
+        """Insert or overwrite points by id; raises ValueError on a dimension mismatch."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[1] != self.embedding_size:
+            raise ValueError(
+                f"Expected {self.embedding_size}-dim vectors, got shape {tuple(matrix.shape)}"
+            )
+        if self.distance == COSINE:
+            matrix = _normalize(matrix)
+
+        with self._lock:
+            rows = self._rows_for(list(set(ids)))
+            next_row = self.count
+            assigned = []
+            for point_id in ids:
+                if point_id not in rows:
+                    rows[point_id] = next_row
+                    next_row += 1
+                assigned.append(rows[point_id])
+
+            # Vectors first: rows only become visible once SQLite commits them
+            self._reserve(next_row)
+            self._vectors[assigned] = matrix
+            self._vectors.flush()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO points (row, id, payload) VALUES (?, ?, ?)",
+                [(row, point_id, json.dumps(payload, ensure_ascii=False))
+                 for row, point_id, payload in zip(assigned, ids, payloads)],
+            )
+            self._db.commit()
+            self.count = next_row
+            self._filter_rows.clear()
+            self._filter_rows_cached = 0
+
+            if self._graph is not None:
+                self._graph.add_items(matrix, np.asarray(assigned, dtype=np.int64))
+                self._invalidate_graph_file()
+
+    # --- search ------------------------------------------------------------
+
+    def search(self, vector, limit: int = 5,
+               payload_filter: PayloadFilter = None) -> list[tuple[str, float, dict]]:
+        """Top `limit` points matching payload_filter as (id, score, payload), best first."""
+        query = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.embedding_size:
+            raise ValueError(f"Expected a {self.embedding_size}-dim query vector, got {query.shape[0]}")
+        if self.distance == COSINE:
+            query = _normalize(query)
+        if payload_filter is not None and payload_filter.is_empty():
+            payload_filter = None
+
+        with self._lock:
+            count = self.count
+            vectors = self._vectors
+            allowed = self._filtered_rows(payload_filter) if payload_filter is not None else None
+            candidates = count if allowed is None else len(allowed)
+            limit = min(limit, candidates)
+            if limit <= 0:
+                return []
+            rows = scores = None
+            if self._graph is not None and candidates >= self.hnsw_min_points:
+                self._graph.set_ef(max(self.hnsw_ef, limit))
+                try:
+                    if allowed is None:
+                        labels, distances = self._graph.knn_query(query, k=limit)
+                    else:
+                        mask = np.zeros(count, dtype=bool)
+                        mask[allowed] = True
+                        labels, distances = self._graph.knn_query(
+                            query, k=limit, num_threads=1, filter=mask.__getitem__
+                        )
+                    rows, scores = labels[0], 1.0 - distances[0]
+                except RuntimeError as e:
+                    # Filtered traversal found fewer than limit matches; search them exactly
+                    logger.info(f"HNSW filtered search in {self.path.name} fell back to exact: {e}")
+
+        if rows is None:
+            if allowed is None:
+                all_scores = vectors[:count] @ query
+            else:
+                all_scores = vectors[allowed] @ query
+            top = np.argpartition(-all_scores, limit - 1)[:limit] if limit < candidates else np.arange(candidates)
+            top = top[np.argsort(-all_scores[top])]
+            scores = all_scores[top]
+            rows = top if allowed is None else allowed[top]
+        return self._points(rows.tolist(), scores.tolist())
+
+    def _filtered_rows(self, payload_filter: PayloadFilter) -> np.ndarray:
+        """Sorted rows matching payload_filter. Caller holds the lock."""
+        rows = self._filter_rows.get(payload_filter)
+        if rows is not None:
+            self._filter_rows.move_to_end(payload_filter)
+            return rows
+
+        # Answered from the expression indexes, but still ~1us per matching
+        # row, so broad filters (a section title) are worth keeping
+        where, params = _filter_sql(payload_filter)
+        rows = np.sort(np.fromiter(
+            (row for (row,) in self._db.execute(f"SELECT row FROM points WHERE {where}", params)),
+            dtype=np.int64,
+        ))
+        self._filter_rows[payload_filter] = rows
+        self._filter_rows_cached += rows.size
+        while self._filter_rows_cached > _FILTER_CACHE_ROWS and len(self._filter_rows) > 1:
+            _, evicted = self._filter_rows.popitem(last=False)
+            self._filter_rows_cached -= evicted.size
+        return rows
+
+    def _points(self, rows: list[int], scores: list[float]) -> list[tuple[str, float, dict]]:
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            found = {
+                row: (point_id, payload) for row, point_id, payload in
+                self._db.execute(f"SELECT row, id, payload FROM points WHERE row IN ({placeholders})", rows)
+            }
+        return [
+            (found[row][0], float(score), json.loads(found[row][1]) if found[row][1] else {})
+            for row, score in zip(rows, scores) if row in found
+        ]
+
+    # --- HNSW graph --------------------------------------------------------
+
+    def _open_graph(self) -> None:
+        hnswlib = _hnswlib()
+        graph = hnswlib.Index(space="ip", dim=self.embedding_size)
+        graph_path = self.path / GRAPH_FILE
+        capacity = max(self._capacity, _MIN_CAPACITY)
+        if graph_path.exists():
+            try:
+                graph.load_index(str(graph_path), max_elements=capacity)
+                if graph.get_current_count() == self.count:
+                    self._graph = graph
+                    self._graph_saved = True
+                    return
+                logger.info(f"HNSW graph for {self.path.name} is stale; rebuilding")
+            except Exception as e:
+                logger.warning(f"Could not load HNSW graph for {self.path.name}; rebuilding: {e}")
+            graph = hnswlib.Index(space="ip", dim=self.embedding_size)
+
+        graph.init_index(max_elements=capacity, M=self.hnsw_m, ef_construction=self.hnsw_ef_construction)
+        for start in range(0, self.count, _GRAPH_BUILD_BATCH):
+            end = min(start + _GRAPH_BUILD_BATCH, self.count)
+            graph.add_items(np.asarray(self._vectors[start:end]), np.arange(start, end))
+        self._graph = graph
+        self._graph_saved = False
+
+    def _invalidate_graph_file(self) -> None:
+        # The saved graph no longer matches the vectors; never load it again
+        if self._graph_saved:
+            (self.path / GRAPH_FILE).unlink(missing_ok=True)
+            self._graph_saved = False
+
+    def save(self) -> None:
+        """Flush vectors and persist the HNSW graph if it changed."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            if self._graph is not None and not self._graph_saved and self.count:
+                tmp = self.path / (GRAPH_FILE + ".tmp")
+                self._graph.save_index(str(tmp))
+                os.replace(tmp, self.path / GRAPH_FILE)
+                self._graph_saved = True
+
+    def close(self) -> None:
+        self.save()
+        with self._lock:
+            self._db.close()
+            self._vectors = None
+            self._graph = None
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "points_count": self.count,
+                "embedding_size": self.embedding_size,
+                "distance": self.distance,
+                "metadata": self.metadata,
+                "payload_indexes": list(PAYLOAD_INDEXES),
+                "index": "hnsw" if self._graph is not None and self.count >= self.hnsw_min_points else "exact",
+                "vectors_bytes": self.count * self._row_bytes,
+            }
+
+
+_COLLECTIONS: dict[str, LocalCollection] = {}
+_COLLECTIONS_LOCK = threading.Lock()
+
+
+def open_collection(path: Union[str, Path], **options) -> Optional[LocalCollection]:
+    """The process-wide LocalCollection at path, opened on first use; None if it does not exist."""
+    key = str(Path(path).resolve())
+    with _COLLECTIONS_LOCK:
+        collection = _COLLECTIONS.get(key)
+        if collection is None:
+            if not (Path(key) / CONFIG_FILE).exists():
+                return None
+            collection = _COLLECTIONS[key] = LocalCollection(key, **options)
+        return collection
+
+
+def create_collection(path: Union[str, Path], embedding_size: int, distance: str = COSINE,
+                      metadata: dict = None, **options) -> LocalCollection:
+    key = str(Path(path).resolve())
+    with _COLLECTIONS_LOCK:
+        collection = _COLLECTIONS[key] = LocalCollection.create(
+            key, embedding_size, distance=distance, metadata=metadata, **options
+        )
+        return collection
+
+
+def drop_collection(path: Union[str, Path]) -> bool:
+    key = str(Path(path).resolve())
+    with _COLLECTIONS_LOCK:
+        collection = _COLLECTIONS.pop(key, None)
+        if collection is not None:
+            with collection._lock:
+                collection._db.close()
+                collection._vectors = None
+                collection._graph = None
+        if not Path(key).exists():
+            return False
+        shutil.rmtree(key)
+        return True
+
+
+def close_local_collections() -> None:
+    """Save HNSW graphs and close every open collection (app shutdown)."""
+    with _COLLECTIONS_LOCK:
+        collections = list(_COLLECTIONS.values())
+        _COLLECTIONS.clear()
+    for collection in collections:
+        try:
+            collection.close()
+        except Exception as e:
+            logger.warning(f"Closing local collection {collection.path.name} failed: {e}")
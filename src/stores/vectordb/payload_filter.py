@@ -0,0 +1,95 @@
+"""
+Structured filters on chunk payloads, shared by the vector DB providers.
+
+Chunks are stored with payload {"text": ..., "metadata": {...}}; the fields
+below are indexed when a collection is created (PAYLOAD_INDEXES), so a
+filter is answered from the index inside the vector engine instead of by
+over-fetching and filtering in Python. Each provider translates a
+PayloadFilter into its own engine's filter: a Qdrant Filter, or SQL over
+the LOCAL provider's SQLite payload store.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+KEYWORD = "keyword"
+INTEGER = "integer"
+DATETIME = "datetime"
+
+DOC_ID = "metadata.doc_id"
+SECTION_TITLE = "metadata.section_title"
+SECTION_ORDER = "metadata.section_order"
+SOURCE_URL = "metadata.source_url"
+SCRAPED_AT = "metadata.scraped_at"
+
+# Payload path -> index type, created with every collection
+PAYLOAD_INDEXES = {
+    DOC_ID: KEYWORD,
+    SECTION_TITLE: KEYWORD,
+    SECTION_ORDER: INTEGER,
+    SOURCE_URL: KEYWORD,
+    SCRAPED_AT: DATETIME,
+}
+
+
+@dataclass(frozen=True)
+class PayloadFilter:
+    """
+    All given conditions must hold; a list matches any of its values.
+
+    - doc_ids / section_titles / source_urls: exact matches
+    - section_order_min / section_order_max: inclusive range
+    - scraped_from / scraped_to: inclusive range of the days the articles were
+      scraped (the article's created_at); PMC records carry no publication date
+    """
+
+    doc_ids: tuple[str, ...] = ()
+    section_titles: tuple[str, ...] = ()
+    source_urls: tuple[str, ...] = ()
+    section_order_min: Optional[int] = None
+    section_order_max: Optional[int] = None
+    scraped_from: Optional[date] = None
+    scraped_to: Optional[date] = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.doc_ids or self.section_titles or self.source_urls
+            or self.section_order_min is not None or self.section_order_max is not None
+            or self.scraped_from is not None or self.scraped_to is not None
+        )
+
+    def matches(self) -> dict[str, tuple]:
+        """Keyword conditions as {payload path: accepted values}."""
+        return {
+            path: values for path, values in (
+                (DOC_ID, self.doc_ids),
+                (SECTION_TITLE, self.section_titles),
+                (SOURCE_URL, self.source_urls),
+            ) if values
+        }
+
+    def scraped_range(self) -> tuple[Optional[datetime], Optional[datetime]]:
+        """(gte, lt) UTC datetimes for scraped_from / scraped_to; the end of scraped_to's day is excluded."""
+        start = _midnight(self.scraped_from) if self.scraped_from is not None else None
+        end = _midnight(self.scraped_to) + timedelta(days=1) if self.scraped_to is not None else None
+        return start, end
+
+
+def _midnight(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def payload_datetime(value) -> Optional[str]:
+    """A date ("2026-02-11", ISO datetime) as RFC 3339 for the scraped_at index; None if unparseable."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
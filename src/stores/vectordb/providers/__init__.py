@@ -1 +1,2 @@
 from .qdrant_db_provider import QdrantDBProvider
+from .local_db_provider import LocalDBProvider
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import re
+import uuid
+from pathlib import Path
+from typing import List
+
+from qdrant_client.http.models import ScoredPoint
+
+from ..collection_cache import get_collection_cache
+from ..payload_filter import PAYLOAD_INDEXES, PayloadFilter
+from ..vector_db_interface import VectorDBInterface
+from ..vector_db_enums import DistanceMethodEnums
+from ..local_index import (
+    COSINE,
+    DOT,
+    CONFIG_FILE,
+    create_collection,
+    drop_collection,
+    open_collection,
+)
+
+_COLLECTION_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]*")
+
+
+class LocalDBProvider(VectorDBInterface):
+    """
+    Embedded vector DB: collections live under db_path (VECTOR_DB_PATH) on this
+    machine, so search needs no network round trip and works offline.
+
+    Vectors are memory-mapped float32 matrices searched exactly with NumPy, or
+    through an HNSW graph (hnswlib) once a collection has hnsw_min_points
+    points. Collections are shared by every provider instance in the process;
+    see local_index. Search results are Qdrant ScoredPoint objects, like
+    QdrantDBProvider's.
+    """
+
+    def __init__(self, db_path: str, distance_method: str, hnsw: bool = True,
+                 hnsw_min_points: int = 20_000, hnsw_ef: int = 64):
+        self.db_path = Path(db_path)
+        self.distance_method = DOT if distance_method == DistanceMethodEnums.DOT.value else COSINE
+        self.index_options = {"hnsw": hnsw, "hnsw_min_points": hnsw_min_points, "hnsw_ef": hnsw_ef}
+
+        self.logger = logging.getLogger(__name__)
+
+    def _collection_path(self, collection_name: str) -> Path:
+        if not _COLLECTION_NAME.fullmatch(collection_name or ""):
+            raise ValueError(f"Invalid collection name: {collection_name!r}")
+        return self.db_path / collection_name
+
+    def _collection(self, collection_name: str):
+        collection = open_collection(self._collection_path(collection_name), **self.index_options)
+        if collection is None:
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+        return collection
+
+    def connect(self):
+        self.db_path.mkdir(parents=True, exist_ok=True)
+
+    def disconnect(self):
+        # Collections stay open for other requests; close_local_collections() at shutdown
+        pass
+
+    async def connect_async(self):
+        self.connect()
+
+    async def disconnect_async(self):
+        self.disconnect()
+
+    @property
+    def cache_scope(self) -> str:
+        return f"LOCAL:{self.db_path.resolve()}"
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return (self._collection_path(collection_name) / CONFIG_FILE).exists()
+
+    async def is_collection_existed_async(self, collection_name: str) -> bool:
+        return self.is_collection_existed(collection_name)
+
+    def list_all_collections(self) -> List:
+        if not self.db_path.exists():
+            return []
+        return sorted(p.name for p in self.db_path.iterdir() if (p / CONFIG_FILE).exists())
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        return self._collection(collection_name).info()
+
+    def get_collection_metadata(self, collection_name: str) -> dict:
+        return dict(self._collection(collection_name).metadata)
+
+    async def get_collection_metadata_async(self, collection_name: str) -> dict:
+        return await asyncio.to_thread(self.get_collection_metadata, collection_name)
+
+    def get_collection_vector_size(self, collection_name: str) -> int:
+        return self._collection(collection_name).embedding_size
+
+    async def get_collection_vector_size_async(self, collection_name: str) -> int:
+        return await asyncio.to_thread(self.get_collection_vector_size, collection_name)
+
+    def _describe(self, collection_name: str) -> dict | None:
+        collection = open_collection(self._collection_path(collection_name), **self.index_options)
+        if collection is None:
+            return None
+        return {
+            "vector_size": collection.embedding_size,
+            "distance": collection.distance,
+            "metadata": dict(collection.metadata),
+            "payload_indexes": tuple(PAYLOAD_INDEXES),
+        }
+
+    async def describe_collection_async(self, collection_name: str) -> dict | None:
+        return await asyncio.to_thread(self._describe, collection_name)
+
+    async def create_payload_indexes_async(self, collection_name: str):
+        # Opening a collection creates its SQLite payload indexes
+        await asyncio.to_thread(self._collection, collection_name)
+        get_collection_cache().invalidate(self.cache_scope, collection_name)
+        return True
+
+    async def update_collection_metadata_async(self, collection_name: str, metadata: dict):
+        try:
+            await asyncio.to_thread(lambda: self._collection(collection_name).update_metadata(metadata))
+        finally:
+            get_collection_cache().invalidate(self.cache_scope, collection_name)
+        return True
+
+    def delete_collection(self, collection_name: str):
+        deleted = drop_collection(self._collection_path(collection_name))
+        get_collection_cache().invalidate(self.cache_scope, collection_name)
+        return deleted
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                metadata: dict = None):
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+
+        if not self.is_collection_existed(collection_name):
+            create_collection(
+                self._collection_path(collection_name),
+                embedding_size,
+                distance=self.distance_method,
+                metadata=metadata,
+                **self.index_options,
+            )
+            get_collection_cache().invalidate(self.cache_scope, collection_name)
+            return True
+
+        return False
+
+    async def create_collection_async(self, collection_name: str,
+                                      embedding_size: int,
+                                      do_reset: bool = False,
+                                      metadata: dict = None):
+        return await asyncio.to_thread(
+            self.create_collection, collection_name, embedding_size, do_reset, metadata
+        )
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None,
+                         record_id: str = None):
+        return self.insert_many(
+            collection_name, [text], [vector], [metadata], [record_id] if record_id is not None else None
+        )
+
+    async def insert_one_async(self, collection_name: str, text: str, vector: list,
+                               metadata: dict = None,
+                               record_id: str = None):
+        return await self.insert_many_async(
+            collection_name, [text], [vector], [metadata], [record_id] if record_id is not None else None
+        )
+
+    def _upsert(self, collection_name: str, texts: list, vectors: list,
+                metadata: list, record_ids: list, batch_size: int):
+        collection = self._collection(collection_name)
+        if metadata is None:
+            metadata = [None] * len(texts)
+        if record_ids is None:
+            record_ids = [None] * len(texts)
+
+        for i in range(0, len(texts), batch_size):
+            batch_end = i + batch_size
+            collection.upsert(
+                ids=[str(rid) if rid is not None else str(uuid.uuid4()) for rid in record_ids[i:batch_end]],
+                vectors=vectors[i:batch_end],
+                payloads=[
+                    {"text": text, "metadata": meta}
+                    for text, meta in zip(texts[i:batch_end], metadata[i:batch_end])
+                ],
+            )
+        return True
+
+    def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 1000):
+        try:
+            return self._upsert(collection_name, texts, vectors, metadata, record_ids, batch_size)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+    async def insert_many_async(self, collection_name: str, texts: list,
+                                vectors: list, metadata: list = None,
+                                record_ids: list = None, batch_size: int = 1000,
+                                wait: bool = True):
+        """Async batch upsert. Raises on failure so the API can return 5xx instead of 200.
+        Points are searchable on return, whatever wait is."""
+        return await asyncio.to_thread(
+            self._upsert, collection_name, texts, vectors, metadata, record_ids, batch_size
+        )
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                         payload_filter: PayloadFilter = None):
+        """Nearest points matching payload_filter as ScoredPoint objects with id, score, and payload."""
+        return [
+            ScoredPoint(id=point_id, version=0, score=score, payload=payload)
+            for point_id, score, payload in
+            self._collection(collection_name).search(vector, limit, payload_filter=payload_filter)
+        ]
+
+    async def search_by_vector_async(self, collection_name: str, vector: list, limit: int = 5,
+                                     payload_filter: PayloadFilter = None):
+        return await asyncio.to_thread(self.search_by_vector, collection_name, vector, limit, payload_filter)
@@ -1,17 +1,117 @@
+import asyncio
+import json
 import logging
+import random
 import uuid
 from typing import List
 
-from qdrant_client import QdrantClient, AsyncQdrantClient
-from qdrant_client.http.models import Distance, PointStruct, VectorParams
+import grpc
+import httpx
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+from qdrant_client.http.models import (
+    DatetimeRange,
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchAny,
+    PayloadSchemaType,
+    PointStruct,
+    Range,
+    VectorParams,
+)
 
+from src.helpers.batching import packed
+
+from ..collection_cache import get_collection_cache
+from ..payload_filter import PAYLOAD_INDEXES, SCRAPED_AT, SECTION_ORDER, PayloadFilter
+from ..qdrant_clients import get_async_qdrant_client, get_qdrant_client, uses_grpc
 from ..vector_db_interface import VectorDBInterface
 from ..vector_db_enums import DistanceMethodEnums
 
+# Bytes per vector component on the wire: REST JSON, e.g. "-0.012345678901234567,", or gRPC float32
+_JSON_BYTES_PER_FLOAT = 21
+_GRPC_BYTES_PER_FLOAT = 4
+_RETRY_BASE_DELAY = 0.5
+_RETRY_MAX_DELAY = 10.0
+_RETRYABLE_GRPC_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+)
+
+
+def _vector_size(info) -> int:
+    """Vector size of a collection (the first named vector for multi-vector collections)."""
+    params = getattr(info, "config", None) and getattr(info.config, "params", None)
+    vectors_cfg = params.vectors if params else None
+    if hasattr(vectors_cfg, "size"):
+        return vectors_cfg.size
+    if isinstance(vectors_cfg, dict):
+        first = next(iter(vectors_cfg.values()), None)
+        return getattr(first, "size", None) if first else None
+    return None
+
+
+def _distance(info) -> str | None:
+    """Distance of a collection's vectors as a DistanceMethodEnums value, e.g. "cosine"."""
+    params = getattr(info, "config", None) and getattr(info.config, "params", None)
+    vectors_cfg = params.vectors if params else None
+    if isinstance(vectors_cfg, dict):
+        vectors_cfg = next(iter(vectors_cfg.values()), None)
+    distance = getattr(vectors_cfg, "distance", None)
+    return str(getattr(distance, "value", distance)).lower() if distance else None
+
+
+def _is_not_found(exc: Exception) -> bool:
+    if isinstance(exc, UnexpectedResponse):
+        return exc.status_code == 404
+    if isinstance(exc, ValueError):
+        # qdrant-client's local mode (location=":memory:" or a path)
+        return str(exc).endswith("not found")
+    return isinstance(exc, grpc.RpcError) and hasattr(exc, "code") and exc.code() == grpc.StatusCode.NOT_FOUND
+
+
+def _qdrant_filter(payload_filter: PayloadFilter | None) -> Filter | None:
+    """PayloadFilter as a Qdrant Filter; evaluated on the payload indexes during the search."""
+    if payload_filter is None or payload_filter.is_empty():
+        return None
+    must = [
+        FieldCondition(key=path, match=MatchAny(any=list(values)))
+        for path, values in payload_filter.matches().items()
+    ]
+    if payload_filter.section_order_min is not None or payload_filter.section_order_max is not None:
+        must.append(FieldCondition(
+            key=SECTION_ORDER,
+            range=Range(gte=payload_filter.section_order_min, lte=payload_filter.section_order_max),
+        ))
+    scraped_from, scraped_before = payload_filter.scraped_range()
+    if scraped_from is not None or scraped_before is not None:
+        must.append(FieldCondition(key=SCRAPED_AT, range=DatetimeRange(gte=scraped_from, lt=scraped_before)))
+    return Filter(must=must)
+
+
+def _point_bytes(point: PointStruct, bytes_per_float: int = _JSON_BYTES_PER_FLOAT) -> int:
+    """Approximate request body size of one point, for sizing upsert batches."""
+    payload = json.dumps(point.payload, ensure_ascii=False, default=str)
+    return len(payload.encode("utf-8")) + len(point.vector) * bytes_per_float + 64
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Timeouts, throttling, 5xx and dropped connections; other 4xx would fail again."""
+    if isinstance(exc, UnexpectedResponse):
+        return exc.status_code in (408, 429) or (exc.status_code or 0) >= 500
+    if isinstance(exc, grpc.RpcError) and hasattr(exc, "code"):
+        return exc.code() in _RETRYABLE_GRPC_CODES
+    if isinstance(exc, ResponseHandlingException):
+        exc = exc.source
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
 
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, db_path: str, distance_method: str, url: str = None, api_key: str = None):
+    def __init__(self, db_path: str, distance_method: str, url: str = None, api_key: str = None,
+                 upsert_batch_bytes: int = 2_000_000, upsert_max_in_flight: int = 4,
+                 upsert_max_retries: int = 3):
 
         self.client = None
         self.async_client = None  # New async client
@@ -19,6 +119,9 @@ class QdrantDBProvider(VectorDBInterface):
         self.url = url
         self.api_key = api_key
         self.distance_method = None
+        self.upsert_batch_bytes = max(1, upsert_batch_bytes)
+        self.upsert_max_in_flight = max(1, upsert_max_in_flight)
+        self.upsert_max_retries = max(0, upsert_max_retries)
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = Distance.COSINE
@@ -32,26 +135,27 @@ class QdrantDBProvider(VectorDBInterface):
             raise ValueError(
                 "Qdrant Cloud is required: set QDRANT_CLUSTER_URL and QDRANT_KEY in your environment."
             )
-        self.client = QdrantClient(url=self.url, api_key=self.api_key)
+        self.client = get_qdrant_client(self.url, self.api_key)
 
     def disconnect(self):
+        # The shared client stays open for other requests; close_qdrant_clients() at shutdown
         self.client = None
 
     async def connect_async(self):
-        """Async connection - Qdrant Cloud required. Uses 120s timeout for cloud upserts."""
+        """Async connection - Qdrant Cloud required. Reuses the process-wide client (qdrant_clients)."""
         if not self.url or not self.api_key:
             raise ValueError(
                 "Qdrant Cloud is required: set QDRANT_CLUSTER_URL and QDRANT_KEY in your environment."
             )
-        self.async_client = AsyncQdrantClient(
-            url=self.url, api_key=self.api_key, timeout=120.0
-        )
+        self.async_client = get_async_qdrant_client(self.url, self.api_key)
 
     async def disconnect_async(self):
-        """Async disconnection."""
-        if self.async_client:
-            await self.async_client.close()
-            self.async_client = None
+        """Async disconnection; the shared client stays open."""
+        self.async_client = None
+
+    @property
+    def cache_scope(self) -> str:
+        return f"QDRANT:{self.url}"
 
     async def is_collection_existed_async(self, collection_name: str) -> bool:
         """Async collection existence check."""
@@ -59,10 +163,77 @@ class QdrantDBProvider(VectorDBInterface):
             await self.connect_async()
         return await self.async_client.collection_exists(collection_name=collection_name)
 
+    async def get_collection_metadata_async(self, collection_name: str) -> dict:
+        """Async lookup of the metadata stored with a collection (empty if none)."""
+        if not self.async_client:
+            await self.connect_async()
+        info = await self.async_client.get_collection(collection_name=collection_name)
+        return dict(info.config.metadata or {})
+
+    async def get_collection_vector_size_async(self, collection_name: str) -> int:
+        """Async lookup of a collection's vector size (None if not set)."""
+        if not self.async_client:
+            await self.connect_async()
+        return _vector_size(await self.async_client.get_collection(collection_name=collection_name))
+
+    async def describe_collection_async(self, collection_name: str) -> dict | None:
+        """Vector size, distance and metadata of a collection in one request; None if it does not exist."""
+        if not self.async_client:
+            await self.connect_async()
+        try:
+            info = await self.async_client.get_collection(collection_name=collection_name)
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+        return {
+            "vector_size": _vector_size(info),
+            "distance": _distance(info),
+            "metadata": dict(info.config.metadata or {}),
+            "payload_indexes": tuple(info.payload_schema or ()),
+        }
+
+    async def create_payload_indexes_async(self, collection_name: str):
+        """Index the PAYLOAD_INDEXES fields, so filtered searches don't scan payloads."""
+        if not self.async_client:
+            await self.connect_async()
+        try:
+            for field_name, schema in PAYLOAD_INDEXES.items():
+                await self.async_client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType(schema),
+                    wait=True,
+                )
+        finally:
+            get_collection_cache().invalidate(self.cache_scope, collection_name)
+        return True
+
+    def create_payload_indexes(self, collection_name: str):
+        for field_name, schema in PAYLOAD_INDEXES.items():
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=PayloadSchemaType(schema),
+                wait=True,
+            )
+        get_collection_cache().invalidate(self.cache_scope, collection_name)
+        return True
+
+    async def update_collection_metadata_async(self, collection_name: str, metadata: dict):
+        """Merge metadata into the metadata stored with a collection."""
+        if not self.async_client:
+            await self.connect_async()
+        try:
+            return await self.async_client.update_collection(collection_name=collection_name, metadata=metadata)
+        finally:
+            get_collection_cache().invalidate(self.cache_scope, collection_name)
+
     async def create_collection_async(self, collection_name: str, 
                                      embedding_size: int,
-                                     do_reset: bool = False):
-        """Async collection creation."""
+                                     do_reset: bool = False,
+                                     metadata: dict = None):
+        """Async collection creation; metadata is stored with the collection."""
         if not self.async_client:
             await self.connect_async()
         
@@ -70,6 +241,7 @@ class QdrantDBProvider(VectorDBInterface):
             exists = await self.is_collection_existed_async(collection_name)
             if exists:
                 await self.async_client.delete_collection(collection_name=collection_name)
+                get_collection_cache().invalidate(self.cache_scope, collection_name)
         
         exists = await self.is_collection_existed_async(collection_name)
         if not exists:
@@ -78,8 +250,10 @@ class QdrantDBProvider(VectorDBInterface):
                 vectors_config=VectorParams(
                     size=embedding_size,
                     distance=self.distance_method
-                )
+                ),
+                metadata=metadata,
             )
+            await self.create_payload_indexes_async(collection_name)
             return True
         
         return False
@@ -93,13 +267,23 @@ class QdrantDBProvider(VectorDBInterface):
     def get_collection_info(self, collection_name: str) -> dict:
         return self.client.get_collection(collection_name=collection_name)
     
+    def get_collection_metadata(self, collection_name: str) -> dict:
+        info = self.client.get_collection(collection_name=collection_name)
+        return dict(info.config.metadata or {})
+
+    def get_collection_vector_size(self, collection_name: str) -> int:
+        return _vector_size(self.client.get_collection(collection_name=collection_name))
+
     def delete_collection(self, collection_name: str):
         if self.is_collection_existed(collection_name):
-            return self.client.delete_collection(collection_name=collection_name)
+            deleted = self.client.delete_collection(collection_name=collection_name)
+            get_collection_cache().invalidate(self.cache_scope, collection_name)
+            return deleted
         
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                metadata: dict = None):
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
         
@@ -109,9 +293,10 @@ class QdrantDBProvider(VectorDBInterface):
                 vectors_config=VectorParams(
                     size=embedding_size,
                     distance=self.distance_method
-                )
+                ),
+                metadata=metadata,
             )
-
+            self.create_payload_indexes(collection_name)
             return True
         
         return False
@@ -181,49 +366,106 @@ class QdrantDBProvider(VectorDBInterface):
 
     async def insert_many_async(self, collection_name: str, texts: list,
                                 vectors: list, metadata: list = None,
-                                record_ids: list = None, batch_size: int = 20):
-        """Async batch insert using upsert from official Qdrant docs - prevents duplicates.
-        Raises on failure so the API can return 5xx instead of 200.
+                                record_ids: list = None, batch_size: int = 256,
+                                wait: bool = True):
+        """Async batch upsert - prevents duplicates. Raises on failure so the API
+        can return 5xx instead of 200.
+
+        Points are split into requests of at most batch_size points and
+        upsert_batch_bytes of estimated body, and up to upsert_max_in_flight
+        requests are sent concurrently without waiting for indexing
+        (wait=False). With wait=True the last request is sent alone once the
+        others are acknowledged, with wait=True. Qdrant applies updates in
+        order per shard replica only, so that makes every point searchable on
+        return for a single-shard, unreplicated collection; on a sharded or
+        replicated one, points of the earlier requests may still be indexing.
+        Failed requests are retried with backoff; ids are fixed up front so a
+        retried request overwrites rather than duplicates.
         """
         if not self.async_client:
             await self.connect_async()
-        
+
         if metadata is None:
             metadata = [None] * len(texts)
         if record_ids is None:
             record_ids = [None] * len(texts)
-        
-        # Batch upsert so cloud limits / timeouts are less likely
-        for i in range(0, len(texts), batch_size):
-            batch_end = min(i + batch_size, len(texts))
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_ids = record_ids[i:batch_end]
-            points = [
-                PointStruct(
-                    id=(batch_ids[j] if batch_ids[j] is not None else str(uuid.uuid4())),
-                    vector=batch_vectors[j],
-                    payload={"text": batch_texts[j], "metadata": batch_metadata[j]},
-                )
-                for j in range(len(batch_texts))
-            ]
-            # Do not swallow exceptions - let them propagate so API returns 5xx
-            await self.async_client.upsert(
-                collection_name=collection_name,
-                points=points,
-                wait=True,
+
+        points = [
+            PointStruct(
+                id=(record_id if record_id is not None else str(uuid.uuid4())),
+                vector=vector,
+                payload={"text": text, "metadata": meta},
             )
+            for text, vector, meta, record_id in zip(texts, vectors, metadata, record_ids)
+        ]
+        bytes_per_float = _GRPC_BYTES_PER_FLOAT if uses_grpc() else _JSON_BYTES_PER_FLOAT
+        costs = [_point_bytes(point, bytes_per_float) for point in points]
+        batches = list(packed(points, costs, max(1, batch_size), self.upsert_batch_bytes))
+        if not batches:
+            return True
+        barrier = batches.pop() if wait else None
+
+        semaphore = asyncio.Semaphore(self.upsert_max_in_flight)
+
+        async def send(batch):
+            async with semaphore:
+                await self._upsert_with_retry(collection_name, batch, wait=False)
+
+        tasks = [asyncio.create_task(send(batch)) for batch in batches]
+        try:
+            # Fail fast: the first error cancels the requests not yet sent
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if barrier is not None:
+            await self._upsert_with_retry(collection_name, barrier, wait=True)
         return True
-        
-    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
+
+    async def _upsert_with_retry(self, collection_name: str, points: list, wait: bool):
+        for attempt in range(self.upsert_max_retries + 1):
+            try:
+                return await self.async_client.upsert(
+                    collection_name=collection_name,
+                    points=points,
+                    wait=wait,
+                )
+            except Exception as e:
+                if attempt >= self.upsert_max_retries or not _is_retryable(e):
+                    raise
+                # Full jitter exponential backoff
+                delay = random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt))
+                self.logger.warning(
+                    f"Upsert of {len(points)} points to {collection_name} failed ({e!s:.200}); "
+                    f"retry {attempt + 1}/{self.upsert_max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                         payload_filter: PayloadFilter = None):
         """
         Search for nearest vectors using query_points (official Qdrant API).
         Returns list of ScoredPoint objects with id, score, and payload.
+        payload_filter is applied by Qdrant during the search.
         """
         resp = self.client.query_points(
             collection_name=collection_name,
             query=vector,
+            query_filter=_qdrant_filter(payload_filter),
+            limit=limit,
+            with_payload=True,
+        )
+        return resp.points
+
+    async def search_by_vector_async(self, collection_name: str, vector: list, limit: int = 5,
+                                     payload_filter: PayloadFilter = None):
+        """Async search with query_points; returns ScoredPoint objects with id, score, and payload."""
+        if not self.async_client:
+            await self.connect_async()
+        resp = await self.async_client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            query_filter=_qdrant_filter(payload_filter),
             limit=limit,
             with_payload=True,
         )
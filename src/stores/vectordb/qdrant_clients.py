@@ -0,0 +1,139 @@
+"""
+Shared, long-lived Qdrant clients.
+
+QdrantDBProvider instances are cheap and created per request, but the
+QdrantClient / AsyncQdrantClient they talk through are created once per
+(url, api_key) and reused. Connections (and their TLS handshakes) then
+outlive the request, and the client's server compatibility check runs once
+per process instead of once per request. Up to pool_size REST connections
+are kept alive for keepalive_seconds (qdrant-client's own default disables
+keep-alive for localhost), and idle gRPC channels are pinged. HTTP/2 and
+gRPC (prefer_grpc) are opt-in.
+
+The app lifespan calls configure_qdrant_clients() at startup and
+close_qdrant_clients() at shutdown; without configure, defaults are used.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+logger = logging.getLogger(__name__)
+
+_options = {
+    "prefer_grpc": False,
+    "grpc_port": 6334,
+    "http2": False,
+    "timeout": 120,
+    "pool_size": 32,
+    "keepalive_seconds": 60.0,
+}
+_clients: dict[tuple, QdrantClient] = {}
+_async_clients: dict[tuple, AsyncQdrantClient] = {}
+
+
+def configure_qdrant_clients(prefer_grpc: bool = False, grpc_port: int = 6334, http2: bool = False,
+                             timeout: int = 120, pool_size: int = 32, keepalive_seconds: float = 60.0) -> None:
+    """Set the transport options for clients created from now on."""
+    if http2 and not prefer_grpc:
+        try:
+            import h2  # noqa: F401  httpx needs it for HTTP/2
+        except ImportError:
+            logger.warning("QDRANT_HTTP2 needs the h2 package; using HTTP/1.1")
+            http2 = False
+    _options.update(
+        prefer_grpc=prefer_grpc,
+        grpc_port=grpc_port,
+        http2=http2,
+        timeout=timeout,
+        pool_size=max(1, pool_size),
+        keepalive_seconds=keepalive_seconds,
+    )
+
+
+def uses_grpc() -> bool:
+    return _options["prefer_grpc"]
+
+
+def _client_kwargs(url: str, api_key: str) -> dict:
+    keepalive_ms = int(_options["keepalive_seconds"] * 1000)
+    return {
+        "url": url,
+        "api_key": api_key,
+        "timeout": _options["timeout"],
+        "prefer_grpc": _options["prefer_grpc"],
+        "grpc_port": _options["grpc_port"],
+        "grpc_options": {
+            # Ping idle channels so load balancers don't drop them silently
+            "grpc.keepalive_time_ms": keepalive_ms,
+            "grpc.keepalive_timeout_ms": 10_000,
+            "grpc.keepalive_permit_without_calls": 1,
+        },
+        "http2": _options["http2"],
+        "limits": httpx.Limits(
+            max_connections=_options["pool_size"],
+            max_keepalive_connections=_options["pool_size"],
+            keepalive_expiry=_options["keepalive_seconds"],
+        ),
+    }
+
+
+def get_qdrant_client(url: str, api_key: str) -> QdrantClient:
+    """Return the shared QdrantClient for a cluster, creating it on first use."""
+    key = (url, api_key)
+    if key not in _clients:
+        _clients[key] = QdrantClient(**_client_kwargs(url, api_key))
+    return _clients[key]
+
+
+def get_async_qdrant_client(url: str, api_key: str) -> AsyncQdrantClient:
+    """Return the shared AsyncQdrantClient for a cluster, creating it on first use."""
+    key = (url, api_key)
+    if key not in _async_clients:
+        _async_clients[key] = AsyncQdrantClient(**_client_kwargs(url, api_key))
+    return _async_clients[key]
+
+
+async def check_qdrant_health(url: str, api_key: str, timeout: float = 10.0) -> dict:
+    """
+    One authenticated round trip (list collections) through the shared async
+    client, given up after timeout seconds. On failure the client is closed
+    and dropped, so the next request starts over with fresh connections.
+    """
+    transport = "grpc" if _options["prefer_grpc"] else ("http/2" if _options["http2"] else "http/1.1")
+    started = time.perf_counter()
+    try:
+        client = get_async_qdrant_client(url, api_key)
+        collections = await asyncio.wait_for(client.get_collections(), timeout)
+    except Exception as e:
+        client = _async_clients.pop((url, api_key), None)
+        if client is not None:
+            try:
+                await client.close()
+            except Exception:
+                pass
+        return {"ok": False, "transport": transport, "error": str(e) or type(e).__name__}
+    return {
+        "ok": True,
+        "transport": transport,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        "collections": len(collections.collections),
+    }
+
+
+async def close_qdrant_clients() -> None:
+    for client in list(_async_clients.values()):
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Closing Qdrant client failed: {e}")
+    for client in list(_clients.values()):
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Closing Qdrant client failed: {e}")
+    _async_clients.clear()
+    _clients.clear()
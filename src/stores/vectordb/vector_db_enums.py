@@ -2,6 +2,7 @@ from enum import Enum
 
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
+    LOCAL = "LOCAL"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
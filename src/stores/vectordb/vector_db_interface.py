@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+from .payload_filter import PayloadFilter
+
 class VectorDBInterface(ABC):
 
     @abstractmethod
@@ -27,10 +29,19 @@ class VectorDBInterface(ABC):
     def delete_collection(self, collection_name: str):
         pass
 
+    @abstractmethod
+    def get_collection_metadata(self, collection_name: str) -> dict:
+        pass
+
+    @abstractmethod
+    def get_collection_vector_size(self, collection_name: str) -> int:
+        pass
+
     @abstractmethod
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                metadata: dict = None):
         pass
 
     @abstractmethod
@@ -46,9 +57,15 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector: list, limit: int):
+    def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                         payload_filter: PayloadFilter = None):
         pass
 
+    @property
+    def cache_scope(self) -> str:
+        """Identifies the backend (cluster, directory) in the collection metadata cache."""
+        return type(self).__name__
+
     # Async methods (optional - for async implementations)
     async def connect_async(self):
         """Async connection. Default implementation raises NotImplementedError."""
@@ -62,9 +79,41 @@ class VectorDBInterface(ABC):
         """Async collection existence check. Default implementation raises NotImplementedError."""
         raise NotImplementedError("Async collection existence check not implemented")
 
+    async def get_collection_metadata_async(self, collection_name: str) -> dict:
+        """Async collection metadata lookup. Default implementation raises NotImplementedError."""
+        raise NotImplementedError("Async collection metadata lookup not implemented")
+
+    async def get_collection_vector_size_async(self, collection_name: str) -> int:
+        """Async vector size lookup. Default implementation raises NotImplementedError."""
+        raise NotImplementedError("Async vector size lookup not implemented")
+
+    async def describe_collection_async(self, collection_name: str) -> dict | None:
+        """
+        {"vector_size", "distance", "metadata", "payload_indexes"} of a collection, or None if it
+        does not exist. The default makes three lookups; providers override it
+        with one.
+        """
+        if not await self.is_collection_existed_async(collection_name):
+            return None
+        return {
+            "vector_size": await self.get_collection_vector_size_async(collection_name),
+            "distance": None,
+            "metadata": await self.get_collection_metadata_async(collection_name),
+            "payload_indexes": (),
+        }
+
+    async def create_payload_indexes_async(self, collection_name: str):
+        """Async creation of the PAYLOAD_INDEXES filter indexes (idempotent). Default implementation raises NotImplementedError."""
+        raise NotImplementedError("Async payload index creation not implemented")
+
+    async def update_collection_metadata_async(self, collection_name: str, metadata: dict):
+        """Async merge of metadata into a collection's metadata. Default implementation raises NotImplementedError."""
+        raise NotImplementedError("Async collection metadata update not implemented")
+
     async def create_collection_async(self, collection_name: str, 
                                       embedding_size: int,
-                                      do_reset: bool = False):
+                                      do_reset: bool = False,
+                                      metadata: dict = None):
         """Async collection creation. Default implementation raises NotImplementedError."""
         raise NotImplementedError("Async collection creation not implemented")
 
@@ -76,6 +125,14 @@ class VectorDBInterface(ABC):
 
     async def insert_many_async(self, collection_name: str, texts: list, 
                                 vectors: list, metadata: list = None, 
-                                record_ids: list = None, batch_size: int = 50):
-        """Async batch insert. Default implementation raises NotImplementedError."""
+                                record_ids: list = None, batch_size: int = 50,
+                                wait: bool = True):
+        """Async batch insert. With wait=False, or on a sharded or replicated
+        Qdrant collection, the call may return before every point is
+        searchable. Default implementation raises NotImplementedError."""
         raise NotImplementedError("Async batch insert not implemented")
+
+    async def search_by_vector_async(self, collection_name: str, vector: list, limit: int,
+                                     payload_filter: PayloadFilter = None):
+        """Async vector search, restricted to points matching payload_filter. Default implementation raises NotImplementedError."""
+        raise NotImplementedError("Async vector search not implemented")
@@ -1,6 +1,6 @@
 from src.controllers.base_controller import BaseController
 
-from .providers import QdrantDBProvider
+from .providers import LocalDBProvider, QdrantDBProvider
 from .vector_db_enums import VectorDBEnums
 
 
@@ -23,5 +23,16 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 url=url,
                 api_key=api_key,
+                upsert_batch_bytes=self.config.QDRANT_UPSERT_BATCH_BYTES,
+                upsert_max_in_flight=self.config.QDRANT_UPSERT_MAX_IN_FLIGHT,
+                upsert_max_retries=self.config.QDRANT_UPSERT_MAX_RETRIES,
+            )
+        if provider == VectorDBEnums.LOCAL.value:
+            return LocalDBProvider(
+                db_path=self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH),
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                hnsw=self.config.VECTOR_DB_HNSW,
+                hnsw_min_points=self.config.VECTOR_DB_HNSW_MIN_POINTS,
+                hnsw_ef=self.config.VECTOR_DB_HNSW_EF,
             )
         return None
@@ -0,0 +1,203 @@
+"""
+Golden chunker output over pmc_articles/, shared by the regression test and
+its generator.
+
+The golden file holds, per article and chunker setting, the chunk count and
+a SHA-256 of the chunks serialized as JSON, as produced by the baseline
+chunker (the first commit's src/services/biomedical_chunker.py) with only
+the deliberate output changes made since applied to it: the overlap
+re-seed hang fix, max_tokens capped at 512 and whole-word abbreviations
+(CHUNKER_VERSION 3). Token
+counts come from a small WordPiece tokenizer trained on the corpus
+(fixtures/pmc_wordpiece_tokenizer.json), so the test runs offline; the
+chunking logic under test is the same whatever the vocabulary.
+
+Regenerate (only when chunk output is meant to change, with CHUNKER_VERSION):
+    python -m tests.chunker_golden --ref <commit>
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import re
+import hashlib
+import json
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+TOKENIZER_PATH = FIXTURES / "pmc_wordpiece_tokenizer.json"
+GOLDEN_PATH = FIXTURES / "chunker_golden.json"
+ARTICLES_GLOB = str(PROJECT_ROOT / "pmc_articles" / "*.json")
+
+BASELINE_REF = "dc4bdd6"
+CHUNKER_PATH = "src/services/biomedical_chunker.py"
+
+# (max_tokens, overlap_tokens, word_overlap): the default, two narrower
+# windows, one small enough to force word-wise sentence splits, and one over
+# the 512-token model limit
+SETTINGS = [(480, 80, 10), (256, 64, 10), (128, 32, 10), (64, 16, 5), (1024, 80, 10)]
+
+# The baseline never terminates when the carried overlap plus the next
+# sentence exceed max_tokens: it flushes the overlap alone and re-seeds it
+# unchanged. The fix shipped with the first rewrite (drop the overlap in that
+# case) is applied to it; inputs that terminated before chunk identically.
+_BASELINE_HANG_FIX = [
+    (
+        "    overlap_sentences = []\n\n    def flush_chunk()",
+        "    overlap_sentences = []\n    has_new_content = False\n\n    def flush_chunk()",
+    ),
+    (
+        "            current_tokens = _token_count(current_sentences[0]) if current_sentences else 0\n"
+        "            i += 1\n",
+        "            current_tokens = _token_count(current_sentences[0]) if current_sentences else 0\n"
+        "            has_new_content = False\n"
+        "            i += 1\n",
+    ),
+    (
+        "        if current_tokens + sent_tokens > max_tokens and current_sentences:\n",
+        "        if current_tokens + sent_tokens > max_tokens and current_sentences:\n"
+        "            if not has_new_content:\n"
+        "                current_sentences = []\n"
+        "                current_tokens = 0\n"
+        "                continue\n",
+    ),
+    (
+        "            current_tokens = sum(_token_count(s) for s in current_sentences)\n            continue\n",
+        "            current_tokens = sum(_token_count(s) for s in current_sentences)\n"
+        "            has_new_content = False\n"
+        "            continue\n",
+    ),
+    (
+        "        current_tokens += sent_tokens\n        i += 1\n",
+        "        current_tokens += sent_tokens\n        has_new_content = True\n        i += 1\n",
+    ),
+]
+
+# Above 512 the baseline packed chunks it then refused to emit (flush_chunk
+# returns None past 512 tokens), silently dropping their text; max_tokens is
+# now capped at the model limit instead
+_BASELINE_MAX_TOKENS_CAP = (
+    "    sentences = _split_sentences_scientific(section_text)\n",
+    "    max_tokens = min(max_tokens, 512)\n    sentences = _split_sentences_scientific(section_text)\n",
+)
+
+
+# CHUNKER_VERSION 3: abbreviations only match whole words (the baseline read
+# "problems." as "Ms.") and the table grew; sentence_segmenter's table
+_ABBREVIATIONS = (
+    "et al", "fig", "figs", "eq", "eqs", "ref", "refs", "tab", "suppl",
+    "sect", "ch", "vol", "no", "nos", "pp", "cf", "ca", "approx", "vs",
+    "e.g", "i.e", "viz", "resp",
+    "c.i", "o.r", "h.r", "r.r", "s.d", "s.e", "s.e.m",
+    "dr", "mr", "mrs", "ms", "prof", "st", "jr", "sr",
+)
+
+
+def _whole_word_protect_periods(placeholder: str):
+    alternatives = "|".join(
+        r"\s+".join(re.escape(word) for word in abbreviation.split())
+        for abbreviation in sorted(_ABBREVIATIONS, key=len, reverse=True)
+    )
+    abbreviation_re = re.compile(r"\b(" + alternatives + r")\.(\s|$)", re.IGNORECASE)
+
+    def protect_periods(text: str) -> str:
+        text = re.sub(r"(\d)\.(\d)", r"\1" + placeholder + r"\2", text)
+        return abbreviation_re.sub(r"\1" + placeholder + r"\2", text)
+
+    return protect_periods
+
+
+def setting_key(max_tokens: int, overlap_tokens: int, word_overlap: int) -> str:
+    return f"{max_tokens}/{overlap_tokens}/{word_overlap}"
+
+
+def load_articles() -> list[dict]:
+    articles = []
+    for path in sorted(glob.glob(ARTICLES_GLOB)):
+        with open(path, "r", encoding="utf-8") as f:
+            articles.append(json.load(f))
+    return articles
+
+
+def article_sections(article: dict) -> dict[str, str]:
+    # As the ingest route builds them (parallel_chunker.article_sections)
+    return {
+        s["title"]: s.get("text", "") or ""
+        for s in sorted(article.get("sections", []), key=lambda x: x.get("order", 0))
+    }
+
+
+def digest(chunks: list[dict]) -> dict:
+    serialized = json.dumps(chunks, ensure_ascii=False, sort_keys=True)
+    return {"chunks": len(chunks), "sha256": hashlib.sha256(serialized.encode("utf-8")).hexdigest()}
+
+
+class _TokenIdsTokenizer:
+    """The baseline's transformers-style encode() on top of a `tokenizers` Tokenizer."""
+
+    def __init__(self, path: Path):
+        from tokenizers import Tokenizer
+
+        self._tokenizer = Tokenizer.from_file(str(path))
+        self._tokenizer.no_truncation()
+        self._tokenizer.no_padding()
+
+    def encode(self, text: str, add_special_tokens: bool = True) -> list[int]:
+        return self._tokenizer.encode(text, add_special_tokens=add_special_tokens).ids
+
+
+def _baseline_chunker(ref: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{ref}:{CHUNKER_PATH}"],
+        cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    for old, new in [*_BASELINE_HANG_FIX, _BASELINE_MAX_TOKENS_CAP]:
+        if source.count(old) != 1:
+            raise SystemExit(f"{ref}:{CHUNKER_PATH} does not look like the baseline chunker")
+        source = source.replace(old, new)
+    module = types.ModuleType("baseline_biomedical_chunker")
+    exec(compile(source, f"{ref}:{CHUNKER_PATH}", "exec"), module.__dict__)
+    module._protect_periods = _whole_word_protect_periods(module._PROTECT_PLACEHOLDER)
+    module._TOKENIZER = _TokenIdsTokenizer(TOKENIZER_PATH)
+    return module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the chunker golden file from a baseline commit.")
+    parser.add_argument("--ref", default=BASELINE_REF, help="Commit whose chunker defines the expected output")
+    args = parser.parse_args()
+
+    chunker = _baseline_chunker(args.ref)
+    golden = {"ref": args.ref, "settings": {}}
+    for max_tokens, overlap_tokens, word_overlap in SETTINGS:
+        key = setting_key(max_tokens, overlap_tokens, word_overlap)
+        golden["settings"][key] = {
+            article["doc_id"]: digest(chunker.chunk_paper_sections(
+                article_sections(article),
+                article["doc_id"],
+                article.get("doc_title", ""),
+                article.get("source_url", ""),
+                max_tokens=max_tokens,
+                overlap_tokens=overlap_tokens,
+                word_overlap=word_overlap,
+            ))
+            for article in load_articles()
+        }
+        print(f"{key}: {sum(d['chunks'] for d in golden['settings'][key].values())} chunks")
+
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=1, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {GOLDEN_PATH}")
+
+
+if __name__ == "__main__":
+    main()
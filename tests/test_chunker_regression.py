@@ -0,0 +1,100 @@
+"""
+The biomedical chunker's output over pmc_articles/ must stay byte-identical
+to the baseline chunker's, plus only its deliberate fixes
+(tests/fixtures/chunker_golden.json; see tests/chunker_golden.py).
+
+Guards the rewrites of its internals: offset-mapped long-sentence splits,
+batched token counts, streaming iter_chunks, span-based chunks, the
+single-pass sentence segmenter, and the cached and per-article entry points
+built on them. A change that is meant to alter chunks bumps CHUNKER_VERSION
+and regenerates the golden file (see tests/chunker_golden.py).
+"""
+
+import json
+
+import pytest
+
+from src.services import biomedical_chunker
+from src.services.chunk_cache import ChunkCache
+from src.services.parallel_chunker import chunk_article, chunk_article_spans
+
+from .chunker_golden import (
+    GOLDEN_PATH,
+    SETTINGS,
+    TOKENIZER_PATH,
+    article_sections,
+    digest,
+    load_articles,
+    setting_key,
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def golden_tokenizer():
+    previous = biomedical_chunker._TOKENIZER
+    biomedical_chunker.load_tokenizer(str(TOKENIZER_PATH))
+    yield
+    biomedical_chunker._TOKENIZER = previous
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["settings"]
+
+
+@pytest.fixture(scope="module")
+def articles():
+    return load_articles()
+
+
+def _mismatches(golden_setting: dict, articles: list, chunk) -> list[str]:
+    assert set(golden_setting) == {article["doc_id"] for article in articles}, "pmc_articles/ changed"
+    return [
+        article["doc_id"]
+        for article in articles
+        if digest(chunk(article)) != golden_setting[article["doc_id"]]
+    ]
+
+
+@pytest.mark.parametrize("max_tokens,overlap_tokens,word_overlap", SETTINGS)
+def test_chunk_paper_sections_matches_baseline(golden, articles, max_tokens, overlap_tokens, word_overlap):
+    def chunk(article):
+        return biomedical_chunker.chunk_paper_sections(
+            article_sections(article),
+            article["doc_id"],
+            article.get("doc_title", ""),
+            article.get("source_url", ""),
+            max_tokens=max_tokens,
+            overlap_tokens=overlap_tokens,
+            word_overlap=word_overlap,
+        )
+
+    key = setting_key(max_tokens, overlap_tokens, word_overlap)
+    assert _mismatches(golden[key], articles, chunk) == []
+
+
+@pytest.mark.parametrize("max_tokens,overlap_tokens,word_overlap", SETTINGS)
+def test_chunk_article_spans_matches_baseline(golden, articles, max_tokens, overlap_tokens, word_overlap):
+    def chunk(article):
+        return chunk_article_spans(
+            article, max_tokens=max_tokens, overlap_tokens=overlap_tokens, word_overlap=word_overlap
+        ).to_dicts()
+
+    key = setting_key(max_tokens, overlap_tokens, word_overlap)
+    assert _mismatches(golden[key], articles, chunk) == []
+
+
+def test_cached_chunks_match_baseline(golden, articles, tmp_path):
+    max_tokens, overlap_tokens, word_overlap = SETTINGS[0]
+    cache = ChunkCache(tmp_path / "chunks.sqlite3")
+
+    def chunk(article):
+        return chunk_article(
+            article, max_tokens=max_tokens, overlap_tokens=overlap_tokens, word_overlap=word_overlap, cache=cache
+        )
+
+    key = setting_key(max_tokens, overlap_tokens, word_overlap)
+    assert _mismatches(golden[key], articles, chunk) == []  # fills the cache
+    assert _mismatches(golden[key], articles, chunk) == []  # served from it
+    assert cache.stats()["hits"] > 0